@@ -0,0 +1,602 @@
+import re
+import json
+import asyncio
+import sqlite3
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from database_connector import DatabaseConnector, configure_pool
+from migrations import run_migrations
+from repository import BOOK_COLUMNS, STUDENT_COLUMNS, Book, Student, books, fees
+from search import search_books, search_students
+from services import OutOfStock, ServiceError, StudentForm, course_service, fee_service, library_service, student_service
+
+logger = logging.getLogger(__name__)
+
+type Payload = dict | list | None
+type Response = tuple[int, Payload]
+
+# page size of the listings when the client doesn't ask for one, and the largest page a client can ask for
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# largest request body accepted, in bytes
+MAX_BODY = 1024 * 1024
+
+# largest INTEGER sqlite stores, a bigger ID in a path or query can't exist and can't be bound
+MAX_ID = 2 ** 63 - 1
+
+# seconds an idle keep-alive connection stays open
+IDLE_TIMEOUT = 30
+
+
+class HttpError(Exception):
+    """
+    Raised by the handlers of `ApiServer` to answer with an error status, the message is sent as `{"error": message}`.
+
+    Parameters:
+        - status (int): HTTP status code.
+        - message (str): error message for the client.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """
+    A parsed HTTP request.
+
+    Attributes:
+        - method (str): e.g. 'GET'.
+        - path (str): path without the query string.
+        - query (dict[str, str]): query parameters, the last value of a repeated parameter.
+        - headers (dict[str, str]): headers, names in lower case.
+        - body (bytes): the body, empty if there is none.
+        - params (dict[str, str]): values of the named groups of the matched route.
+    """
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes = b''
+    params: dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> dict:
+        'Returns the body parsed as a JSON object, raises HttpError 400 if it is not one.'
+        try:
+            value = json.loads(self.body or b'{}')
+
+        except ValueError:
+            raise HttpError(400, 'The body is not valid JSON.')
+
+        if not isinstance(value, dict):
+            raise HttpError(400, 'The body must be a JSON object.')
+
+        return value
+
+    @property
+    def keep_alive(self) -> bool:
+        'True if the connection stays open after the response (HTTP/1.1 unless the client asked to close it).'
+        return self.headers.get('connection', '').lower() != 'close'
+
+
+class ApiServer:
+    """
+    A local HTTP/JSON API over the college database, so several front-desk terminals and the kiosk can share one database through one process instead of copies of the file.
+
+    The server runs on asyncio, every request is handled by the same services as the desktop program (services.py) on a thread pool, because sqlite calls block. Listings are paged by primary key (`?limit=50&after=<last key>`, the response has `next_after`), so reading page 1000 costs the same as page 1.
+
+    Routes:
+        - `GET /students?course_id=&limit=&after=`, `POST /students`, `GET /students/search?q=`
+        - `GET|PUT|DELETE /students/<enrollment_no>`
+        - `GET|POST /students/<enrollment_no>/books` (lend), `POST /students/<enrollment_no>/returns`
+        - `GET|POST /students/<enrollment_no>/fees` (deposit)
+        - `GET /courses?limit=&after=`, `POST /courses`, `GET|PUT|DELETE /courses/<course_id>`
+        - `GET /books?course_id=&limit=&after=`, `POST /books`, `GET /books/search?q=`
+        - `GET|DELETE /books/<book_id>`, `POST /books/<book_id>/stock`
+        - `GET /receipts/<transaction_id>`, `GET /fees/daily?first_day=&last_day=`
+
+    Errors are `{"error": message}` with status 400 (refused by a service or a malformed request), 404, 405, 409 (no copy left), 500 (unexpected error, logged) or 503 (database busy).
+
+    Parameters:
+        - host (str): address to listen on, default '127.0.0.1'.
+        - port (int): port to listen on, default 8000.
+        - workers (int): threads running the database calls, default 8.
+
+    Usage:
+    ```
+    python api_server.py --database data.sqlite --port 8000
+    curl "http://127.0.0.1:8000/students?limit=2"
+    ```
+
+    Note:
+        - There is no authentication, bind it to an address only the college network can reach.
+        - Courses changed by the desktop program are picked up by `CourseCache`, which compares the courses_version setting on access.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000, workers: int = 8) -> None:
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+
+        self.routes: list[tuple[str, re.Pattern, callable]] = [
+            # re.ASCII: \d would also match other digits, e.g. '٣'
+            (method, re.compile(f'^{pattern}$', re.ASCII), handler)
+            for method, pattern, handler in [
+                ('GET', r'/students', self.__list_students),
+                ('POST', r'/students', self.__admit_student),
+                ('GET', r'/students/search', self.__search_students),
+                ('GET', r'/students/(?P<enrollment_no>\d+)', self.__get_student),
+                ('PUT', r'/students/(?P<enrollment_no>\d+)', self.__update_student),
+                ('DELETE', r'/students/(?P<enrollment_no>\d+)', self.__remove_student),
+                ('GET', r'/students/(?P<enrollment_no>\d+)/books', self.__lended_books),
+                ('POST', r'/students/(?P<enrollment_no>\d+)/books', self.__lend_books),
+                ('POST', r'/students/(?P<enrollment_no>\d+)/returns', self.__return_books),
+                ('GET', r'/students/(?P<enrollment_no>\d+)/fees', self.__fee_status),
+                ('POST', r'/students/(?P<enrollment_no>\d+)/fees', self.__deposit_fee),
+                ('GET', r'/courses', self.__list_courses),
+                ('POST', r'/courses', self.__add_course),
+                ('GET', r'/courses/(?P<course_id>\d+)', self.__get_course),
+                ('PUT', r'/courses/(?P<course_id>\d+)', self.__update_course),
+                ('DELETE', r'/courses/(?P<course_id>\d+)', self.__remove_course),
+                ('GET', r'/books', self.__list_books),
+                ('POST', r'/books', self.__add_book),
+                ('GET', r'/books/search', self.__search_books),
+                ('GET', r'/books/(?P<book_id>\d+)', self.__get_book),
+                ('DELETE', r'/books/(?P<book_id>\d+)', self.__remove_book),
+                ('POST', r'/books/(?P<book_id>\d+)/stock', self.__add_stock),
+                ('GET', r'/receipts/(?P<transaction_id>\d+)', self.__get_receipt),
+                ('GET', r'/fees/daily', self.__daily_totals)
+            ]
+        ]
+
+    async def serve_forever(self) -> None:
+        """
+        Listens for connections until the task is cancelled.
+
+        Returns:
+            - None
+        """
+        server = await asyncio.start_server(self.__handle_connection, self.host, self.port)
+        logger.info('API listening on http://%s:%d', self.host, self.port)
+
+        try:
+            async with server:
+                await server.serve_forever()
+
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, request: Request) -> Response:
+        """
+        Finds the route of a request and runs its handler on the thread pool.
+
+        Parameters:
+            - request (Request): the request.
+
+        Returns:
+            - Response: (status, payload).
+        """
+        path_matched = False
+
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+
+            if match is None:
+                continue
+
+            path_matched = True
+
+            if method != request.method:
+                continue
+
+            request.params = match.groupdict()
+
+            if any(int(value) > MAX_ID for value in request.params.values()):
+                return 404, {'error': f'{request.path} is not found.'}
+
+            loop = asyncio.get_running_loop()
+
+            try:
+                return await loop.run_in_executor(self.executor, handler, request)
+
+            except HttpError as e:
+                return e.status, {'error': str(e)}
+
+            except OutOfStock as e:
+                return 409, {'error': str(e), 'book_ids': e.book_ids}
+
+            except ServiceError as e:
+                return 400, {'error': str(e)}
+
+            except sqlite3.OperationalError:
+                return 503, {'error': 'The database is busy, please try again.'}
+
+            except sqlite3.IntegrityError as e:
+                return 400, {'error': str(e)}
+
+            except Exception:
+                logger.exception('%s %s failed', request.method, request.path)
+                return 500, {'error': 'Internal server error.'}
+
+        if path_matched:
+            return 405, {'error': f'{request.method} is not allowed on {request.path}.'}
+
+        return 404, {'error': f'{request.path} is not found.'}
+
+    # connections
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection, one after the other, until the client closes it or it is idle for `IDLE_TIMEOUT` seconds.
+        """
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.__read_request(reader), IDLE_TIMEOUT)
+
+                except HttpError as e:
+                    writer.write(self.__encode_response(e.status, {'error': str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+
+                if request is None:
+                    break
+
+                status, payload = await self.handle(request)
+                writer.write(self.__encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+
+                if not request.keep_alive:
+                    break
+
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def __read_request(reader: asyncio.StreamReader) -> Request | None:
+        """
+        Reads one request from a connection.
+
+        Returns:
+            - Request or None: None if the client closed the connection.
+
+        Raises:
+            - HttpError: if the request is malformed or its body is too large.
+        """
+        request_line = await reader.readline()
+
+        if not request_line.strip():
+            return None
+
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+
+        except ValueError:
+            raise HttpError(400, 'Malformed request line.')
+
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+
+        except ValueError:
+            raise HttpError(400, 'Content-Length must be a number.')
+
+        if length < 0:
+            raise HttpError(400, 'Content-Length must not be negative.')
+
+        if length > MAX_BODY:
+            raise HttpError(413, 'The body is too large.')
+
+        body = await reader.readexactly(length) if length else b''
+        url = urlsplit(target)
+
+        return Request(
+            method=method.upper(),
+            path=url.path.rstrip('/') or '/',
+            query={name: values[-1] for name, values in parse_qs(url.query).items()},
+            headers=headers,
+            body=body
+        )
+
+    @staticmethod
+    def __encode_response(status: int, payload: Payload, keep_alive: bool) -> bytes:
+        'Returns the bytes of a JSON response.'
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+        head = (
+            f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+            f'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+            '\r\n'
+        )
+
+        return head.encode('latin-1') + body
+
+    # listings
+    @staticmethod
+    def __page_arguments(request: Request) -> tuple[int, int]:
+        'Returns the limit and the key after which the page starts, from the query string.'
+        try:
+            limit = int(request.query.get('limit', DEFAULT_LIMIT))
+            after = int(request.query.get('after', -1))
+
+        except ValueError:
+            raise HttpError(400, 'limit and after must be numbers.')
+
+        if not 1 <= limit <= MAX_LIMIT:
+            raise HttpError(400, f'limit must be between 1 and {MAX_LIMIT}.')
+
+        if not -1 <= after <= MAX_ID:
+            raise HttpError(400, 'after must be an ID.')
+
+        return limit, after
+
+    def __page(self, request: Request, sql: str, key: str, parameters: list) -> dict:
+        """
+        Reads a page of a listing with keyset pagination: `WHERE key > after ORDER BY key LIMIT limit`, the primary key index finds the first row of the page directly.
+
+        Parameters:
+            - request (Request): the request, its limit and after query parameters are used.
+            - sql (str): the SELECT of the listing up to and including its WHERE clause, with `{after}` where the key condition goes.
+            - key (str): primary key of the listing, it must be the first selected column.
+            - parameters (list): parameters of the SQL, before the key.
+
+        Returns:
+            - dict: `items` (the rows) and `next_after` (the key to ask for the next page, None on the last page).
+        """
+        limit, after = self.__page_arguments(request)
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'{sql.format(after=f"{key} > ?")} ORDER BY {key} LIMIT ?;',
+                [*parameters, after, limit + 1]
+            )
+            rows = connector.cursor.fetchall()
+
+        next_after = rows[limit - 1][0] if len(rows) > limit else None
+        return {'rows': rows[:limit], 'next_after': next_after}
+
+    @staticmethod
+    def __course_filter(request: Request) -> tuple[str, list]:
+        'Returns the condition and parameters of the optional course_id query parameter.'
+        course_id = request.query.get('course_id')
+
+        if course_id is None:
+            return '', []
+
+        if not (course_id.isascii() and course_id.isdigit()) or int(course_id) > MAX_ID:
+            raise HttpError(400, 'course_id must be a course ID.')
+
+        return 'course_id = ? AND', [int(course_id)]
+
+    # students
+    def __list_students(self, request: Request) -> Response:
+        condition, parameters = self.__course_filter(request)
+        page = self.__page(
+            request,
+            f'SELECT {STUDENT_COLUMNS} FROM student WHERE {condition} {{after}}',
+            'enrollment_no',
+            parameters
+        )
+        return 200, {'items': [asdict(Student(*row)) for row in page['rows']], 'next_after': page['next_after']}
+
+    def __search_students(self, request: Request) -> Response:
+        columns = ('enrollment_no', 'name', 'f_name', 'phone_no', 'email', 'course_id')
+        limit, _ = self.__page_arguments(request)
+        rows = search_students(request.query.get('q', ''), limit)
+        return 200, {'items': [dict(zip(columns, row)) for row in rows]}
+
+    def __get_student(self, request: Request) -> Response:
+        record = student_service.get(request.params['enrollment_no'])
+
+        if record is None:
+            raise HttpError(404, 'This enrollment number is not found.')
+
+        return 200, asdict(record)
+
+    def __admit_student(self, request: Request) -> Response:
+        student = student_service.admit(self.__student_form(request))
+        return 201, asdict(student)
+
+    def __update_student(self, request: Request) -> Response:
+        student = student_service.update(request.params['enrollment_no'], self.__student_form(request))
+        return 200, asdict(student)
+
+    def __remove_student(self, request: Request) -> Response:
+        if not student_service.remove(request.params['enrollment_no']):
+            raise HttpError(404, 'This enrollment number is not found.')
+
+        return 204, None
+
+    @staticmethod
+    def __student_form(request: Request) -> StudentForm:
+        'Builds the admission form from a JSON body, numbers are accepted as numbers or text.'
+        body = request.json()
+        values = {}
+
+        for name in StudentForm.__dataclass_fields__:
+            value = body.get(name)
+            values[name] = None if value is None or str(value).strip() == '' else str(value)
+
+        return StudentForm(**values)
+
+    # library
+    def __lended_books(self, request: Request) -> Response:
+        lended = library_service.lended_to(request.params['enrollment_no'])
+        return 200, {'items': [asdict(book) for book in lended]}
+
+    def __lend_books(self, request: Request) -> Response:
+        lending = library_service.lend(request.params['enrollment_no'], self.__book_ids(request))
+        return 201, asdict(lending)
+
+    def __return_books(self, request: Request) -> Response:
+        returning = library_service.give_back(request.params['enrollment_no'], self.__book_ids(request))
+        return 200, asdict(returning)
+
+    @staticmethod
+    def __book_ids(request: Request) -> list[int]:
+        'Returns the book_ids list of a JSON body, IDs are range checked like the IDs in the path.'
+        book_ids = request.json().get('book_ids')
+
+        if not isinstance(book_ids, list) or not all(
+            isinstance(book_id, int) and not isinstance(book_id, bool) and 0 <= book_id <= MAX_ID
+            for book_id in book_ids
+        ):
+            raise HttpError(400, 'book_ids must be a list of book IDs.')
+
+        return book_ids
+
+    def __list_books(self, request: Request) -> Response:
+        condition, parameters = self.__course_filter(request)
+        page = self.__page(
+            request,
+            f'SELECT {BOOK_COLUMNS} FROM books WHERE {condition} {{after}}',
+            'book_id',
+            parameters
+        )
+        return 200, {'items': [asdict(Book(*row)) for row in page['rows']], 'next_after': page['next_after']}
+
+    def __search_books(self, request: Request) -> Response:
+        columns = ('book_id', 'name', 'quantity', 'course_id', 'isbn', 'publisher')
+        limit, _ = self.__page_arguments(request)
+        rows = search_books(request.query.get('q', ''), limit)
+        return 200, {'items': [dict(zip(columns, row)) for row in rows]}
+
+    def __get_book(self, request: Request) -> Response:
+        book = books.get(int(request.params['book_id']))
+
+        if book is None:
+            raise HttpError(404, 'This book ID is not found.')
+
+        return 200, asdict(book)
+
+    def __add_book(self, request: Request) -> Response:
+        body = request.json()
+        book = library_service.add_book(
+            name=body.get('name'),
+            quantity=body.get('quantity'),
+            course_id=body.get('course_id'),
+            isbn=None if body.get('isbn') is None else str(body['isbn']),
+            publisher=body.get('publisher')
+        )
+        return 201, asdict(book)
+
+    def __remove_book(self, request: Request) -> Response:
+        if not library_service.remove_book(request.params['book_id']):
+            raise HttpError(404, 'This book ID is not found.')
+
+        return 204, None
+
+    def __add_stock(self, request: Request) -> Response:
+        book = library_service.add_stock(request.params['book_id'], request.json().get('quantity'))
+        return 200, asdict(book)
+
+    # courses
+    def __list_courses(self, request: Request) -> Response:
+        page = self.__page(request, 'SELECT course_id, name, fee, year FROM courses WHERE {after}', 'course_id', [])
+        columns = ('course_id', 'name', 'fee', 'year')
+        return 200, {'items': [dict(zip(columns, row)) for row in page['rows']], 'next_after': page['next_after']}
+
+    def __get_course(self, request: Request) -> Response:
+        course = course_service.get(request.params['course_id'])
+
+        if course is None:
+            raise HttpError(404, 'This course ID is not found.')
+
+        return 200, asdict(course)
+
+    def __add_course(self, request: Request) -> Response:
+        body = request.json()
+        course = course_service.add(body.get('course_id'), body.get('name'), body.get('fee'), body.get('year'))
+        return 201, asdict(course)
+
+    def __update_course(self, request: Request) -> Response:
+        body = request.json()
+        course = course_service.update(request.params['course_id'], body.get('name'), body.get('fee'), body.get('year'))
+        return 200, asdict(course)
+
+    def __remove_course(self, request: Request) -> Response:
+        removed_students = course_service.remove(request.params['course_id'])
+        return 200, {'removed_students': removed_students}
+
+    # fees
+    def __fee_status(self, request: Request) -> Response:
+        status = fee_service.status(request.params['enrollment_no'])
+
+        if status is None:
+            raise HttpError(404, 'This enrollment number is not found.')
+
+        return 200, {
+            'enrollment_no': status.student.enrollment_no,
+            'total_fee': status.total_fee,
+            'fee_deposited': status.fee_deposited,
+            'remaining_fee': status.remaining_fee,
+            'transactions': [asdict(transaction) for transaction in fee_service.history(status.student.enrollment_no)]
+        }
+
+    def __deposit_fee(self, request: Request) -> Response:
+        transaction = fee_service.deposit(request.params['enrollment_no'], request.json().get('amount'))
+        return 201, asdict(transaction)
+
+    def __get_receipt(self, request: Request) -> Response:
+        receipt = fee_service.receipt(int(request.params['transaction_id']))
+
+        if receipt is None:
+            raise HttpError(404, 'This receipt is not found.')
+
+        return 200, {**asdict(receipt), 'remaining_fee': receipt.remaining_fee}
+
+    def __daily_totals(self, request: Request) -> Response:
+        first_day = request.query.get('first_day')
+        last_day = request.query.get('last_day')
+
+        if not first_day or not last_day:
+            raise HttpError(400, 'first_day and last_day are required, YYYY-MM-DD.')
+
+        columns = ('paid_on', 'amount', 'transactions')
+        return 200, {'items': [dict(zip(columns, row)) for row in fees.daily_totals(first_day, last_day)]}
+
+
+def main() -> None:
+    'Entry point of `python api_server.py`.'
+    parser = argparse.ArgumentParser(description='Local HTTP/JSON API over the college database.')
+    parser.add_argument('--database', default='data.sqlite', help='path of the database, default data.sqlite')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on, default 127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on, default 8000')
+    parser.add_argument('--workers', type=int, default=8, help='threads running the database calls, default 8')
+    arguments = parser.parse_args()
+
+    logging.basicConfig(
+        level= logging.INFO,
+        format= '%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    # one idle connection per worker thread
+    configure_pool(database=arguments.database, size=arguments.workers)
+    run_migrations()
+
+    server = ApiServer(arguments.host, arguments.port, arguments.workers)
+
+    try:
+        asyncio.run(server.serve_forever())
+
+    except KeyboardInterrupt:
+        logger.info('API stopped')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from collections.abc import Callable
+
+type widget = any
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside the worker thread by `BackgroundJob.check_cancelled()` once the job has been cancelled.
+    """
+
+
+@dataclass
+class Progress:
+    """
+    Progress of a background job, sent from the worker thread to the GUI.
+
+    Attributes:
+        - rows_done (int): rows processed so far.
+        - rows_total (int or None): rows to process, None if it is not known.
+        - rows_per_second (float): average speed since the job started.
+        - eta_seconds (float or None): estimated seconds left, None if `rows_total` is not known.
+    """
+    rows_done: int
+    rows_total: int | None
+    rows_per_second: float
+    eta_seconds: float | None
+
+    @property
+    def fraction(self) -> float:
+        'Fraction of the job that is done, 0 if the total is not known.'
+        if not self.rows_total:
+            return 0.0
+
+        return min(self.rows_done / self.rows_total, 1.0)
+
+    def __str__(self) -> str:
+        text = f'{self.rows_done:,}'
+
+        if self.rows_total is not None:
+            text += f' / {self.rows_total:,}'
+
+        text += f' rows  |  {self.rows_per_second:,.0f} rows/s'
+
+        if self.eta_seconds is not None:
+            text += f'  |  ETA {self.eta_seconds:,.0f} s'
+
+        return text
+
+
+class BackgroundJob:
+    """
+    Runs a long job (like an import or an export) on a worker thread so that the Tk main loop keeps responding, and brings its progress and result back to the GUI by polling a queue with `after()`.
+
+    Tk widgets must only be touched from the main thread, so the target never calls the GUI itself, every callback below runs on the main thread.
+
+    Parameters:
+        - master (widget): the widget whose `after()` is used for polling, if it is destroyed the job is cancelled.
+        - target (callable): function run on the worker thread as `target(job, *args)`, it calls `job.report()` to publish progress and `job.check_cancelled()` between units of work. Its return value is passed to `on_done`.
+        - args (tuple): extra arguments for the target.
+        - on_progress (callable or None): called with a `Progress` object.
+        - on_done (callable or None): called with the return value of the target.
+        - on_error (callable or None): called with the exception raised by the target.
+        - on_cancel (callable or None): called when the job stopped because it was cancelled.
+        - poll_interval (int): milliseconds between two polls, default 100.
+
+    Usage:
+    ```
+    job = BackgroundJob(
+        master=self,
+        target=self.__run_import,
+        args=(chunks,),
+        on_progress=lambda progress: self.progress_label.configure(text=str(progress)),
+        on_done=lambda rows: ShowInfo('Import Data', f'Imported {rows} rows.')
+    )
+    job.start()
+    ...
+    job.cancel()
+    ```
+    """
+
+    def __init__(
+        self,
+        master: widget,
+        target: Callable,
+        args: tuple = (),
+        on_progress: Callable | None = None,
+        on_done: Callable | None = None,
+        on_error: Callable | None = None,
+        on_cancel: Callable | None = None,
+        poll_interval: int = 100
+    ) -> None:
+        self.master = master
+        self.target = target
+        self.args = args
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.poll_interval = poll_interval
+
+        self.__events: queue.Queue = queue.Queue()
+        self.__cancelled = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__start_time = 0.0
+        self.__rows_total: int | None = None
+
+    @property
+    def running(self) -> bool:
+        'True while the worker thread is alive.'
+        return self.__thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Starts the worker thread and the polling loop.
+        """
+        self.__start_time = time.perf_counter()
+        self.__thread.start()
+        self.master.after(self.poll_interval, self.__poll)
+
+    def cancel(self) -> None:
+        """
+        Asks the job to stop, the worker stops at its next `check_cancelled()` call.
+        """
+        self.__cancelled.set()
+
+    def check_cancelled(self) -> None:
+        """
+        Called by the target between units of work.
+
+        Raises:
+            - JobCancelled: if `cancel()` was called.
+        """
+        if self.__cancelled.is_set():
+            raise JobCancelled()
+
+    def set_total(self, rows_total: int | None) -> None:
+        """
+        Called by the target once it knows how many rows it is going to process.
+        """
+        self.__rows_total = rows_total
+
+    def report(self, rows_done: int) -> None:
+        """
+        Called by the target to publish how many rows it has processed, computes the speed and the ETA.
+
+        Parameters:
+            - rows_done (int): rows processed so far.
+        """
+        elapsed = max(time.perf_counter() - self.__start_time, 1e-9)
+        rows_per_second = rows_done / elapsed
+
+        eta_seconds = None
+        if self.__rows_total is not None and rows_per_second > 0:
+            eta_seconds = max(self.__rows_total - rows_done, 0) / rows_per_second
+
+        self.__events.put(('progress', Progress(rows_done, self.__rows_total, rows_per_second, eta_seconds)))
+
+    def __run(self) -> None:
+        """
+        Body of the worker thread, puts the outcome of the target on the queue.
+        """
+        try:
+            result = self.target(self, *self.args)
+
+        except JobCancelled:
+            self.__events.put(('cancelled', None))
+
+        except Exception as e:
+            self.__events.put(('error', e))
+
+        else:
+            self.__events.put(('done', result))
+
+    def __poll(self) -> None:
+        """
+        Runs on the main thread, drains the queue and calls the callbacks. Only the latest progress event is shown.
+        """
+        try:
+            if not self.master.winfo_exists():
+                self.cancel()
+                return None
+
+        except Exception:
+            # the Tk application itself is gone
+            self.cancel()
+            return None
+
+        latest_progress = None
+        finished = None
+
+        while True:
+            try:
+                kind, value = self.__events.get_nowait()
+
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                latest_progress = value
+
+            else:
+                finished = (kind, value)
+
+        if latest_progress is not None and self.on_progress:
+            self.on_progress(latest_progress)
+
+        if finished is None:
+            self.master.after(self.poll_interval, self.__poll)
+            return None
+
+        kind, value = finished
+        callback = {
+            'done': self.on_done,
+            'error': self.on_error,
+            'cancelled': self.on_cancel
+        }[kind]
+
+        if callback:
+            if kind == 'cancelled':
+                callback()
+
+            else:
+                callback(value)
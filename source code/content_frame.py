@@ -1,8 +1,20 @@
 import customtkinter as ctk
 import re
-from datetime import datetime
-from database_connector import DatabaseConnector
+import sqlite3
+from datetime import date, datetime
+from time import perf_counter
+from tkinter.filedialog import asksaveasfilename
+from database_connector import DatabaseConnector, PRAGMA_PROFILES, pragma_report
 from messagebox import ShowError, ShowInfo, ShowWarning
+from virtual_table import VirtualTable
+from paged_listing import PagedListing
+from search import search_books, search_students
+from screen_cache import ScreenCache
+from settings_service import settings
+from course_cache import courses
+from receipt import RECEIPT_FORMATS, save_receipt
+from export_engine import forget_changes
+from services import OutOfStock, ServiceError, StudentForm, course_service, fee_service, library_service, student_service
 
 type CTkWindow = ctk.CTk
 type stringvar = ctk.StringVar
@@ -21,6 +33,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
     The following functions should be called from the Menu class:
         - `new_admission_gui()`
         - `fetch_student_data()`
+        - `search_student_gui()`
         - `update_student_gui()`
         - `remove_student_gui()`
         - `deposit_fee()`
@@ -31,6 +44,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         - `add_book_gui()`
         - `remove_book_gui()`
         - `show_books()`
+        - `search_book_gui()`
         - `lend_book()`
         - `return_book()`
         - `update_stock_gui()`
@@ -44,19 +58,27 @@ class ContentFrame(ctk.CTkScrollableFrame):
         - All attributes are explained in their respective functions.
 
     Note:
+        - The forms are built once and cached by `self.screens` (a `ScreenCache`), navigating hides them instead of destroying them. Screens listing courses are invalidated whenever the courses change.
+        - The rules and the database access of every operation are in services.py, the methods of this class read the widgets, call a service and show the result or the `ServiceError`.
         - master attribute must be a customtkinter window.
         - Randomly calling any function may result in inappropriate behaviour and errors.
         - These functions are designed to be called via Menu class, and will execute in a specific order.
     """
 
+    # cached screens showing the list of courses
+    course_screens = ('new_admission', 'add_book', 'remove_course', 'update_course')
+
     def __init__(self, master: CTkWindow, user: str, **kwargs) -> None:
         super().__init__(master, **kwargs)
         self.user = user
+        self.screens = ScreenCache(self)
+        # the forms listing the courses are built again after the courses change
+        courses.add_listener(lambda: self.screens.invalidate(*self.course_screens))
 
     # helper funcs
     def content_remover(self) -> None:
         """
-        It uses customtkinter's winfo_children() to get all widgets currently present in the frame, and destroy them one-by-one. This is widely used in various functions of this class.
+        It uses customtkinter's winfo_children() to get all widgets currently present in the frame, widgets of cached screens are hidden and the others are destroyed one-by-one. This is widely used in various functions of this class.
 
         Parameters:
             - None
@@ -65,7 +87,11 @@ class ContentFrame(ctk.CTkScrollableFrame):
             - None
         """
         for widget in self.winfo_children():
-            widget.destroy()
+            if self.screens.owns(widget):
+                self.screens.hide(widget)
+
+            else:
+                widget.destroy()
 
     def __create_label_and_entry(
             self,
@@ -128,39 +154,27 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Returns:
             - None
         """
-        with DatabaseConnector() as connector:
-            # finding all the integers
-            course_id = re.findall(r'\d+', self.course_var.get())
-            connector.cursor.execute(
-                'SELECT * FROM courses WHERE course_id = ?',
-                course_id
-            )
+        course = course_service.get(self.__selected_course_id(self.course_var) or '')
 
-            result = connector.cursor.fetchall()[0]
+        if course is None:
+            return None
 
         self.course_info.configure(
-            text=f'{"Course ID": <10}: {result[0]}\n{"Name": <10}: {result[1]}\n{"Fee": <10}: {result[2]}\n{"Year": <10}: {result[3]}')
+            text=f'{"Course ID": <10}: {course.course_id}\n{"Name": <10}: {course.name}\n{"Fee": <10}: {course.fee}\n{"Year": <10}: {course.year}')
 
-    def __age_calc(self, date: str) -> int:
+    @staticmethod
+    def __selected_course_id(course_var: stringvar) -> StrOrNone:
         """
-        This method takes a date string, converts it to a datetime object, calculates the age based on the current date, and returns the result as an integer
+        Returns the course ID of a course dropdown value, e.g. "3" for "3(BCA)".
 
         Parameters:
-            - date (str): date string of form `YYYY-MM-DD`
+            - course_var (stringvar): variable of the dropdown.
 
         Returns:
-            - int, age of person
+            - StrOrNone, None if no course is selected.
         """
-
-        birth_date = datetime.strptime(date, "%Y-%m-%d")
-        current_date = datetime.now()
-
-        # First calculates the difference in years between the current year and the birth year.Then a tuple comparison. It checks if the current month and day are earlier in the year than the birth month and day. If true, it means the birthday for the current year hasn't occurred yet, so we subtract 1 from the age.
-        age = current_date.year - birth_date.year - \
-            ((current_date.month, current_date.day)
-             < (birth_date.month, birth_date.day))
-
-        return age
+        course_id = re.findall(r'\d+', course_var.get())
+        return course_id[0] if course_id else None
 
     @staticmethod
     def __valueGetter(var: str) -> StrOrNone:
@@ -179,7 +193,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         else:
             return var
 
-    def __get_info_from_widgets_for_accounts(self) -> tuple:
+    def __get_info_from_widgets_for_accounts(self) -> StudentForm:
         """
         It is used to get values from the widgets present in the accounts window (mainly new_admission and update_student).
 
@@ -187,28 +201,25 @@ class ContentFrame(ctk.CTkScrollableFrame):
             - None
 
         Returns:
-            - tuple of name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per all these variables.
+            - StudentForm, the values of the widgets, empty values are None.
         """
-        name = self.__valueGetter(self.name_var.get())
-        f_name = self.__valueGetter(self.f_name_var.get())
-
         year = self.__valueGetter(self.year_var.get())
         month = self.__valueGetter(self.month_var.get())
         day = self.__valueGetter(self.day_var.get())
 
-        address = self.__valueGetter(self.address_var.get())
-        phone_no = self.__valueGetter(self.phone_no_var.get())
-        email = self.__valueGetter(self.email_var.get())
-
-        gender = self.gender_var.get()
-        pincode = self.__valueGetter(self.pincode_var.get())
-
-        course_id = re.findall(r'\d+', self.course_var.get())
-
-        class_10_per = self.__valueGetter(self.per10_var.get())
-        class_12_per = self.__valueGetter(self.per12_var.get())
-
-        return name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per
+        return StudentForm(
+            name= self.__valueGetter(self.name_var.get()),
+            f_name= self.__valueGetter(self.f_name_var.get()),
+            dob= f"{year}-{month}-{day}",
+            address= self.__valueGetter(self.address_var.get()),
+            phone_no= self.__valueGetter(self.phone_no_var.get()),
+            email= self.__valueGetter(self.email_var.get()),
+            gender= self.__valueGetter(self.gender_var.get()),
+            pincode= self.__valueGetter(self.pincode_var.get()),
+            course_id= self.__selected_course_id(self.course_var),
+            class_10_per= self.__valueGetter(self.per10_var.get()),
+            class_12_per= self.__valueGetter(self.per12_var.get())
+        )
 
     def __get_info_from_widgets_for_courses(self) -> tuple:
         """
@@ -372,15 +383,18 @@ class ContentFrame(ctk.CTkScrollableFrame):
         col: int, 
         data: list[tuple[str]],
         word_wrap_length: int = 400
-    ) -> None:
+    ) -> VirtualTable:
         """
-        Creates a table of rowxcol dimensions and assigns a value to it according to data.
+        Creates a table of rowxcol dimensions and assigns a value to it according to data. The table is a `VirtualTable`, only the visible rows have widgets, so a long table is as fast to show as a short one.
 
         Parameters:
             - master (ctkFrame): a customtkinter frame object.
             - row (int): Number of rows in the table.
             - col (int): Number of columns in the table.
-            - data (list[tuple[str]]): `list` of `tuples` containing strings. `row` must be equal to the number of strings in tuple, `col` must be equal to number of tuples. 
+            - data (list[tuple[str]]): `list` of `tuples` containing strings. `row` must be equal to the number of strings in tuple, `col` must be equal to number of tuples. The first tuple is the header of the table.
+
+        Returns:
+            - VirtualTable: the table, its rows can be replaced with `set_rows()`.
         """
         #header
         ctk.CTkLabel(
@@ -389,57 +403,96 @@ class ContentFrame(ctk.CTkScrollableFrame):
             font=('arial', 28)
         ).pack(pady= 5, padx= 5)
 
-        # Create a container frame to hold the table
-        container_frame = ctk.CTkFrame(
+        table = VirtualTable(
             master= master,
-            fg_color= ('#f2f2f4', '#4a4a4a')
+            columns= data[0][:col],
+            rows= data[1:row],
+            word_wrap_length= word_wrap_length
         )
-        container_frame.pack()
+        table.pack()
+
+        return table
+
+
+    def __create_search_screen(
+        self,
+        header: str,
+        columns: tuple[str],
+        search: callable,
+        word_wrap_length: int = 400
+    ) -> None:
+        """
+        Creates a search-as-you-type screen: an entry, a label with the number of matches and the time taken, and a table of the results. The search runs once the user stops typing for 150 ms.
+
+        Parameters:
+            - header (str): text of the header.
+            - columns (tuple[str]): headers of the result table.
+            - search (callable): called with the text, returns the rows of the result table.
+            - word_wrap_length (int): wraplength of the cells (default 400).
+
+        Returns:
+            - None
+        """
+        self.content_remover()
 
         frame = ctk.CTkFrame(
-            master=container_frame,
-            fg_color=('#f2f2f4', '#4a4a4a')
+            master= self
         )
+
         frame.pack(
-            pady=5,
-            padx=5
+            pady= (0, 5), 
+            padx= 5,
+            fill= 'both',
+            expand= True
         )
 
-        # Set weights for rows and columns
-        for i in range(row):
-            frame.grid_rowconfigure(i, weight=1)
-        for i in range(col):
-            frame.grid_columnconfigure(i, weight=1, minsize= 100)
-
-        for x in range(row):
-            for y in range(col):
-                if x == 0 or y == 0:
-                    fg = ('#7983ad', '#40486d')
-                else:
-                    fg = ('#DBDBDB', '#2B2B2B')
-
-                frame_grid = ctk.CTkFrame(
-                    master= frame,
-                    border_width= 2,
-                    corner_radius= 0,
-                    border_color= ('#000000', '#ffffff'),
-                    fg_color= fg
-                )
-                frame_grid.grid(
-                    row= x, 
-                    column= y,
-                    sticky= 'nsew'
-                )
-                labelGrid = ctk.CTkLabel(
-                    master= frame_grid, 
-                    text= data[x][y],
-                    wraplength= word_wrap_length
-                )
-                labelGrid.pack(
-                    padx=5, 
-                    pady=5
-                )
+        ctk.CTkLabel(
+            master= frame,
+            text= header,
+            font= ('arial', 28)
+        ).pack(pady= 5, padx= 5)
+
+        self.search_text = ctk.StringVar()
+
+        entry = ctk.CTkEntry(
+            master= frame,
+            textvariable= self.search_text,
+            width= 400
+        )
+        entry.pack(pady= 5)
+        entry.focus_set()
+
+        result_label = ctk.CTkLabel(
+            master= frame,
+            text= 'Start typing to search.'
+        )
+        result_label.pack()
+
+        table = VirtualTable(
+            master= frame,
+            columns= columns,
+            rows= [],
+            word_wrap_length= word_wrap_length
+        )
+        table.pack(pady= 5)
+
+        def run_search() -> None:
+            self.search_job = None
+            start = perf_counter()
+            results = search(self.search_text.get())
+            elapsed = (perf_counter() - start) * 1000
+
+            table.set_rows(results)
+            result_label.configure(text= f'{len(results)} matches in {elapsed:.1f} ms')
 
+        def schedule_search(*_) -> None:
+            if self.search_job is not None:
+                self.after_cancel(self.search_job)
+
+            self.search_job = self.after(150, run_search)
+
+        self.search_job = None
+        self.search_text.trace_add('write', schedule_search)
 
     # new admission funcs
     def new_admission_gui(
@@ -447,6 +500,26 @@ class ContentFrame(ctk.CTkScrollableFrame):
         event: any = None,
         update: bool = False
     ) -> None:
+        """
+        Shows the new admission form, it is built once and cached, showing it again clears it.
+
+        Parameters:
+            - update (bool): if True, builds the form for update student instead, which is not cached.
+
+        Returns:
+            - None
+        """
+        if update:
+            self.__new_admission_form(update=True)
+            return None
+
+        self.screens.show(
+            'new_admission',
+            self.__new_admission_form,
+            on_show=lambda: self.course_info.configure(text="Please select course to get its info...")
+        )
+
+    def __new_admission_form(self, update: bool = False) -> None:
         """
         Main GUI function for new admission
 
@@ -611,13 +684,9 @@ class ContentFrame(ctk.CTkScrollableFrame):
         ).grid(row=10, column=2, sticky='w')
 
         # course
-        with DatabaseConnector() as connector:
-            connector.cursor.execute("SELECT course_id, name FROM courses")
-            course_data = connector.cursor.fetchall()
-
-        courses = ctk.CTkComboBox(
+        courses_combo_box = ctk.CTkComboBox(
             master=self,
-            values=[f"{i[0]}({i[1]})" for i in course_data],
+            values=courses.dropdown_values(),
             variable=self.course_var,
             width=110,
             command=self.__get_course_info
@@ -632,7 +701,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             pady=5,
             sticky='w'
         )
-        courses.grid(
+        courses_combo_box.grid(
             row=11,
             column=1
         )
@@ -684,135 +753,28 @@ class ContentFrame(ctk.CTkScrollableFrame):
                 column=1
             )
 
-    def __new_admission_constraints(
-        self,
-        name: StrOrNone,
-        f_name: StrOrNone,
-        year: StrOrNone,
-        month: StrOrNone,
-        day: StrOrNone,
-        address: StrOrNone,
-        phone_no: StrOrNone,
-        email: StrOrNone,
-        gender: StrOrNone,
-        pincode: StrOrNone,
-        course_id: StrOrNone,
-        class_10_per: StrOrNone,
-        class_12_per: StrOrNone
-    ) -> StrOrNone:
-        """
-        It checks all the values passed to it, to validate them. It is called via `__new_admission_submit()`
-
-        Parameters:
-            - Each parameter has value as there name suggests.
-
-        Returns:
-            - if any of the following conditions met then it will return the respective error message, else returns None
-        """
-
-        name_pattern = r'^[a-zA-Z ]+$'
-
-        if not name:
-            return "Please enter Name."
-
-        if not re.match(name_pattern, name):
-            return "Invalid Name, please enter a proper name."
-
-        if f_name and not re.match(name_pattern, f_name):
-            return "Invalid Father Name, please enter a proper name."
-
-        if year == 'Year':
-            return "Please select Year."
-
-        if month == 'Month':
-            return "Please select Month."
-
-        if day == 'Day':
-            return "Please select Day."
-
-        if not (year.isnumeric() and month.isnumeric() and day.isnumeric()):
-            return "Invalid Date, please enter a proper date."
-
-        if not address:
-            return "Please enter Address."
-
-        if not phone_no:
-            return "Please enter Phone Number."
-
-        if not phone_no.isnumeric() or len(phone_no) != 10:
-            return "Invalid Phone Number, please enter a proper number"
-
-        if email and not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-            return "Invalid Email, please enter a proper email."
-
-        if not gender:
-            return "Please select Gender."
-
-        if not pincode:
-            return "Please enter Pincode."
-
-        if not pincode.isnumeric() or len(pincode) != 6:
-            return "Invalid Pincode, please enter a proper pincode."
-
-        if not class_10_per or not class_12_per:
-            return "Please enter percentage."
-
-        if not class_10_per.replace('.', '').isnumeric() or not class_12_per.replace('.', '').isnumeric():
-            return "Invalid Percentage, please enter a decimal or numeric value."
-
-        if not course_id:
-            return "Please select Course."
-
-        with DatabaseConnector() as connector:
-            connector.cursor.execute("SELECT course_id FROM courses;")
-            courses = connector.cursor.fetchall()
-
-        if int(course_id[0]) not in [i[0] for i in courses]:
-            return "Please select correct course from the list."
-
-        return None
-
     def __new_admission_submit(self) -> None:
         """
-        It is the submission function for new admission. Takes all the values from the widgets via `self.__get_info_from_widgets_for_accounts()`. Checks them using `self.__new_admission_constraints()` and shows any error message that is occured. Then insert the values into the database.
+        It is the submission function for new admission. Takes all the values from the widgets via `self.__get_info_from_widgets_for_accounts()` and admits the student with `student_service.admit()`, which checks them. Shows the error message if the values are not valid.
         """
-        # getting values from widgets
-        name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per = self.__get_info_from_widgets_for_accounts()
-
-        # checking constraints
-        if error_msg := self.__new_admission_constraints(name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per):
-            ShowError("New Admission", error_msg)
-            return None
-
-        # caluculating dob, age and year of admission
         try:
-            dob = f"{year}-{month}-{day}"
-            year_of_ad = datetime.now().year
-            age = self.__age_calc(dob)
-
-        except ValueError:
-            ShowError("New Admission", "Invalid date.")
+            student = student_service.admit(self.__get_info_from_widgets_for_accounts())
 
-        # writing data to db
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                'INSERT INTO student(name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                [name, dob, address, phone_no, email, year_of_ad, age, gender,
-                    pincode, course_id[0], f_name, class_10_per, class_12_per]
-            )
-            connector.db.commit()
-
-            connector.cursor.execute('SELECT last_insert_rowid()')
-            enrollment_no = connector.cursor.fetchall()[0][0]
+        except ServiceError as e:
+            ShowError("New Admission", str(e))
+            return None
 
-        ShowInfo("New Admission", f"You have successfully submitted the data. Enrollment number: {enrollment_no}")
+        ShowInfo("New Admission", f"You have successfully submitted the data. Enrollment number: {student.enrollment_no}")
 
     # fetch data funcs
     def fetch_student_data(self, event: any = None) -> None:
-        'Simply calls __ask_enrollment.'
-        self.__ask_enrollment(
-            label_text='Fetch Student Data',
-            command=self.__fetch_student_submit
+        'Shows the enrollment number screen of __ask_enrollment, cached by self.screens.'
+        self.screens.show(
+            'fetch_student',
+            lambda: self.__ask_enrollment(
+                label_text='Fetch Student Data',
+                command=self.__fetch_student_submit
+            )
         )
 
     def __fetch_student_submit(self) -> None:
@@ -820,72 +782,79 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Submission function for fetch_student_data(), retrives the data of the student (whose enrollment number is provided) from database. If enrollment number is not found then prompt the user with an error message.
         """
         # retreiving student info from db
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''
-                    SELECT * 
-                    FROM student
-                    INNER JOIN courses
-                    ON student.course_id = courses.course_id
-                    WHERE enrollment_no = ?
-                ''',
-                [self.enrollment_no.get()]
-            )
+        record = student_service.get(self.enrollment_no.get())
 
-            try:
-                data = connector.cursor.fetchall()[0]
-                self.content_remover()
+        if record is None:
+            ShowError('Fetch Student Data', 'This enrollment number is not found.')
+            return None
 
-                frame = ctk.CTkFrame(
-                    master= self
-                )
+        student, course = record.student, record.course
 
-                frame.pack(
-                    pady= (0, 5), 
-                    padx= 5,
-                    fill= 'both',
-                    expand= True
-                )
+        self.content_remover()
 
-                # creating table
-                data_of_student = [
-                    ('Parameter', 'Detail'),
-                    ('Enrollment Number', data[0]),
-                    ('Name', data[1]),
-                    ('Father Name', data[11]),
-                    ('Date of Birth', data[2]),
-                    ('Address', data[3]),
-                    ('Phone Number', data[4]),
-                    ('Email', data[5]),
-                    ('Year of Admission', data[6]),
-                    ('Age', data[7]),
-                    ('Gender', data[8]),
-                    ('Pincode', data[9]),
-                    ('10th Percentage (%)', data[12]),
-                    ('12th Percentage (%)', data[13]),
-                    ('Course ID', data[10]),
-                    ('Course Name', data[16]),
-                    ('Course Fee', data[17]),
-                    ('Course Year', data[18]),
-                    ('Fee Deposited', data[14])
-                ]
-                self.__create_table(
-                    master= frame,
-                    header= 'Student Details',
-                    row= 19,
-                    col= 2,
-                    data= data_of_student
-                )
+        frame = ctk.CTkFrame(
+            master= self
+        )
+
+        frame.pack(
+            pady= (0, 5),
+            padx= 5,
+            fill= 'both',
+            expand= True
+        )
+
+        # creating table
+        data_of_student = [
+            ('Parameter', 'Detail'),
+            ('Enrollment Number', student.enrollment_no),
+            ('Name', student.name),
+            ('Father Name', student.f_name),
+            ('Date of Birth', student.dob),
+            ('Address', student.address),
+            ('Phone Number', student.phone_no),
+            ('Email', student.email),
+            ('Year of Admission', student.year_of_ad),
+            ('Age', student.age),
+            ('Gender', student.gender),
+            ('Pincode', student.pincode),
+            ('10th Percentage (%)', student.class_10_per),
+            ('12th Percentage (%)', student.class_12_per),
+            ('Course ID', student.course_id),
+            ('Course Name', course.name),
+            ('Course Fee', course.fee),
+            ('Course Year', course.year),
+            ('Fee Deposited', student.fee_deposited)
+        ]
+        self.__create_table(
+            master= frame,
+            header= 'Student Details',
+            row= 19,
+            col= 2,
+            data= data_of_student
+        )
 
-            # if data retrived is an empty tuple then prompting error message
-            except IndexError:
-                ShowError('Fetch Student Data', 'This enrollment number is not found.')
+    def search_student_gui(self, event: any = None) -> None:
+        """
+        Search-as-you-type screen for students, searches the name, father name, address, email and phone number with the full-text index.
+        """
+        self.screens.show(
+            'search_student',
+            lambda: self.__create_search_screen(
+                header= 'Search Student',
+                columns= ('Enrollment Number', 'Name', 'Father Name', 'Phone Number', 'Email', 'Course ID'),
+                search= search_students,
+                word_wrap_length= 200
+            )
+        )
 
     # update data funcs
     def update_student_gui(self, event: any = None) -> None:
-        self.__ask_enrollment(
-            label_text='Update Student Data',
-            command=self.__update_student_submit
+        self.screens.show(
+            'update_student',
+            lambda: self.__ask_enrollment(
+                label_text='Update Student Data',
+                command=self.__update_student_submit
+            )
         )
 
     def __update_student_submit(self) -> None:
@@ -893,105 +862,85 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Submission function for update_student_gui(), retrives data of student then calls the new_admission_gui() with update=True, and updates all the entry widgets by the data of student. 
         """
         # retrieving student data
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''SELECT * 
-                    FROM student
-                    WHERE enrollment_no = ?
-                    ''',
-                [self.enrollment_no.get()]
-            )
+        record = student_service.get(self.enrollment_no.get())
 
-            try:
-                data = connector.cursor.fetchall()[0]
-                self.content_remover()
-
-                self.new_admission_gui(update=True)
-                # assigning values to all the variables
-                self.name_var.set(data[1])
-
-                if not data[11]:
-                    self.f_name_var.set('')
-                else:
-                    self.f_name_var.set(data[11])
-
-                date = data[2].split('-')
-
-                self.year_var.set(date[0])
-                self.month_var.set(date[1])
-                self.day_var.set(date[2])
-                self.address_var.set(data[3])
-                self.phone_no_var.set(data[4])
-
-                if not data[5]:
-                    self.email_var.set('')
-                else:
-                    self.email_var.set(data[5])
-
-                self.gender_var.set(data[8])
-                self.pincode_var.set(data[9])
-                self.course_var.set(data[10])
-                self.per10_var.set(data[12])
-                self.per12_var.set(data[13])
-                self.__get_course_info()
-
-                update_button = ctk.CTkButton(
-                    master=self,
-                    text='Update',
-                    width=120,
-                    command=self.__update_student_data_in_db
-                )
-                update_button.grid(
-                    row=13,
-                    column=3,
-                    pady=50
-                )
+        if record is None:
+            ShowError('Fetch Student Data',
+                      'This enrollment number is not found.')
+            return None
+
+        student = record.student
+
+        self.content_remover()
+
+        self.new_admission_gui(update=True)
+        # assigning values to all the variables
+        self.name_var.set(student.name)
+
+        if not student.f_name:
+            self.f_name_var.set('')
+        else:
+            self.f_name_var.set(student.f_name)
+
+        date = student.dob.split('-')
 
-            except IndexError:
-                ShowError('Fetch Student Data',
-                          'This enrollment number is not found.')
+        self.year_var.set(date[0])
+        self.month_var.set(date[1])
+        self.day_var.set(date[2])
+        self.address_var.set(student.address)
+        self.phone_no_var.set(student.phone_no)
+
+        if not student.email:
+            self.email_var.set('')
+        else:
+            self.email_var.set(student.email)
+
+        self.gender_var.set(student.gender)
+        self.pincode_var.set(student.pincode)
+        self.course_var.set(student.course_id)
+        self.per10_var.set(student.class_10_per)
+        self.per12_var.set(student.class_12_per)
+        self.__get_course_info()
+
+        update_button = ctk.CTkButton(
+            master=self,
+            text='Update',
+            width=120,
+            command=self.__update_student_data_in_db
+        )
+        update_button.grid(
+            row=13,
+            column=3,
+            pady=50
+        )
 
     def __update_student_data_in_db(self) -> None:
         """
          Updates the data of a student in the database.
 
-        This method works similarly to the `__new_admission_submit()` method and is called via the `__update_student_submit()` function. It retrieves information from the GUI widgets, performs necessary validations, and updates the student's record in the database.
+        This method works similarly to the `__new_admission_submit()` method and is called via the `__update_student_submit()` function. It retrieves information from the GUI widgets and updates the student's record with `student_service.update()`, which validates it.
 
         """
-        name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per = self.__get_info_from_widgets_for_accounts()
-
-        if error_msg := self.__new_admission_constraints(name, f_name, year, month, day, address, phone_no, email, gender, pincode, course_id, class_10_per, class_12_per):
-            ShowError("Update Student", error_msg)
-            return None
-
         try:
-            dob = f"{year}-{month}-{day}"
-            year_of_ad = datetime.now().year
-            age = self.__age_calc(dob)
+            student_service.update(self.enrollment_no.get(), self.__get_info_from_widgets_for_accounts())
 
-        except ValueError:
-            ShowError("Update Student", "Invalid date.")
+        except ServiceError as e:
+            ShowError("Update Student", str(e))
+            return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''UPDATE student
-                SET name=?, dob=?, address=?, phone_no=?, email=?, year_of_ad=?, age=?, gender=?, pincode=?, course_id=?, f_name=?, class_10_per=?, class_12_per=?
-                WHERE enrollment_no = ?;
-                ''',
-                [name, dob, address, phone_no, email, year_of_ad, age, gender, pincode,
-                    course_id[0], f_name, class_10_per, class_12_per, self.enrollment_no.get()]
-            )
-            connector.db.commit()
-            ShowInfo("Update Student", "You have successfully updated the data.")
+        ShowInfo("Update Student", "You have successfully updated the data.")
 
     # remove data funcs
     def remove_student_gui(self, event: any = None) -> None:
-        self.__ask_enrollment(
-            label_text='Remove Student',
-            command=lambda: ShowWarning(
-                'Remove Student',
-                'Do you really want to delete this student, click OK to delete.',
-                self.__remove_student_data_in_db
+        self.screens.show(
+            'remove_student',
+            lambda: self.__ask_enrollment(
+                label_text='Remove Student',
+                command=lambda: ShowWarning(
+                    'Remove Student',
+                    'Do you really want to delete this student, click OK to delete.',
+                    self.__remove_student_data_in_db
+                )
             )
         )
 
@@ -1001,35 +950,28 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         This method is called via the `remove_student_gui()` function and is responsible for deleting the student's record from the database based on their enrollment number.
         """
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                'SELECT name FROM student WHERE enrollment_no = ?',
-                [self.enrollment_no.get()]
-            )
-            result = connector.cursor.fetchall()
-            if not result:
-                ShowInfo('Remove Student',
-                         'This enrollment number is not found.')
-                return None
+        if not student_service.remove(self.enrollment_no.get()):
+            ShowInfo('Remove Student',
+                     'This enrollment number is not found.')
+            return None
 
-            connector.cursor.execute(
-                'DELETE FROM student WHERE enrollment_no = ?',
-                [self.enrollment_no.get()]
-            )
-            connector.db.commit()
-            ShowInfo('Remove Student', 'Student is removed.')
+        ShowInfo('Remove Student', 'Student is removed.')
 
     # fee deposit funcs
     def deposit_fee(self, event: any = None) -> None:
-        self.__ask_enrollment(
-            label_text='Deposit Fee',
-            command=self.__get_fee_info
+        self.screens.show(
+            'deposit_fee',
+            lambda: self.__ask_enrollment(
+                label_text='Deposit Fee',
+                command=self.__get_fee_info
+            )
         )
 
     def __get_fee_info(
         self, 
         generate_receipt: bool = False, 
-        current_transaction: int | None = None
+        current_transaction: int | None = None,
+        receipt_no: int | None = None
     ) -> None:
         """
         Retrieves and displays fee information for a student based on their enrollment number.
@@ -1039,219 +981,229 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Parameters: 
             - generate_receipt (bool): If True it will generate the receipt and display to the user, default False
             - current_transaction (int or None): It should only be passed if generate_receipt is True, default None.
+            - receipt_no (int or None): ID of the fee transaction of the receipt, the receipt can be saved as a file if it is given, default None.
 
         Returns: 
             - None
         """
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''SELECT student.fee_deposited, courses.fee, student.name
-                FROM student
-                INNER JOIN courses
-                ON student.course_id = courses.course_id
-                WHERE student.enrollment_no = ?
-                ''',
-                [self.enrollment_no.get()]
-            )
-            data = connector.cursor.fetchall()
+        status = fee_service.status(self.enrollment_no.get())
 
-        try:
-            fee_deposited, total_fee, name = data[0]
-            remaining_fee = total_fee - fee_deposited
+        if status is None:
+            ShowError('Deposit Fee', 'This enrollment number is not found.')
+            return None
 
-            self.content_remover()
+        student, course = status.student, status.course
+        fee_deposited, total_fee, name = status.fee_deposited, status.total_fee, student.name
+        remaining_fee = status.remaining_fee
 
-            #left side frame for fee info and depositing
-            info_frame = ctk.CTkFrame(
-                master= self,
-                fg_color= ('#f2f2f4', '#4a4a4a')
-            )
+        self.content_remover()
 
-            info_frame.pack(
-                pady= 5, 
-                padx= 5,
-                fill= 'both',
-                expand= True,
-                side= 'left'
-            )  
-
-            #receipt frame
-            receipt_frame = ctk.CTkFrame(
-                master= self,
-                fg_color= ('#f2f2f4', '#4a4a4a')
-            )
-            receipt_frame.pack(
-                pady= 5,
-                padx= (0, 5),
-                fill= 'both',
-                expand= True,
-                side= 'right'
-            )
+        #left side frame for fee info and depositing
+        info_frame = ctk.CTkFrame(
+            master= self,
+            fg_color= ('#f2f2f4', '#4a4a4a')
+        )
+
+        info_frame.pack(
+            pady= 5, 
+            padx= 5,
+            fill= 'both',
+            expand= True,
+            side= 'left'
+        )  
+
+        #receipt frame
+        receipt_frame = ctk.CTkFrame(
+            master= self,
+            fg_color= ('#f2f2f4', '#4a4a4a')
+        )
+        receipt_frame.pack(
+            pady= 5,
+            padx= (0, 5),
+            fill= 'both',
+            expand= True,
+            side= 'right'
+        )
+
+        fee_info = [
+            ('Parameter', 'Detail'),
+            ('Name', name),
+            ('Total Fee', total_fee),
+            ('Fee Deposited', fee_deposited),
+            ('Remaining Fee', remaining_fee)
+        ]
+        #creating table
+        self.__create_table(
+            master= info_frame,
+            header= 'Student Details',
+            row= 5,
+            col= 2,
+            data= fee_info
+        )
+
+        #deposit button
+        ctk.CTkLabel(
+            master= info_frame,
+            text='Deposit Fee',
+            font=('arial', 28)
+        ).pack(padx=10, pady= (10, 5))
+
+        ctk.CTkLabel(
+            master= info_frame,
+            text='Amount to deposit'
+        ).pack(padx=50, pady=5)
+
+        amount = ctk.StringVar()
+        entyr = ctk.CTkEntry(
+            master= info_frame,
+            textvariable=amount,
+            width=140
+        )
+        entyr.pack()
+
+        button = ctk.CTkButton(
+            master= info_frame,
+            text= 'Deposit',
+            command= lambda: self.__change_fee_in_db_and_generate_receipt(amount)
+        )
 
-            fee_info = [
-                ('Parameter', 'Detail'),
-                ('Name', name),
-                ('Total Fee', total_fee),
-                ('Fee Deposited', fee_deposited),
-                ('Remaining Fee', remaining_fee)
+        if remaining_fee == 0:
+            button.configure(state= 'disabled')
+            entyr.configure(state= 'disabled')
+
+        button.pack(pady=20)
+
+        if generate_receipt:
+            ctk.CTkLabel(
+                master= receipt_frame,
+                text= 'Receipt',
+                font= ('arial', 16, 'underline')
+            ).pack()
+
+            ctk.CTkLabel(
+                master= receipt_frame,
+                text= 'College Management System',
+                font= ('arial', 28, 'bold')
+            ).pack(pady= 5)
+
+            date_time = datetime.now()
+            today_date = date_time.strftime("%d/%m/%Y")
+
+            details = f'''
+{"Name of Student": <20}: {name}
+{"Phone Number": <20}: {student.phone_no}
+{"Address": <20}: {student.address}
+
+{"Course Name": <20}: {course.name}
+{"Course Year": <20}: {course.year}
+{"Date of Payment": <20}: {today_date}
+'''
+            ctk.CTkLabel(
+                master= receipt_frame,
+                text= details,
+                font= ('consolas', 14),
+                justify= 'left',
+                wraplength= 600
+            ).pack(pady= (0, 10))
+
+            table_data = [
+                ('Sr.No.', 'Particulars', 'Amount(₹)'),
+                (1, 'Total Fee', total_fee),
+                (2, 'Fee Deposited (current transaction)', current_transaction),
+                (3, 'Overall Fee Deposited', fee_deposited),
+                (4, 'Remaining Fee', remaining_fee)
             ]
-            #creating table
+
             self.__create_table(
-                master= info_frame,
-                header= 'Student Details',
+                master= receipt_frame,
+                header= 'Fee Structure',
                 row= 5,
-                col= 2,
-                data= fee_info
+                col= 3,
+                data= table_data
             )
 
-            #deposit button
             ctk.CTkLabel(
-                master= info_frame,
-                text='Deposit Fee',
-                font=('arial', 28)
-            ).pack(padx=10, pady= (10, 5))
+                master= receipt_frame,
+                text= 'Signature of Student'
+            ).pack(padx= (0, 170), pady= (100, 50) , side= 'right')
 
             ctk.CTkLabel(
-                master= info_frame,
-                text='Amount to deposit'
-            ).pack(padx=50, pady=5)
-
-            amount = ctk.StringVar()
-            entyr = ctk.CTkEntry(
-                master= info_frame,
-                textvariable=amount,
-                width=140
-            )
-            entyr.pack()
+                master= receipt_frame,
+                text= 'Signature of Principal'
+            ).pack(padx= (170, 0), pady= (100, 50) , side= 'left')
 
-            button = ctk.CTkButton(
-                master= info_frame,
-                text= 'Deposit',
-                command= lambda: self.__change_fee_in_db_and_generate_receipt(amount, fee_deposited, total_fee)
-            )
+            if receipt_no is not None:
+                ctk.CTkButton(
+                    master= receipt_frame,
+                    text= 'Save Receipt',
+                    command= lambda: self.__save_receipt(receipt_no)
+                ).place(relx= 0.98, rely= 0.02, anchor= 'ne')
 
-            if remaining_fee == 0:
-                button.configure(state= 'disabled')
-                entyr.configure(state= 'disabled')
+    @staticmethod
+    def __save_receipt(receipt_no: int) -> None:
+        """
+        Asks for a file and saves a receipt to it as PDF, PNG or HTML, see receipt.py.
 
-            button.pack(pady=20)
+        Parameters:
+            - receipt_no (int): ID of the fee transaction.
 
-            if generate_receipt:
-                ctk.CTkLabel(
-                    master= receipt_frame,
-                    text= 'Receipt',
-                    font= ('arial', 16, 'underline')
-                ).pack()
+        Returns:
+            - None
+        """
+        receipt = fee_service.receipt(receipt_no)
 
-                ctk.CTkLabel(
-                    master= receipt_frame,
-                    text= 'College Management System',
-                    font= ('arial', 28, 'bold')
-                ).pack(pady= 5)
-
-                with DatabaseConnector() as connector:
-                    connector.cursor.execute(
-                        '''
-                        SELECT s.address, s.phone_no, c.name, c.year
-                        FROM student s
-                        INNER JOIN courses c
-                        ON s.course_id = c.course_id
-                        WHERE s.enrollment_no = ?
-                        ''',
-                        [self.enrollment_no.get()]
-                    )
-                    data = connector.cursor.fetchall()[0]
-
-                date_time = datetime.now()
-                today_date = date_time.strftime("%d/%m/%Y")
-
-                details = f'''
-{"Name of Student": <20}: {name}
-{"Phone Number": <20}: {data[1]}
-{"Address": <20}: {data[0]}
+        if receipt is None:
+            ShowError('Save Receipt', 'This receipt is not found.')
+            return None
 
-{"Course Name": <20}: {data[2]}
-{"Course Year": <20}: {data[3]}
-{"Date of Payment": <20}: {today_date}
-'''
-                ctk.CTkLabel(
-                    master= receipt_frame,
-                    text= details,
-                    font= ('consolas', 14),
-                    justify= 'left',
-                    wraplength= 600
-                ).pack(pady= (0, 10))
-
-                table_data = [
-                    ('Sr.No.', 'Particulars', 'Amount(₹)'),
-                    (1, 'Total Fee', total_fee),
-                    (2, 'Fee Deposited (current transaction)', current_transaction),
-                    (3, 'Overall Fee Deposited', fee_deposited),
-                    (4, 'Remaining Fee', remaining_fee)
-                ]
-
-                self.__create_table(
-                    master= receipt_frame,
-                    header= 'Fee Structure',
-                    row= 5,
-                    col= 3,
-                    data= table_data
-                )
+        file_path = asksaveasfilename(
+            title= 'Save Receipt',
+            initialfile= receipt.file_name,
+            defaultextension= '.pdf',
+            filetypes= [(label, f'*.{file_format}') for file_format, label in RECEIPT_FORMATS.items()]
+        )
 
-                ctk.CTkLabel(
-                    master= receipt_frame,
-                    text= 'Signature of Student'
-                ).pack(padx= (0, 170), pady= (100, 50) , side= 'right')
+        if not file_path:
+            return None
 
-                ctk.CTkLabel(
-                    master= receipt_frame,
-                    text= 'Signature of Principal'
-                ).pack(padx= (170, 0), pady= (100, 50) , side= 'left')
+        try:
+            save_receipt(receipt, file_path)
 
-        except IndexError as e:
-            ShowError('Deposit Fee', 'This enrollment number is not found.')
+        except (OSError, ValueError) as e:
+            ShowError('Save Receipt', str(e))
+            return None
 
+        ShowInfo('Save Receipt', f'The receipt is saved to {file_path}')
 
-    def __change_fee_in_db_and_generate_receipt(
-        self,
-        amount: stringvar,
-        fee_deposited: int,
-        total_fee: int
-    ) -> None:
+
+    def __change_fee_in_db_and_generate_receipt(self, amount: stringvar) -> None:
         """
-        Updates the fee deposited by a student in the database.
+        Deposits fee for a student, the deposit is appended to the fee ledger.
 
-        This method is called when the user clicks the "Deposit" button after entering the deposit amount. It validates the input, checks if the deposit amount exceeds the remaining fee, and updates the database accordingly.
+        This method is called when the user clicks the "Deposit" button after entering the deposit amount. `fee_service.deposit()` validates the amount and checks that it is not more than the remaining fee, in the transaction of the deposit (another desk may have deposited meanwhile).
 
         Parameters:
-            - amount (str): The deposit amount entered by the user.
-            - fee_deposited (int): The current amount of fee deposited by the student.
-            - total_fee (int): The total fee amount for the student's course.
+            - amount (stringvar): The deposit amount entered by the user.
 
         Returns:
             - None
         """
         try:
-            fee = int(amount.get()) + fee_deposited
-
-            if fee > total_fee:
-                ShowError("Fee Deposit", "The amount is greater than remaining fee.")
-                return None
+            transaction = fee_service.deposit(self.enrollment_no.get(), amount.get())
 
-        except ValueError:
-            ShowError("Fee Deposit", "Add a valid amount.")
+        except ServiceError as e:
+            ShowError("Fee Deposit", str(e))
+            return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''UPDATE student
-                SET fee_deposited = ?
-                WHERE enrollment_no = ?;
-                ''',
-                [fee, self.enrollment_no.get()]
-            )
-            connector.db.commit()
+        except sqlite3.OperationalError:
+            ShowError("Fee Deposit", "The database is busy, please try again.")
+            return None
 
-        self.__get_fee_info(generate_receipt= True, current_transaction= int(amount.get()))
+        self.__get_fee_info(
+            generate_receipt= True,
+            current_transaction= transaction.amount,
+            receipt_no= transaction.transaction_id
+        )
 
     # courses
     # add course funcs
@@ -1260,6 +1212,22 @@ class ContentFrame(ctk.CTkScrollableFrame):
         event: any = None,
         update: bool = False
     ) -> None:
+        """
+        Shows the add course form, it is built once and cached, showing it again clears it.
+
+        Parameters:
+            - update (bool): if True, builds the form for update course instead, which is not cached.
+
+        Returns:
+            - None
+        """
+        if update:
+            self.__add_course_form(update=True)
+            return None
+
+        self.screens.show('add_course', self.__add_course_form)
+
+    def __add_course_form(self, update: bool = False) -> None:
         """
         Displays the GUI for adding a new course or updating an existing one.
 
@@ -1348,79 +1316,20 @@ class ContentFrame(ctk.CTkScrollableFrame):
             )
         self.update()
 
-    def __add_course_constraints(
-        self,
-        course_id: str,
-        course_name: str,
-        fee: str,
-        course_year: str,
-        update: bool = False
-    ) -> StrOrNone:
-        """
-        Performs constraints check for adding or updating a course.
-
-        This method checks various constraints, such as the validity of course ID, uniqueness of course ID (for new courses), presence of course name, presence and validity of the fee, and selection of a course year.
-
-        Parameters:
-            - course_id (str): The course ID.
-            - course_name (str): The course name.
-            - fee (str): The course fee.
-            - course_year (str): The course year.
-            - update (bool): If True, indicates that the constraints check is for updating a course.
-
-        Returns:
-            - StrOrNone: If constraints are violated, returns an error message. Otherwise, returns None.
-        """
-        if not course_id:
-            return 'Please enter course id.'
-
-        if not course_id.isnumeric():
-            return 'Invalid course id, ID must be a numeric value.'
-
-        if not update:
-            with DatabaseConnector() as connector:
-                connector.cursor.execute('SELECT course_id FROM courses;')
-                courses = connector.cursor.fetchall()
-
-            if int(course_id) in [i[0] for i in courses]:
-                return 'This course ID is already present.'
-
-        if not course_name:
-            return 'Please enter course name'
-
-        if not fee:
-            return 'Please enter fee.'
-
-        if not fee.isnumeric():
-            return 'Invalid fee, fee must be a numeric value.'
-
-        if not course_year:
-            return 'Please select course year.'
-
-        if not course_year.isnumeric():
-            return 'Invalid course year, it must be a numeric value.'
-
     def __add_course_submit(self) -> None:
         """
         Submits the information for adding a new course to the database.
 
-        This method retrieves course information from the GUI, performs constraints check, and inserts the new course into the database.
+        This method retrieves course information from the GUI and adds the course with `course_service.add()`, which checks it.
         """
-        course_id, course_name, fee, course_year = self.__get_info_from_widgets_for_courses()
+        try:
+            course_service.add(*self.__get_info_from_widgets_for_courses())
 
-        if error_msg := self.__add_course_constraints(course_id, course_name, fee, course_year):
-            ShowError('Add Course', error_msg)
+        except ServiceError as e:
+            ShowError('Add Course', str(e))
             return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''INSERT INTO courses(course_id, name, fee, year)
-                VALUES(?, ?, ?, ?);
-                ''',
-                [course_id, course_name, fee, course_year]
-            )
-            connector.db.commit()
-            ShowInfo('Add Course', 'Successfully added the course.')
+        ShowInfo('Add Course', 'Successfully added the course.')
 
     def __ask_course_id(self, header_text: str) -> None:
         """
@@ -1440,7 +1349,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             command = lambda: ShowWarning(
                 title_of_box= 'Remove Course', 
                 warning_msg= 'Do you really want to delete the course, the students associated with this course will also be removed, click OK to delete.', 
-                command= lambda: self.__remove_course_data_in_db(course_data)
+                command= self.__remove_course_data_in_db
             )
 
         else:
@@ -1467,11 +1376,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             columnspan= 2
         )
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute("SELECT course_id, name FROM courses")
-            course_data = connector.cursor.fetchall()
-
-        if not course_data:
+        if not len(courses):
             ShowInfo(header_text, "No courses are available.")
             return None
 
@@ -1485,14 +1390,14 @@ class ContentFrame(ctk.CTkScrollableFrame):
             pady=5
         )
 
-        courses = ctk.CTkComboBox(
+        courses_combo_box = ctk.CTkComboBox(
             master=id_frame,
-            values=[f"{i[0]}({i[1]})" for i in course_data],
+            values=courses.dropdown_values(),
             variable=self.course_var,
             width=200
         )
 
-        courses.grid(
+        courses_combo_box.grid(
             row= 1, 
             column= 1,
             padx= (0, 50)
@@ -1519,48 +1424,23 @@ class ContentFrame(ctk.CTkScrollableFrame):
         This method sets up the GUI elements, including labels, combo box for course selection, and a submit button for removing a course. It retrieves course data from the database.
         """
         
-        self.__ask_course_id("Remove Course")
+        self.screens.show('remove_course', lambda: self.__ask_course_id("Remove Course"))
 
-    def __remove_course_data_in_db(self, course_data: list) -> None:
+    def __remove_course_data_in_db(self) -> None:
         """
         Removes a course and associated students from the database.
 
         This method is called when the user confirms the removal of a course. It deletes the course and removes associated student records from the database.
-
-        Parameters:
-            - course_data (list): List of tuples containing course_id and name.
-
-        Returns:
-            - None
         """
-        course_id = int(re.findall(r'\d+', self.course_var.get())[0])
+        try:
+            course_service.remove(self.__selected_course_id(self.course_var) or '')
 
-        if course_id not in [i[0] for i in course_data]:
-            ShowError("Remove Course", "Please select a course from the list.")
+        except ServiceError as e:
+            ShowError("Remove Course", str(e))
             return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                'DELETE FROM courses WHERE course_id = ?',
-                [course_id]
-            )
-            connector.db.commit()
-
-            connector.cursor.execute(
-                'SELECT enrollment_no FROM student WHERE course_id = ?',
-                [course_id]
-            )
-            result = connector.cursor.fetchall()
-
-            students = [i[0] for i in result]
-            connector.cursor.executemany(
-                'DELETE FROM student WHERE enrollment_no = ?',
-                students
-            )
-
-            connector.db.commit()
-            ShowInfo("Remove Course", "Successfully deleted the course.")
-            self.remove_course_gui()
+        ShowInfo("Remove Course", "Successfully deleted the course.")
+        self.remove_course_gui()
 
     # update course funcs
     def update_course_gui(self, event: any = None) -> None:
@@ -1570,7 +1450,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         This method sets up the GUI elements, including labels, combo box for course selection, and a submit button for updating a course. It retrieves course data from the database.
         """
         
-        self.__ask_course_id('Update Course')
+        self.screens.show('update_course', lambda: self.__ask_course_id('Update Course'))
 
     def __get_course_info_for_update(self, course_var: stringvar) -> None:
         """
@@ -1584,22 +1464,17 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Returns:
             - None
         """
-        with DatabaseConnector() as connector:
-            try:
-                course_id = int(re.findall(r'\d+', course_var.get())[0])
-                connector.cursor.execute(
-                    'Select * FROM courses WHERE course_id = ?', [course_id])
-                course_data = connector.cursor.fetchall()[0]
+        course = course_service.get(self.__selected_course_id(course_var) or '')
 
-            except IndexError:
-                ShowError('Update course', 'This course ID is not present.')
-                return None
+        if course is None:
+            ShowError('Update course', 'This course ID is not present.')
+            return None
 
         self.add_course_gui(update=True)
-        self.course_id.set(course_data[0])
-        self.course_name.set(course_data[1])
-        self.fee.set(course_data[2])
-        self.course_year.set(course_data[3])
+        self.course_id.set(course.course_id)
+        self.course_name.set(course.name)
+        self.fee.set(course.fee)
+        self.course_year.set(course.year)
 
         button = ctk.CTkButton(
             master=self,
@@ -1619,42 +1494,27 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         This method is called when the user clicks the "Update" button after editing course information. It validates the input, updates the course in the database, and displays a success message.
         """
-        course_id, course_name, fee, course_year = self.__get_info_from_widgets_for_courses()
+        try:
+            course_service.update(*self.__get_info_from_widgets_for_courses())
 
-        if error_msg := self.__add_course_constraints(course_id, course_name, fee, course_year, update=True):
-            ShowError('Add Course', error_msg)
+        except ServiceError as e:
+            ShowError('Update Course', str(e))
             return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''UPDATE courses 
-                SET name = ?, fee = ?, year = ?
-                WHERE course_id = ?;
-                ''',
-                [course_name, fee, course_year, course_id]
-            )
-            connector.db.commit()
-            ShowInfo("Update Course", "Successfully updated the course.")
+        ShowInfo("Update Course", "Successfully updated the course.")
 
     # show courses
     def show_all_courses(self, event: any = None) -> None:
         """
-        Displays information about all available courses. This method retrieves course data from the database and displays it on the GUI.
+        Displays information about all available courses. The courses are filtered, sorted and paged in the database by a `PagedListing`, only the current page is fetched.
         """
         self.content_remover()
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute('SELECT * FROM courses;')
-            course_data = connector.cursor.fetchall()
-
-        if not course_data:
+        if not len(courses):
             ShowError('Show Courses', 'No courses available.')
             return None
 
         #create table
-        course_data_to_display = [('ID', 'Name', 'Fee', 'Year')]
-        course_data_to_display.extend(course_data)
-
         frame = ctk.CTkFrame(
             master= self
         )
@@ -1666,17 +1526,22 @@ class ContentFrame(ctk.CTkScrollableFrame):
             expand= True
         )
 
-        self.__create_table(
+        PagedListing(
             master= frame,
             header= 'Course Details',
-            row= len(course_data_to_display),
-            col= 4,
-            data= course_data_to_display
-        )
+            table= 'courses',
+            columns= {'course_id': 'ID', 'name': 'Name', 'fee': 'Fee', 'year': 'Year'},
+            key= 'course_id',
+            filter_columns= ['name']
+        ).pack(fill= 'both', expand= True)
 
     # library
     # add book
     def add_book_gui(self, event: any = None) -> None:
+        'Shows the add book form, it is built once and cached, showing it again clears it.'
+        self.screens.show('add_book', self.__add_book_form)
+
+    def __add_book_form(self) -> None:
         """
         Displays the GUI for adding a new book.
 
@@ -1720,23 +1585,19 @@ class ContentFrame(ctk.CTkScrollableFrame):
             row=4
         )
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute("SELECT course_id, name FROM courses")
-            course_data = connector.cursor.fetchall()
-
         ctk.CTkLabel(
             master=self,
             text='Course'
         ).grid(row=5, column=0, padx=50, pady=5, sticky='w')
 
-        courses = ctk.CTkComboBox(
+        courses_combo_box = ctk.CTkComboBox(
             master=self,
-            values=[f"{i[0]}({i[1]})" for i in course_data],
+            values=courses.dropdown_values(),
             variable=self.course_id,
             width=140
         )
 
-        courses.grid(
+        courses_combo_box.grid(
             row=5,
             column=1,
             sticky='w'
@@ -1766,91 +1627,33 @@ class ContentFrame(ctk.CTkScrollableFrame):
             sticky= 'w'
         )
 
-    def __add_book_constraints(
-        self,
-        book_name: StrOrNone,
-        quantity: StrOrNone,
-        course_id: StrOrNone,
-        isbn: StrOrNone,
-        publisher: StrOrNone
-    ) -> StrOrNone:
-        """
-        Performs constraints check for adding a book.
-
-        This method checks various constraints, such as the presence of book name, quantity, and a valid course ID.
-
-        Parameters:
-            book_name (StrOrNone): The name of the book.
-            quantity (StrOrNone): The quantity of books.
-            course_id (StrOrNone): The course ID associated with the book.
-            isbn (StrOrNone): The ISBN number of the book.
-            publisher (StrOnNone): The publisher of the book.
-
-        Returns:
-            StrOrNone: If constraints are violated, returns an error message. Otherwise, returns None.
-        """
-        if not book_name:
-            return 'Please enter book name.'
-
-        if not quantity:
-            return 'Please enter quantity of books.'
-
-        if not quantity.isnumeric():
-            return 'Invalid quantity of books, it must be a numeric value.'
-
-        if not course_id:
-            return 'Please select the course ID.'
-        
-        if not isbn:
-            return 'Please enter ISBN number.'
-        
-        if not isbn.isnumeric():
-            return 'Inavlid ISBN, it must be a numeric value.'
-        
-        if len(isbn) != 13:
-            return 'Invalid ISBN, it must contain 13 digits.'
-        
-        if not publisher:
-            return 'Please enter name of Publisher.'
-        
-
-        with DatabaseConnector() as connector:
-            connector.cursor.execute('SELECT course_id FROM courses;')
-            courses = connector.cursor.fetchall()
-
-        if int(course_id) not in [i[0] for i in courses]:
-            return 'Please select a course ID from the list.'
-
     def __add_book_submit(self) -> None:
         """
         Submits information for adding a new book to the database.
 
-        This method retrieves book information from the GUI, performs constraints check, and inserts the new book into the database.
+        This method retrieves book information from the GUI and adds the book with `library_service.add_book()`, which checks it.
         """
-        book_name = self.__valueGetter(self.book_name.get())
-        quantity = self.__valueGetter(self.quantity.get())
-        course_var = self.__valueGetter(self.course_id.get())
-        course_id = re.findall(r'\d+', course_var)[0]
-        isbn = self.__valueGetter(self.isbn.get())
-        publisher = self.__valueGetter(self.publisher.get())
+        try:
+            library_service.add_book(
+                name= self.__valueGetter(self.book_name.get()),
+                quantity= self.__valueGetter(self.quantity.get()),
+                course_id= self.__selected_course_id(self.course_id),
+                isbn= self.__valueGetter(self.isbn.get()),
+                publisher= self.__valueGetter(self.publisher.get())
+            )
 
-        if error_msg := self.__add_book_constraints(book_name, quantity, course_id, isbn, publisher):
-            ShowError("Add Book", error_msg)
+        except ServiceError as e:
+            ShowError("Add Book", str(e))
             return None
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''INSERT INTO books(name, quantity, course_id, isbn, publisher)
-                VALUES(?, ?, ?, ?, ?);
-                ''',
-                [book_name, quantity, course_id, isbn, publisher]
-            )
-            connector.db.commit()
-
         ShowInfo('Add Book', 'Successfully added the Book.')
 
     # remove Book
     def remove_book_gui(self, event: any = None) -> None:
+        'Shows the remove book form, it is built once and cached.'
+        self.screens.show('remove_book', self.__remove_book_form)
+
+    def __remove_book_form(self) -> None:
         """
         Displays the GUI for removing a book.
 
@@ -1927,38 +1730,20 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Parameters:
             book_id (stringvar): The ID of the book to be removed.
         """
-        with DatabaseConnector() as connector:
-            connector.cursor.execute('SELECT book_id FROM books;')
-            all_book_ids = connector.cursor.fetchall()
+        if library_service.remove_book(book_id.get().strip()):
+            ShowInfo('Remove Book', 'Successfully removed the book.')
 
-            book_id = int(book_id.get())
-
-            if book_id in [i[0] for i in all_book_ids]:
-                connector.cursor.execute(
-                    'DELETE FROM books WHERE book_id = ?', [book_id])
-                connector.db.commit()
-
-                connector.cursor.execute(
-                    'DELETE FROM books_lended WHERE book_id = ?', [book_id])
-                connector.db.commit()
-
-                ShowInfo('Remove Book', 'Successfully removed the book.')
-
-            else:
-                ShowError('Remove Book', 'This book ID is not found.')
+        else:
+            ShowError('Remove Book', 'This book ID is not found.')
 
     # book list
     def show_books(self, event: any = None) -> None:
         """
-        Displays information about all available books. This method retrieves book data from the database and displays it on the GUI.
+        Displays information about all available books. The books are filtered, sorted and paged in the database by a `PagedListing`, only the current page is fetched.
         """
         self.content_remover()
 
-        with DatabaseConnector() as connector:
-            connector.cursor.execute('SELECT * FROM books;')
-            book_data = connector.cursor.fetchall()
-
-        if not book_data:
+        if not library_service.has_books():
             ShowError('Book List', 'No Books available.')
             return None
 
@@ -1974,24 +1759,47 @@ class ContentFrame(ctk.CTkScrollableFrame):
             expand= True
         )
 
-        book_data_to_display = [('Book ID', 'Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher')]
-        book_data_to_display.extend(book_data)
-
-        self.__create_table(
+        PagedListing(
             master= frame,
             header= 'Books List',
-            row= len(book_data_to_display),
-            col= 6,
-            data= book_data_to_display,
+            table= 'books',
+            columns= {
+                'book_id': 'Book ID',
+                'name': 'Name',
+                'quantity': 'Quantity',
+                'course_id': 'Course ID',
+                'isbn': 'ISBN',
+                'publisher': 'Publisher'
+            },
+            key= 'book_id',
+            filter_columns= ['name', 'isbn', 'publisher'],
             word_wrap_length= 250
-        )
+        ).pack(fill= 'both', expand= True)
+
 
+    # search book
+    def search_book_gui(self, event: any = None) -> None:
+        """
+        Search-as-you-type screen for books, searches the name, publisher and ISBN with the full-text index.
+        """
+        self.screens.show(
+            'search_book',
+            lambda: self.__create_search_screen(
+                header= 'Search Book',
+                columns= ('Book ID', 'Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher'),
+                search= search_books,
+                word_wrap_length= 250
+            )
+        )
 
     # lend book
     def lend_book(self, event: any = None) -> None:
-        self.__ask_enrollment(
-            label_text='Lend Book to...',
-            command=self.__lend_book_gui
+        self.screens.show(
+            'lend_book',
+            lambda: self.__ask_enrollment(
+                label_text='Lend Book to...',
+                command=self.__lend_book_gui
+            )
         )
 
     def __lend_book_gui(self) -> None:
@@ -2000,35 +1808,18 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         This method retrieves the course ID of the student based on the provided enrollment number and then fetches all available books related to that course for lending. It sets up the GUI elements, including labels, checkboxes for book selection, and a submit button.
         """
-        enrollment_no = self.enrollment_no.get()
-        if not enrollment_no.isnumeric():
-            ShowError('Lend Book', 'Invalid enrollment number, it must be a numeric value.')
-            return None
-
-        with DatabaseConnector() as connector:
-            # getting course_id of student
-            connector.cursor.execute(
-                '''SELECT course_id 
-                FROM student
-                WHERE enrollment_no = ?;
-                ''',
-                [enrollment_no]
-            )
-            try:
-                course_id = connector.cursor.fetchall()[0][0]
+        # getting all books of the course of the student
+        try:
+            available_books = library_service.available_for(self.enrollment_no.get())
 
-            except IndexError:
-                ShowError('Lend Book', 'This enrollment no is not found.')
+        except ServiceError as e:
+            ShowError('Lend Book', str(e))
+            return None
 
-            # getting all books related to the course
-            connector.cursor.execute(
-                '''SELECT book_id, name, publisher
-                FROM books
-                WHERE course_id = ? AND quantity > 0;
-                ''',
-                [course_id]
-            )
-            all_books_related_to_course = connector.cursor.fetchall()
+        all_books_related_to_course = [
+            (book.book_id, book.name, book.publisher)
+            for book in available_books
+        ]
 
         if not all_books_related_to_course:
             ShowError('Lend Book', 'No books related to this course.')
@@ -2065,7 +1856,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         """
         Submits information for lending books to a student.
 
-        This method retrieves the selected books from the GUI checkboxes and updates the 'books_lended' table with the enrollment number and book IDs. It also updates the 'books' table to decrement the quantity of the lent books.
+        This method retrieves the selected books from the GUI checkboxes and lends them with `library_service.lend()`, which records the lending and decrements the stock in one transaction. If a book has no copy left nothing is lended and the list of books is shown again.
         """
         enrollment_no = self.enrollment_no.get()
 
@@ -2074,40 +1865,39 @@ class ContentFrame(ctk.CTkScrollableFrame):
             if stringvar.get() == 'on':
                 selected_books.append(book_id)
 
-        if not selected_books:
-            ShowError('Lend Book', 'Please select atleast one book.')
-            return None
+        # the stock is checked when it is decremented, another desk may have lended the last copy since the list was shown
+        try:
+            lending = library_service.lend(enrollment_no, selected_books)
 
-        with DatabaseConnector() as connector:
-            connector.cursor.executemany(
-                'INSERT INTO books_lended(enrollment_no, book_id) VALUES(?, ?)',
-                [(enrollment_no, book_id) for book_id in selected_books]
-            )
+        except OutOfStock as e:
+            ShowError('Lend Book', str(e))
+            self.__lend_book_gui()
+            return None
 
-            connector.cursor.executemany(
-                '''UPDATE books
-                SET quantity = quantity - 1
-                WHERE book_id = ?;
-                ''',
-                [(book_id,) for book_id in selected_books]
-            )
+        except ServiceError as e:
+            ShowError('Lend Book', str(e))
+            return None
 
-            connector.db.commit()
+        except sqlite3.OperationalError:
+            ShowError('Lend Book', 'The database is busy, please try again.')
+            return None
 
-        date_time = datetime.now()
-        today_date = date_time.strftime("%d/%m/%Y")
+        lended_on = date.fromisoformat(lending.on).strftime("%d/%m/%Y")
 
         ShowInfo(
             'Lend Book', 
-            f'Successfully lended the books.\nTo enrollment number : {enrollment_no}\n On: {today_date}.\nBook IDs: {', '.join(str(id) for id in selected_books)}'
+            f'Successfully lended the books.\nTo enrollment number : {enrollment_no}\n On: {lended_on}.\nBook IDs: {', '.join(str(id) for id in lending.book_ids)}'
         )
         self.content_remover()
 
     # return book
     def return_book(self, event: any = None) -> None:
-        self.__ask_enrollment(
-            label_text='Return Book from...',
-            command=self.__return_book_gui
+        self.screens.show(
+            'return_book',
+            lambda: self.__ask_enrollment(
+                label_text='Return Book from...',
+                command=self.__return_book_gui
+            )
         )
 
     def __return_book_gui(self) -> None:
@@ -2116,24 +1906,16 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         This method retrieves the enrollment number of the student, selects all books that have been lended to the student, and sets up the GUI elements for book selection and a submit button.
         """
-        enrollment_no = self.enrollment_no.get()
-        if not enrollment_no.isnumeric():
-            ShowError(
-                'Lend Book', 'Invalid enrollment number, it must be a numeric value.')
-            return None
-
-        with DatabaseConnector() as connetor:
-            # selecting all books lended to the student
-            connetor.cursor.execute(
-                '''
-                SELECT book_id, name, publisher
-                FROM books
-                WHERE book_id IN (SELECT book_id FROM books_lended WHERE enrollment_no = ?);
-                ''',
-                [enrollment_no]
-            )
+        # selecting all books lended to the student
+        try:
+            lended_books = [
+                (book.book_id, book.name, book.publisher)
+                for book in library_service.lended_to(self.enrollment_no.get())
+            ]
 
-            lended_books = connetor.cursor.fetchall()
+        except ServiceError as e:
+            ShowError('Return Book', str(e))
+            return None
 
         if not lended_books:
             ShowError('Return Book', 'No books lended to this student.')
@@ -2170,7 +1952,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         """
         Submits information for returning books by a student.
 
-        This method retrieves the selected books from the GUI checkboxes and updates the 'books_lended' table to remove the corresponding records. It also updates the 'books' table to increment the quantity of the returned books.
+        This method retrieves the selected books from the GUI checkboxes and returns them with `library_service.give_back()`, which removes the lending records and increments the stock in one transaction.
         """
         enrollment_no = self.enrollment_no.get()
 
@@ -2179,40 +1961,32 @@ class ContentFrame(ctk.CTkScrollableFrame):
             if stringvar.get() == 'on':
                 selected_books.append(book_id)
 
-        if not selected_books:
-            ShowError('Lend Book', 'Please select atleast one book.')
-            return None
-
-        with DatabaseConnector() as connector:
-            connector.cursor.executemany(
-                '''DELETE FROM books_lended
-                WHERE enrollment_no = ? AND book_id = ?;
-                ''',
-                [(enrollment_no, book_id) for book_id in selected_books]
-            )
+        # books already returned from another desk are skipped
+        try:
+            returning = library_service.give_back(enrollment_no, selected_books)
 
-            connector.cursor.executemany(
-                '''
-                UPDATE books
-                SET quantity = quantity + 1
-                WHERE book_id = ?;
-                ''',
-                [(book_id,) for book_id in selected_books]
-            )
+        except ServiceError as e:
+            ShowError('Return Book', str(e))
+            return None
 
-            connector.db.commit()
+        except sqlite3.OperationalError:
+            ShowError('Return Book', 'The database is busy, please try again.')
+            return None
 
-        date_time = datetime.now()
-        today_date = date_time.strftime("%d/%m/%Y")
+        returned_on = date.fromisoformat(returning.on).strftime("%d/%m/%Y")
 
         ShowInfo(
             'Return Book', 
-            f'Successfully returned the books.\nBy enrollment number : {enrollment_no}\n On: {today_date}.\nBook IDs: {', '.join(str(id) for id in selected_books)}'
+            f'Successfully returned the books.\nBy enrollment number : {enrollment_no}\n On: {returned_on}.\nBook IDs: {', '.join(str(id) for id in returning.book_ids)}'
         )
         self.content_remover()
 
     # update stock
     def update_stock_gui(self, event: any = None) -> None:
+        'Shows the update stock form, it is built once and cached.'
+        self.screens.show('update_stock', self.__update_stock_form)
+
+    def __update_stock_form(self) -> None:
         """
         Displays the GUI for updating the stock of books.
 
@@ -2273,47 +2047,17 @@ class ContentFrame(ctk.CTkScrollableFrame):
         Returns:
             - None
         """
-        quantity_value = self.__valueGetter(quantity.get())
-        book_id_value = self.__valueGetter(book_id.get())
-
-        error_msg = None
-
-        if not quantity_value:
-            error_msg = 'Please enter quantity.'
-
-        elif not book_id_value:
-            error_msg = 'Please enter book ID'
-
-        elif not quantity_value.isnumeric():
-            error_msg = 'Invalid quantity, it must be a numeric value.'
-
-        elif not book_id_value.isnumeric():
-            error_msg = 'Invalid book ID, it must be a numeric value.'
-
-        if error_msg:
-            ShowError('Update Stock', error_msg)
-            return None
-
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                'SELECT book_id FROM books;'
+        try:
+            library_service.add_stock(
+                book_id= self.__valueGetter(book_id.get()),
+                quantity= self.__valueGetter(quantity.get())
             )
-            all_book_ids = [i[0] for i in connector.cursor.fetchall()]
 
-            if int(book_id_value) not in all_book_ids:
-                ShowError('Update Stock', 'This book ID is not present.')
-                return None
+        except ServiceError as e:
+            ShowError('Update Stock', str(e))
+            return None
 
-            connector.cursor.execute(
-                '''
-                UPDATE books
-                SET quantity = quantity + ?
-                WHERE book_id = ?;
-                ''',
-                [quantity_value, book_id_value]
-            )
-            connector.db.commit()
-            ShowInfo('Update Stock', 'Successfully updated the stock.')
+        ShowInfo('Update Stock', 'Successfully updated the stock.')
 
     # settings
     def settings_gui(self, event: any = None) -> None:
@@ -2323,23 +2067,9 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         self.content_remover()
 
-        # getting settings from db
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''
-                SELECT value
-                FROM settings
-                WHERE setting = "default_tab" OR setting = "theme";
-                '''
-            )
-            result = connector.cursor.fetchall()
-
-        default_tab = result[0][0]
-        theme = result[1][0]
-
         # stringvars
-        default_tab_var = ctk.StringVar(value=default_tab)
-        theme_var = ctk.StringVar(value=theme)
+        default_tab_var = ctk.StringVar(value=settings.get('default_tab'))
+        theme_var = ctk.StringVar(value=settings.get('theme'))
 
         # settings label
         ctk.CTkLabel(
@@ -2370,7 +2100,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
         theme_switch = ctk.CTkSwitch(
             master=theme_frame,
             text='  Dark',
-            command=lambda: self.__update_theme_and_set_to_db(theme_var),
+            command=lambda: settings.set('theme', theme_var.get()),
             variable=theme_var,
             onvalue='dark',
             offvalue='light'
@@ -2402,8 +2132,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             text='Accounts',
             variable=default_tab_var,
             value='Accounts',
-            command=lambda: self.__update_default_tab_in_db(
-                default_tab_var.get())
+            command=lambda: settings.set('default_tab', default_tab_var.get())
         ).grid(row=1, column=0, padx=5, pady=(0, 5))
 
         ctk.CTkRadioButton(
@@ -2411,8 +2140,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             text='Library',
             variable=default_tab_var,
             value='Library',
-            command=lambda: self.__update_default_tab_in_db(
-                default_tab_var.get())
+            command=lambda: settings.set('default_tab', default_tab_var.get())
         ).grid(row=1, column=2, pady=(0, 5))
 
         ctk.CTkRadioButton(
@@ -2420,8 +2148,7 @@ class ContentFrame(ctk.CTkScrollableFrame):
             text='Courses',
             variable=default_tab_var,
             value='Courses',
-            command=lambda: self.__update_default_tab_in_db(
-                default_tab_var.get())
+            command=lambda: settings.set('default_tab', default_tab_var.get())
         ).grid(row=2, column=0, padx=5, pady=(0, 5))
 
         ctk.CTkRadioButton(
@@ -2429,10 +2156,43 @@ class ContentFrame(ctk.CTkScrollableFrame):
             text='Excel',
             variable=default_tab_var,
             value='Excel',
-            command=lambda: self.__update_default_tab_in_db(
-                default_tab_var.get())
+            command=lambda: settings.set('default_tab', default_tab_var.get())
         ).grid(row=2, column=2, pady=(0, 5))
 
+        # database profile
+        db_profile_frame = self.__create_frame_and_assign_label(
+            header='Database Profile',
+            description='PRAGMAs applied to the database, WAL lets imports and lookups run together.'
+        )
+
+        db_profile_frame.pack(
+            fill='x',
+            expand=True,
+            pady=5,
+            padx=5
+        )
+
+        db_profile_var = ctk.StringVar(value=settings.get('db_profile'))
+
+        for column, profile in enumerate(PRAGMA_PROFILES):
+            ctk.CTkRadioButton(
+                master=db_profile_frame,
+                text=profile.capitalize(),
+                variable=db_profile_var,
+                value=profile,
+                command=lambda: self.__update_db_profile_in_db(
+                    db_profile_var.get(), pragma_label)
+            ).grid(row=1, column=column * 2, padx=5, pady=(0, 5))
+
+        pragma_label = ctk.CTkLabel(
+            master=db_profile_frame,
+            text='',
+            font=('consolas', 12),
+            justify='left'
+        )
+        pragma_label.grid(row=2, column=0, columnspan=5, padx=5, pady=(0, 5), sticky='w')
+        self.__show_pragma_report(pragma_label)
+
         #admin settings
         if self.user == 'Admin':
             self.__create_category_label('Admin')
@@ -2658,33 +2418,6 @@ class ContentFrame(ctk.CTkScrollableFrame):
             shortcut='ctrl + `'
         )
 
-    @staticmethod
-    def __update_theme_and_set_to_db(theme: stringvar) -> None:
-        """
-        Update the theme setting in the database and apply the selected theme.
-
-        Parameters:
-            - theme (ctk.StringVar): The StringVar holding the theme value.
-
-        Returns:
-            - None
-        """
-        
-        theme = theme.get()
-        ctk.set_appearance_mode(theme)
-
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''
-                UPDATE settings
-                SET value = ?
-                WHERE setting = "theme";
-                ''',
-                [theme]
-            )
-
-            connector.db.commit()
-
     def __create_frame_and_assign_label(
         self,
         header: str,
@@ -2740,27 +2473,35 @@ class ContentFrame(ctk.CTkScrollableFrame):
 
         return frame
 
-    def __update_default_tab_in_db(self, tab: str) -> None:
+    def __update_db_profile_in_db(self, profile: str, pragma_label: ctk.CTkLabel) -> None:
         """
-        Update the default tab setting in the database.
+        Save the selected database profile and show the PRAGMAs that are now in effect.
 
         Parameters:
-            - tab (str): The selected default tab.
+            - profile (str): The selected database profile.
+            - pragma_label (ctk.CTkLabel): The label that reports the current PRAGMAs.
 
         Returns:
             - None
         """
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''
-                UPDATE settings
-                SET value = ?
-                WHERE setting = "default_tab";
-                ''',
-                [tab]
-            )
+        settings.set('db_profile', profile)
+        self.__show_pragma_report(pragma_label)
 
-            connector.db.commit()
+    @staticmethod
+    def __show_pragma_report(pragma_label: ctk.CTkLabel) -> None:
+        """
+        Read the current PRAGMAs from the database and display them on the label.
+
+        Parameters:
+            - pragma_label (ctk.CTkLabel): The label that reports the current PRAGMAs.
+
+        Returns:
+            - None
+        """
+        report = pragma_report()
+        pragma_label.configure(
+            text='\n'.join(f'{pragma: <13}: {value}' for pragma, value in report.items())
+        )
 
     def __create_shortcut_frame(self, name: str, shortcut: str) -> None:
         """
@@ -2808,22 +2549,26 @@ class ContentFrame(ctk.CTkScrollableFrame):
             font=('arial', 18)
         ).pack(padx=5, pady=pady, side='top', anchor='w')
 
-    @staticmethod
-    def __remove_all_data_from_db() -> None:
+    def __remove_all_data_from_db(self) -> None:
         """
-        Removes all data from the student, courses, books, books_lended tables and resets the auto_increment of student and books.
+        Removes all data from the student, courses, books, books_lended tables and the fee ledger, resets the auto_increment of student, books and fee_transaction, and clears the change log of the incremental export.
         """
         with DatabaseConnector() as connector:
             # Delete data from tables
-            tables_to_delete = ['student', 'courses', 'books', 'books_lended']
+            tables_to_delete = ['student', 'courses', 'books', 'books_lended', 'fee_transaction', 'fee_daily_total']
             for table in tables_to_delete:
                 connector.cursor.execute(f'DELETE FROM {table};')
 
             # Reset AUTO_INCREMENT for specific tables
-            connector.cursor.executemany('UPDATE SQLITE_SEQUENCE SET SEQ=0 WHERE NAME=?;', [('student',), ('books',)])
+            connector.cursor.executemany('UPDATE SQLITE_SEQUENCE SET SEQ=0 WHERE NAME=?;', [('student',), ('books',), ('fee_transaction',)])
+
+            # the next incremental export starts over with all the rows
+            forget_changes(connector)
 
             connector.db.commit()
 
+        courses.invalidate()
+        self.screens.invalidate()
         ShowInfo('Erased', 'Successfully erased all the data.')
 
     def __remove_user(self, user: str) -> None:
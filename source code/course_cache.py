@@ -0,0 +1,158 @@
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from database_connector import DatabaseConnector
+
+
+@dataclass(frozen=True)
+class Course:
+    """
+    A row of the courses table.
+
+    Attributes:
+        - course_id (int): ID of the course.
+        - name (str): name of the course.
+        - fee (int): fee of the course.
+        - year (int): duration of the course in years.
+    """
+    course_id: int
+    name: str
+    fee: int
+    year: int
+
+    @property
+    def label(self) -> str:
+        'Text of the course in the dropdowns, e.g. "3(BCA)".'
+        return f'{self.course_id}({self.name})'
+
+
+class CourseCache:
+    """
+    A process-wide cache of the courses table, shared by the course dropdowns and the form validators.
+
+    The courses are read with one query the first time they are needed and kept until `invalidate()` is called, which the code changing the courses (add, update, remove, import, erase) must do. Lookups by ID are dictionary lookups and the values of the dropdowns are built once per load.
+
+    Other processes (the desktop program and api_server share the database) can't call `invalidate()` here, so every access also compares the courses_version setting, bumped by a trigger on every change of the courses table (migration 6), with the version the courses were read at. A different version invalidates the cache, listeners included.
+
+    Usage:
+    ```
+    if course_id not in courses:
+        return 'Please select correct course from the list.'
+
+    ctk.CTkComboBox(master=frame, values=courses.dropdown_values())
+    ...
+    courses.invalidate()  # after changing the courses table
+    ```
+    """
+
+    def __init__(self) -> None:
+        # courses by ID and the labels of the dropdowns, None until they are read
+        self.__catalog: tuple[dict[int, Course], list[str]] | None = None
+        self.__listeners: list[Callable[[], None]] = []
+        self.__lock = threading.Lock()
+        # incremented by invalidate(), a load started before an invalidation is not kept
+        self.__generation = 0
+        # courses_version setting the cached courses were read at
+        self.__version: str | None = None
+
+    def get(self, course_id: int) -> Course | None:
+        """
+        Returns a course by its ID.
+
+        Parameters:
+            - course_id (int): ID of the course.
+
+        Returns:
+            - Course or None: the course, None if there is no such course.
+        """
+        return self.__load()[0].get(course_id)
+
+    def all(self) -> list[Course]:
+        'Returns every course, in the order of the table.'
+        return list(self.__load()[0].values())
+
+    def dropdown_values(self) -> list[str]:
+        'Returns the labels of every course for a combo box, e.g. ["1(BCA)", "2(MCA)"].'
+        return list(self.__load()[1])
+
+    def invalidate(self) -> None:
+        """
+        Forgets the cached courses, they are read again when they are needed, and notifies the listeners.
+
+        Returns:
+            - None
+        """
+        with self.__lock:
+            self.__catalog = None
+            self.__generation += 1
+            listeners = list(self.__listeners)
+
+        for listener in listeners:
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Calls `listener()` every time the courses are invalidated, e.g. to rebuild the forms showing the courses.
+
+        Parameters:
+            - listener (callable): function called without arguments.
+
+        Returns:
+            - None
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self.__load()[0]
+
+    def __len__(self) -> int:
+        return len(self.__load()[0])
+
+    def __load(self) -> tuple[dict[int, Course], list[str]]:
+        """
+        Returns the cached courses by ID and the dropdown labels, reading them from the database if needed or if another process changed the courses.
+        """
+        version = self.__read_version()
+
+        with self.__lock:
+            if self.__catalog is not None and version == self.__version:
+                return self.__catalog
+
+            changed_elsewhere = self.__catalog is not None
+
+        if changed_elsewhere:
+            self.invalidate()
+
+        with self.__lock:
+            generation = self.__generation
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('SELECT course_id, name, fee, year FROM courses;')
+            rows = connector.cursor.fetchall()
+
+        by_id = {row[0]: Course(*row) for row in rows}
+        catalog = (by_id, [course.label for course in by_id.values()])
+
+        with self.__lock:
+            if generation == self.__generation:
+                self.__catalog = catalog
+                self.__version = version
+
+        return catalog
+
+    @staticmethod
+    def __read_version() -> str | None:
+        """
+        Returns the courses_version setting, None if the database has no such setting yet. It is one primary key lookup.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                "SELECT value FROM settings WHERE setting = 'courses_version';"
+            )
+            result = connector.cursor.fetchall()
+
+        return result[0][0] if result else None
+
+
+courses = CourseCache()
@@ -1,4 +1,355 @@
 import sqlite3
+import logging
+import threading
+from collections import deque
+
+type connection = sqlite3.Connection
+
+logger = logging.getLogger(__name__)
+
+# PRAGMAs applied to every new connection, the selected profile is stored in the settings table as "db_profile".
+# busy_timeout comes first so it covers the others. journal_mode is stored in the file, it is only set by the first connection after the pool is configured.
+PRAGMA_PROFILES: dict[str, dict[str, str | int]] = {
+    # sqlite defaults: rollback journal, fsync on every commit, ~2 MB page cache
+    'default': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT'
+    },
+    # readers and a writer no longer block each other, fsync only at checkpoints
+    'balanced': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY'
+    },
+    # balanced plus a 64 MB page cache and 256 MB of memory mapped I/O, for large imports and exports
+    'performance': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY'
+    }
+}
+DEFAULT_PROFILE = 'balanced'
+
+
+class ConnectionPool:
+    """
+    A process-wide pool of sqlite connections used by `DatabaseConnector`.
+
+    Opening a sqlite connection means opening the file, reading the schema and allocating a page cache, doing that on every click adds noticeable latency. The pool keeps a few idle connections around and hands them out again instead of reconnecting.
+
+    Parameters:
+        - database (str): path of the sqlite database file, default 'data.sqlite'.
+        - size (int): maximum number of idle connections kept by the pool (per thread when `thread_affinity` is True), default 4.
+        - thread_affinity (bool): if True, a connection is only reused by the thread that opened it, which is what sqlite3 expects by default. If False, connections are shared between all threads (opened with `check_same_thread=False`), default True.
+        - profile (str or None): name of the PRAGMA profile (key of `PRAGMA_PROFILES`) applied to new connections. If None, the profile is read from the settings table on the first connect, default None.
+
+    Usage:
+    ```
+    db = pool.acquire()
+    ...
+    pool.release(db)
+    ```
+
+    Note:
+        - Normally the pool is not used directly, `DatabaseConnector` borrows and returns connections.
+        - Any uncommitted transaction is rolled back when a connection is returned, same as closing it.
+    """
+
+    def __init__(
+        self,
+        database: str = 'data.sqlite',
+        size: int = 4,
+        thread_affinity: bool = True,
+        profile: str | None = None
+    ) -> None:
+        self.database = database
+        self.size = size
+        self.thread_affinity = thread_affinity
+        self.profile = profile
+
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__shared: deque[connection] = deque()
+
+        # incremented on every configure(), connections of an older generation are closed instead of reused
+        self.__generation = 0
+        self.__generation_of: dict[int, int] = {}
+        # generation whose journal_mode has been applied, it is stored in the database file so one connection is enough
+        self.__journal_generation = -1
+
+    def configure(
+        self,
+        database: str | None = None,
+        size: int | None = None,
+        thread_affinity: bool | None = None,
+        profile: str | None = None
+    ) -> None:
+        """
+        Changes the settings of the pool. Idle connections are discarded, so the new settings apply to every connection acquired afterwards.
+
+        Parameters:
+            - database (str or None): new database path, None keeps the current one.
+            - size (int or None): new pool size, None keeps the current one.
+            - thread_affinity (bool or None): new thread affinity, None keeps the current one.
+            - profile (str or None): new PRAGMA profile, None keeps the current one.
+
+        Returns:
+            - None
+
+        Raises:
+            - ValueError: if the profile is not a key of `PRAGMA_PROFILES`.
+        """
+        if profile is not None and profile not in PRAGMA_PROFILES:
+            raise ValueError(f'Unknown PRAGMA profile {profile!r}, expected one of {", ".join(PRAGMA_PROFILES)}')
+
+        with self.__lock:
+            if database is not None:
+                self.database = database
+                # the profile of a different database is read from its own settings table
+                self.profile = None
+
+            if size is not None:
+                self.size = size
+
+            if thread_affinity is not None:
+                self.thread_affinity = thread_affinity
+
+            if profile is not None:
+                self.profile = profile
+
+            self.__generation += 1
+
+        self.close_idle()
+
+    def acquire(self) -> connection:
+        """
+        Returns an idle connection from the pool, or opens a new one if there is none.
+
+        Returns:
+            - connection: sqlite3 connection to the database.
+        """
+        idle = self.__idle_connections()
+
+        while True:
+            with self.__lock:
+                db = idle.pop() if idle else None
+                current = db is not None and self.__generation_of.get(id(db)) == self.__generation
+
+            if db is None:
+                return self.__connect()
+
+            if current:
+                return db
+
+            self.__close(db)
+
+    def release(self, db: connection) -> None:
+        """
+        Returns a connection to the pool. Rolls back any open transaction, and closes the connection if the pool is already full or the connection belongs to an older configuration.
+
+        Parameters:
+            - db (connection): the connection previously returned by `acquire()`.
+
+        Returns:
+            - None
+        """
+        try:
+            if db.in_transaction:
+                db.rollback()
+
+        except sqlite3.Error:
+            self.__close(db)
+            return None
+
+        idle = self.__idle_connections()
+
+        with self.__lock:
+            if self.__generation_of.get(id(db)) == self.__generation and len(idle) < self.size:
+                idle.append(db)
+                return None
+
+        self.__close(db)
+
+    def close_idle(self) -> None:
+        """
+        Closes the idle connections that can be closed from the calling thread. With thread affinity the idle connections of other threads are closed the next time those threads use the pool.
+
+        Returns:
+            - None
+        """
+        idle = self.__idle_connections()
+
+        with self.__lock:
+            connections = list(idle)
+            idle.clear()
+
+        for db in connections:
+            self.__close(db)
+
+    def __idle_connections(self) -> deque[connection]:
+        """
+        Returns the deque of idle connections that the calling thread is allowed to use.
+        """
+        if not self.thread_affinity:
+            return self.__shared
+
+        if not hasattr(self.__local, 'idle'):
+            self.__local.idle = deque()
+
+        return self.__local.idle
+
+    def __connect(self) -> connection:
+        """
+        Opens a new connection according to the current settings of the pool.
+        """
+        db = sqlite3.connect(
+            self.database,
+            check_same_thread=self.thread_affinity
+        )
+
+        if self.profile is None:
+            self.profile = read_profile_setting(db)
+
+        for pragma, value in PRAGMA_PROFILES[self.profile].items():
+            if pragma != 'journal_mode':
+                db.execute(f'PRAGMA {pragma} = {value};')
+
+        with self.__lock:
+            self.__generation_of[id(db)] = self.__generation
+            set_journal_mode = self.__journal_generation != self.__generation
+            self.__journal_generation = self.__generation
+
+        if set_journal_mode:
+            self.__set_journal_mode(db)
+
+        return db
+
+    def __set_journal_mode(self, db: connection) -> None:
+        """
+        Switches the database to the journal mode of the current profile. Leaving WAL needs the database to itself, if other connections are open the current mode is kept and a warning is logged.
+        """
+        mode = PRAGMA_PROFILES[self.profile]['journal_mode']
+
+        try:
+            current = db.execute(f'PRAGMA journal_mode = {mode};').fetchall()[0][0]
+
+        except sqlite3.OperationalError as e:
+            current = db.execute('PRAGMA journal_mode;').fetchall()[0][0]
+            logger.warning('journal_mode not changed to %s, keeping %s: %s', mode, current, e)
+            return None
+
+        if current.upper() != mode:
+            logger.warning('journal_mode not changed to %s, keeping %s', mode, current)
+
+    def __close(self, db: connection) -> None:
+        """
+        Closes a connection and forgets its generation.
+        """
+        with self.__lock:
+            self.__generation_of.pop(id(db), None)
+
+        try:
+            db.close()
+
+        except sqlite3.ProgrammingError:
+            # connection of another thread, sqlite closes it when it is garbage collected
+            pass
+
+
+def read_profile_setting(db: connection) -> str:
+    """
+    Reads the selected PRAGMA profile from the settings table.
+
+    Parameters:
+        - db (connection): an open connection to the database.
+
+    Returns:
+        - str: name of the profile, `DEFAULT_PROFILE` if it is not set or unknown.
+    """
+    try:
+        result = db.execute(
+            '''
+            SELECT value
+            FROM settings
+            WHERE setting = "db_profile";
+            '''
+        ).fetchall()
+
+    except sqlite3.OperationalError:
+        return DEFAULT_PROFILE
+
+    if result and result[0][0] in PRAGMA_PROFILES:
+        return result[0][0]
+
+    return DEFAULT_PROFILE
+
+
+pool = ConnectionPool()
+
+
+def configure_pool(
+    database: str | None = None,
+    size: int | None = None,
+    thread_affinity: bool | None = None,
+    profile: str | None = None
+) -> None:
+    """
+    Configures the process-wide connection pool used by `DatabaseConnector`.
+
+    Parameters:
+        - database (str or None): path of the sqlite database file.
+        - size (int or None): maximum number of idle connections kept by the pool.
+        - thread_affinity (bool or None): whether connections are reused only by the thread that opened them.
+        - profile (str or None): PRAGMA profile applied to new connections, it is not saved to the settings table (see `settings_service`).
+
+    Example:
+    ```
+    configure_pool(size=8, thread_affinity=False)
+    ```
+    """
+    pool.configure(
+        database=database,
+        size=size,
+        thread_affinity=thread_affinity,
+        profile=profile
+    )
+
+
+def pragma_report() -> dict[str, str]:
+    """
+    Reads the PRAGMAs of the performance profile back from a live connection, used by the settings GUI.
+
+    Returns:
+        - dict[str, str]: name of the PRAGMA and its current value.
+    """
+    synchronous_names = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+    temp_store_names = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+
+    report = {}
+    with DatabaseConnector() as connector:
+        for pragma in PRAGMA_PROFILES[DEFAULT_PROFILE]:
+            connector.cursor.execute(f'PRAGMA {pragma};')
+            value = connector.cursor.fetchall()[0][0]
+
+            if pragma == 'synchronous':
+                value = synchronous_names.get(value, value)
+
+            elif pragma == 'temp_store':
+                value = temp_store_names.get(value, value)
+
+            report[pragma] = str(value)
+
+    return report
 
 
 class DatabaseConnector:
@@ -9,7 +360,7 @@ class DatabaseConnector:
     ```
     with DatabaseConnector() as connector:
         # Use the connector to perform database operations within this block
-        # The connection and cursor are automatically closed when the block exits.
+        # The cursor is closed and the connection is returned to the pool when the block exits.
     ```
 
     Attributes:
@@ -30,23 +381,24 @@ class DatabaseConnector:
     - Ensure that the sqlite server is running and accessible with the provided credentials.
     - It is recommended to use the `with` statement to ensure proper resource cleanup.
     - The `exc_tb` parameter is related to exception handling and is provided by the `with` statement when an exception occurs.
+    - Connections are borrowed from the process-wide `pool`, see `configure_pool()` to change its size or thread affinity. Uncommitted changes are rolled back when the block exits, so always call `connector.db.commit()`.
     """
 
     def __enter__(self):
         """
-        Establishes a connection to the sqlite database and returns the DatabaseConnector instance.
+        Borrows a connection to the sqlite database from the pool and returns the DatabaseConnector instance.
 
         Returns:
         - DatabaseConnector: The instance of the DatabaseConnector with an active connection and cursor.
         """
 
-        self.db = sqlite3.connect('data.sqlite')
+        self.db = pool.acquire()
         self.cursor = self.db.cursor()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Closes the database cursor and connection when exiting the context.
+        Closes the database cursor and returns the connection to the pool when exiting the context.
 
         Parameters:
         - exc_type: The type of exception that occurred, if any.
@@ -56,4 +408,4 @@ class DatabaseConnector:
         if self.cursor:
             self.cursor.close()
         if self.db:
-            self.db.close()
+            pool.release(self.db)
@@ -1,16 +1,116 @@
 import pandas as pd
-import numpy as np
 import customtkinter as ctk
-from PIL import ImageTk
 import os
+import sqlite3
+from datetime import date
+from collections.abc import Callable, Iterator
 from tkinter.filedialog import askdirectory, askopenfilename
-from database_connector import DatabaseConnector
 from messagebox import ShowInfo, ShowError
+from image_cache import images
+from course_cache import courses
+from background_job import BackgroundJob, Progress
+from import_engine import IMPORT_COLUMNS, import_chunks, read_chunks
+from export_engine import EXPORT_FORMATS, export_changes, export_to_excel_parallel, export_to_files
+from receipt import RECEIPT_FORMATS, count_receipts, receipts_between, save_receipts
 
 type dataframe = pd.DataFrame
 
 
-class ExportToExcel(ctk.CTkToplevel):
+class JobToplevel(ctk.CTkToplevel):
+    """
+    Base class of the Export and Import windows, it runs their job on a `BackgroundJob` and shows a progress bar, the progress (rows, rows/sec and ETA) and a Cancel button while the job is running.
+
+    Attributes:
+        - `job` (BackgroundJob or None): the running job.
+        - `progress_bar` (ctk.CTkProgressBar): Progress bar of the job.
+        - `progress_label` (ctk.CTkLabel): Label displaying the rows processed, rows per second and ETA.
+        - `cancel_button` (ctk.CTkButton): Button for cancelling the job.
+    """
+
+    def _create_progress_widgets(self, row: int) -> None:
+        """
+        Creates the progress widgets, they are gridded on `row` and `row + 1` when a job starts.
+
+        Parameters:
+            row (int): first grid row of the progress widgets.
+        """
+        self.job: BackgroundJob | None = None
+        self.__progress_row = row
+
+        self.progress_bar = ctk.CTkProgressBar(
+            master=self,
+            width=340
+        )
+
+        self.progress_label = ctk.CTkLabel(
+            master=self,
+            text='',
+            font=('arial', 11)
+        )
+
+        self.cancel_button = ctk.CTkButton(
+            master=self,
+            text='Cancel',
+            width=97,
+            command=self._cancel_job
+        )
+
+    def _start_job(
+        self,
+        target: callable,
+        args: tuple,
+        on_done: callable,
+        on_error: callable,
+        on_cancel: callable
+    ) -> None:
+        """
+        Shows the progress widgets and starts the job, see `BackgroundJob` for the parameters.
+        """
+        self.progress_bar.set(0)
+        self.progress_label.configure(text='Starting...')
+        self.cancel_button.configure(text='Cancel', state='normal')
+
+        self.progress_bar.grid(row=self.__progress_row, column=0, columnspan=2, padx=(30, 0), pady=(10, 0), sticky='w')
+        self.progress_label.grid(row=self.__progress_row + 1, column=0, columnspan=2, padx=(30, 0), sticky='w')
+        self.cancel_button.grid(row=self.__progress_row + 1, column=2, padx=5, pady=5)
+
+        self.job = BackgroundJob(
+            master=self,
+            target=target,
+            args=args,
+            on_progress=self.__show_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancel=on_cancel
+        )
+        self.job.start()
+
+    def __show_progress(self, progress: Progress) -> None:
+        """
+        Displays the progress sent by the job.
+        """
+        self.progress_bar.set(progress.fraction)
+        self.progress_label.configure(text=str(progress))
+
+    def _hide_progress(self) -> None:
+        """
+        Hides the progress widgets after the job is over.
+        """
+        self.job = None
+        self.progress_bar.grid_remove()
+        self.progress_label.grid_remove()
+        self.cancel_button.grid_remove()
+
+    def _cancel_job(self) -> None:
+        """
+        Cancels the running job, it stops after the chunk it is processing.
+        """
+        if self.job:
+            self.cancel_button.configure(text='Cancelling...', state='disabled')
+            self.job.cancel()
+
+
+class ExportToExcel(JobToplevel):
     """
     customtkinter Toplevel window for exporting data to an Excel file.
 
@@ -24,6 +124,8 @@ class ExportToExcel(ctk.CTkToplevel):
         - `courses_var_for_checkbox` (ctk.StringVar): StringVar for the Courses checkbox.
         - `books_var_for_checkbox` (ctk.StringVar): StringVar for the Books checkbox.
         - `books_lended_var_for_checkbox` (ctk.StringVar): StringVar for the Books Lended checkbox.
+        - `format_var` (ctk.StringVar): StringVar storing the selected export format, a value of `EXPORT_FORMATS`.
+        - `changes_only_var` (ctk.StringVar): StringVar for the checkbox of the incremental export.
         - `export_button` (ctk.CTkButton): Button for triggering the data export process.
 
     Methods:
@@ -34,7 +136,10 @@ class ExportToExcel(ctk.CTkToplevel):
             Opens a folder selection dialog and sets the chosen path in the entry widget.
 
         `__export_data(self) -> None:`
-            Exports selected data to an Excel file based on checkbox choices.
+            Exports selected data to an Excel file based on checkbox choices, the export runs on a `BackgroundJob`.
+
+        `__run_export(job, list_of_tables_to_export, folder_path, file_format, changes_only) -> str:`
+            Body of the export job, runs on the worker thread.
 
     Example:
         ```
@@ -51,13 +156,12 @@ class ExportToExcel(ctk.CTkToplevel):
         super().__init__(*args, **kwargs)
 
         # basic attributes
-        self.geometry("500x415")
+        self.geometry("500x500")
         self.resizable(False, False)
         self.title("Export to Excel")
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.after(300, lambda: self.iconphoto(False, self.imagepath))
 
@@ -70,9 +174,9 @@ Step 1 - Select a folder (by default, it is set to the current working directory
 
 Step 2 - Choose the data to export from the checkbox provided (by default, all are selected).
 
-Step 3 - Click Export.
+Step 3 - Choose the format and click Export.
 
-After clicking Export, an Excel file will be created in the selected folder, containing data as per your selection in different sheets.'''
+After clicking Export, an Excel file will be created in the selected folder, containing data as per your selection in different sheets. The CSV, Parquet and Feather formats create one file per table instead. If only changes are exported, one file per table is created with the rows changed since the last such export.'''
         self.description_label = ctk.CTkLabel(
             master=self,
             text=description_text,
@@ -160,6 +264,16 @@ After clicking Export, an Excel file will be created in the selected folder, con
             offvalue='off'
         ).grid(row=5, column=1, padx=(11, 0))
 
+        # format of the exported files
+        self.format_var = ctk.StringVar(value=EXPORT_FORMATS['xlsx'])
+
+        ctk.CTkOptionMenu(
+            master=self,
+            values=list(EXPORT_FORMATS.values()),
+            variable=self.format_var,
+            width=180
+        ).grid(row=6, column=0, columnspan=2, padx=(30, 0), sticky='w')
+
         # export button
         self.export_button = ctk.CTkButton(
             master=self,
@@ -174,6 +288,20 @@ After clicking Export, an Excel file will be created in the selected folder, con
             padx=5
         )
 
+        # incremental export
+        self.changes_only_var = ctk.StringVar(value='off')
+
+        ctk.CTkCheckBox(
+            master=self,
+            text='Only changes since the last export',
+            variable=self.changes_only_var,
+            onvalue='on',
+            offvalue='off'
+        ).grid(row=7, column=0, columnspan=2, padx=(30, 0), pady=(10, 0), sticky='w')
+
+        # progress of the export job
+        self._create_progress_widgets(row=8)
+
         # lifting toplevel
         self.after(100, self.lift)
 
@@ -215,51 +343,318 @@ After clicking Export, an Excel file will be created in the selected folder, con
             )
             return None
 
-        header_dict = {
-            'student': ['Enrollment Number', 'Name', 'Date of Birth', 'Address', 'Mobile no', 'Email', 'Year of Admission', 'Age', 'Gender', 'Pincode', 'Course ID', 'Father Name', '10th Percentage', '12th Percentage', 'Fee Deposited'],
-            'courses': ['Course ID', 'Course Name', 'Fee', 'Year'],
-            'books': ['Book ID', 'Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher'],
-            'books_lended': ['Enrollment Number', 'Book ID']
-        }
+        file_format = next(
+            key for key, label in EXPORT_FORMATS.items() if label == self.format_var.get()
+        )
 
         self.export_button.configure(text='Exporting...', state='disabled')
 
-        # retrieving data from database according to the tables and writing them to excel file
-        with DatabaseConnector() as connector:
-
-            # creating a excel writer object
-            excel_file_path = os.path.join(
-                self.folder_path.get(), "Exported Data.xlsx")
-            with pd.ExcelWriter(excel_file_path) as writer:
-
-                # one by one retreiving data and writing to separate excel file sheets
-                for table in list_of_tables_to_export:
-                    try:
-                        connector.cursor.execute(f"SELECT * FROM {table};")
-                        data = connector.cursor.fetchall()
-
-                        # creating dataframe and writing it to excel
-                        data_frame = pd.DataFrame(data)
-                        data_frame.to_excel(
-                            excel_writer=writer,
-                            sheet_name=table,
-                            header=header_dict[table],
-                            index=False
-                        )
-                    
-                    except ValueError:
-                        continue
+        self._start_job(
+            target=self.__run_export,
+            args=(list_of_tables_to_export, self.folder_path.get(), file_format, self.changes_only_var.get() == 'on'),
+            on_done=self.__export_completed,
+            on_error=self.__export_failed,
+            on_cancel=self.__export_cancelled
+        )
+
+    @staticmethod
+    def __run_export(
+        job: BackgroundJob,
+        list_of_tables_to_export: list[str],
+        folder_path: str,
+        file_format: str,
+        changes_only: bool
+    ) -> str:
+        """
+        Body of the export job, runs on the worker thread. Streams the selected tables to the Excel file, one worker process per table, or to one file per table for the other formats, reporting the exported rows.
+
+        Parameters:
+            job (BackgroundJob): the job running this function.
+            list_of_tables_to_export (list[str]): tables to export.
+            folder_path (str): folder of the exported files.
+            file_format (str): key of `EXPORT_FORMATS`.
+            changes_only (bool): export only the rows changed since the last incremental export.
+
+        Returns:
+            str: the exported file, or the folder if one file per table was written.
+        """
+        if changes_only:
+            export_changes(list_of_tables_to_export, folder_path, file_format, job)
+            return folder_path
 
+        if file_format == 'xlsx':
+            excel_file_path = os.path.join(folder_path, "Exported Data.xlsx")
+            return export_to_excel_parallel(list_of_tables_to_export, excel_file_path, job)
+
+        export_to_files(list_of_tables_to_export, folder_path, file_format, job)
+        return folder_path
+
+    def __export_completed(self, exported_path: str) -> None:
+        """
+        Called on the main thread when the export job finishes.
+        """
         self.destroy()
         ShowInfo(
             'Export Completed',
-            f'Successfully exported the data to {excel_file_path}'
+            f'Successfully exported the data to {exported_path}'
         )
 
+    def __export_failed(self, error: Exception) -> None:
+        """
+        Called on the main thread when the export job raises an error.
+        """
+        self.__reset_export_button()
+        ShowError('Export Failed', str(error))
 
-class ImportFromExcel(ctk.CTkToplevel):
+    def __export_cancelled(self) -> None:
+        """
+        Called on the main thread when the export job is cancelled.
+        """
+        self.__reset_export_button()
+        ShowInfo('Export Cancelled', 'The export was cancelled, the exported files may be incomplete.')
+
+    def __reset_export_button(self) -> None:
+        """
+        Enables the Export button and hides the progress widgets.
+        """
+        self._hide_progress()
+        self.export_button.configure(text='Export', state='normal')
+
+
+class ExportReceipts(JobToplevel):
     """
-    customtkinter Toplevel window for importing data from an Excel file into a database.
+    customtkinter Toplevel window for saving the fee receipts of every deposit made in a period, e.g. the fee run at the start of a semester. The receipts are rendered by a pool of worker processes, see `save_receipts()`.
+
+    Attributes:
+        - `folder_path` (ctk.StringVar): StringVar storing the selected folder path.
+        - `first_day` (ctk.StringVar): StringVar storing the first day of the period, 'YYYY-MM-DD'.
+        - `last_day` (ctk.StringVar): StringVar storing the last day of the period, 'YYYY-MM-DD'.
+        - `format_var` (ctk.StringVar): StringVar storing the selected format, a value of `RECEIPT_FORMATS`.
+        - `export_button` (ctk.CTkButton): Button for starting the export.
+
+    Example:
+        ```
+        ExportReceipts()
+        ```
+    """
+    current_directory = os.getcwd()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the ExportReceipts instance. Creates the GUI of the window.
+        """
+        super().__init__(*args, **kwargs)
+
+        # basic attributes
+        self.geometry("500x400")
+        self.resizable(False, False)
+        self.title("Export Fee Receipts")
+
+        # changing icon
+        self.imagepath = images.get_photoimage('app.png')
+        self.wm_iconbitmap()
+        self.after(300, lambda: self.iconphoto(False, self.imagepath))
+
+        description_text = '''
+Steps to export fee receipts:
+
+Step 1 - Select a folder (by default, it is set to the current working directory; click Browse to change it).
+
+Step 2 - Enter the first and the last day of the period (YYYY-MM-DD), by default the current month.
+
+Step 3 - Choose the format and click Export.
+
+One file is created per deposit made in the period, named after its receipt number.'''
+        ctk.CTkLabel(
+            master=self,
+            text=description_text,
+            wraplength=450,
+            justify='left'
+        ).grid(row=0, column=0, columnspan=3, sticky='w', padx=(30, 0))
+
+        # folder of the receipts
+        self.folder_path = ctk.StringVar(value=self.current_directory)
+
+        ctk.CTkEntry(
+            master=self,
+            textvariable=self.folder_path,
+            width=340
+        ).grid(row=1, column=0, columnspan=2, padx=(30, 0), pady=(20, 0))
+
+        ctk.CTkButton(
+            master=self,
+            text='Browse...',
+            width=97,
+            command=self.__open_folder
+        ).grid(row=1, column=2, padx=5, pady=(20, 0))
+
+        # period
+        today = date.today()
+        self.first_day = ctk.StringVar(value=today.replace(day=1).isoformat())
+        self.last_day = ctk.StringVar(value=today.isoformat())
+
+        ctk.CTkLabel(
+            master=self,
+            text='From'
+        ).grid(row=2, column=0, padx=(30, 0), pady=(15, 0), sticky='w')
+
+        ctk.CTkLabel(
+            master=self,
+            text='To'
+        ).grid(row=2, column=1, pady=(15, 0), sticky='w')
+
+        ctk.CTkEntry(
+            master=self,
+            textvariable=self.first_day,
+            width=160
+        ).grid(row=3, column=0, padx=(30, 0), sticky='w')
+
+        ctk.CTkEntry(
+            master=self,
+            textvariable=self.last_day,
+            width=160
+        ).grid(row=3, column=1, sticky='w')
+
+        # format of the receipts
+        self.format_var = ctk.StringVar(value=RECEIPT_FORMATS['pdf'])
+
+        ctk.CTkOptionMenu(
+            master=self,
+            values=list(RECEIPT_FORMATS.values()),
+            variable=self.format_var,
+            width=180
+        ).grid(row=4, column=0, columnspan=2, padx=(30, 0), pady=(20, 0), sticky='w')
+
+        self.export_button = ctk.CTkButton(
+            master=self,
+            text='Export',
+            width=97,
+            command=self.__export_receipts
+        )
+        self.export_button.grid(row=4, column=2, padx=5, pady=(20, 0))
+
+        # progress of the export job
+        self._create_progress_widgets(row=5)
+
+        # lifting toplevel
+        self.after(100, self.lift)
+
+    def __open_folder(self) -> None:
+        """
+        Opens a folder selection dialog and sets the chosen path in the entry widget.
+        """
+        path = askdirectory(
+            initialdir=self.current_directory,
+            mustexist=True,
+            title="Select Folder"
+        )
+        self.folder_path.set(path)
+        self.after(100, self.lift)
+
+    def __export_receipts(self) -> None:
+        """
+        Validates the period and starts the export job.
+        """
+        try:
+            first_day = date.fromisoformat(self.first_day.get().strip())
+            last_day = date.fromisoformat(self.last_day.get().strip())
+
+        except ValueError:
+            ShowError('Error', 'Enter the days in YYYY-MM-DD format.')
+            return None
+
+        if first_day > last_day:
+            ShowError('Error', 'The first day must not be after the last day.')
+            return None
+
+        if not os.path.isdir(self.folder_path.get()):
+            ShowError('Error', 'Select an existing folder.')
+            return None
+
+        file_format = next(
+            key for key, label in RECEIPT_FORMATS.items() if label == self.format_var.get()
+        )
+
+        self.export_button.configure(text='Exporting...', state='disabled')
+
+        self._start_job(
+            target=self.__run_export,
+            args=(first_day.isoformat(), last_day.isoformat(), self.folder_path.get(), file_format),
+            on_done=self.__export_completed,
+            on_error=self.__export_failed,
+            on_cancel=self.__export_cancelled
+        )
+
+    @staticmethod
+    def __run_export(
+        job: BackgroundJob,
+        first_day: str,
+        last_day: str,
+        folder_path: str,
+        file_format: str
+    ) -> int:
+        """
+        Body of the export job, runs on the worker thread. Streams the receipts of the period to the worker processes, reporting the saved receipts.
+
+        Parameters:
+            job (BackgroundJob): the job running this function.
+            first_day (str): first day of the period, 'YYYY-MM-DD'.
+            last_day (str): last day of the period, 'YYYY-MM-DD'.
+            folder_path (str): folder of the receipt files.
+            file_format (str): key of `RECEIPT_FORMATS`.
+
+        Returns:
+            int: number of saved receipts.
+        """
+        return save_receipts(
+            receipts_between(first_day, last_day),
+            folder_path,
+            file_format,
+            job,
+            total=count_receipts(first_day, last_day)
+        )
+
+    def __export_completed(self, saved: int) -> None:
+        """
+        Called on the main thread when the export job finishes.
+        """
+        if not saved:
+            self.__reset_export_button()
+            ShowInfo('Export Receipts', 'No fee was deposited in this period.')
+            return None
+
+        folder_path = self.folder_path.get()
+        self.destroy()
+        ShowInfo(
+            'Export Completed',
+            f'Successfully saved {saved} receipts to {folder_path}'
+        )
+
+    def __export_failed(self, error: Exception) -> None:
+        """
+        Called on the main thread when the export job raises an error.
+        """
+        self.__reset_export_button()
+        ShowError('Export Failed', str(error))
+
+    def __export_cancelled(self) -> None:
+        """
+        Called on the main thread when the export job is cancelled.
+        """
+        self.__reset_export_button()
+        ShowInfo('Export Cancelled', 'The export was cancelled, the receipts saved so far are kept.')
+
+    def __reset_export_button(self) -> None:
+        """
+        Enables the Export button and hides the progress widgets.
+        """
+        self._hide_progress()
+        self.export_button.configure(text='Export', state='normal')
+
+
+class ImportFromExcel(JobToplevel):
+    """
+    customtkinter Toplevel window for importing data from an Excel or CSV file into a database. The file is read, validated, coerced and inserted in chunks of `import_engine.CHUNK_SIZE` rows, so the memory used doesn't depend on the size of the file.
 
     Attributes:
         - `file_path` (ctk.StringVar): StringVar storing the selected Excel file path.
@@ -270,6 +665,7 @@ class ImportFromExcel(ctk.CTkToplevel):
         - `radio_button_selection` (ctk.StringVar): StringVar storing the selected radio button value.
         - `must_contain_label` (ctk.CTkLabel): Label displaying constraints and required columns for the selected data.
         - `import_button` (ctk.CTkButton): Button for triggering the data import process.
+        - `on_imported` (callable or None): called after a successful import, e.g. to refresh screens showing the imported data.
 
     Methods:
         `__init__(self, *args, **kwargs):`
@@ -288,16 +684,10 @@ class ImportFromExcel(ctk.CTkToplevel):
             Enables the Import button.
 
         `__import_data(self) -> None:`
-            Imports data from the selected Excel file into the database based on user choices.
-
-        `__write_data_in_db_for_student(self, df: pd.DataFrame) -> None:`
-            Writes student data from DataFrame to the database.
-
-        `__write_data_in_db_for_courses(self, df: pd.DataFrame) -> None:`
-            Writes courses data from DataFrame to the database.
+            Imports data from the selected Excel or CSV file into the database based on user choices, the import runs on a `BackgroundJob`.
 
-        `__write_data_in_db_for_books(self, df: pd.DataFrame) -> None:`
-            Writes books data from DataFrame to the database.
+        `__run_import(job, table_name, chunks, total_rows) -> int:`
+            Body of the import job, runs on the worker thread, see `import_engine.import_chunks()`.
 
     Example:
         ```
@@ -305,28 +695,30 @@ class ImportFromExcel(ctk.CTkToplevel):
         ImportToExcel()
         ```
     """
+    # columns that the file must contain for each type of data
+    column_names = IMPORT_COLUMNS
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, on_imported: Callable | None = None, **kwargs):
         """
         Initializes the ImportFromExcel instance. Creates the GUI for Importing TopLevel Window.
         """
         super().__init__(*args, **kwargs)
+        self.on_imported = on_imported
 
         # basic attributes
-        self.geometry("500x600")
+        self.geometry("500x645")
         self.resizable(False, False)
         self.title("Import from Excel")
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.after(300, lambda: self.iconphoto(False, self.imagepath))
 
         # asking for file path
         ctk.CTkLabel(
             master=self,
-            text="Enter or browse the excel file path."
+            text="Enter or browse the excel or csv file path."
         ).grid(row=0, column=0, columnspan=2, sticky='w', padx=30, pady=(15, 0))
 
         self.file_path = ctk.StringVar()
@@ -361,7 +753,7 @@ class ImportFromExcel(ctk.CTkToplevel):
         # asking sheet name
         ctk.CTkLabel(
             master=self,
-            text='Enter the name of sheet (by default it is Sheet1)'
+            text='Enter the name of sheet (by default it is Sheet1, not needed for csv files)'
         ).grid(row=2, column=0, padx=30, pady=(15, 5), sticky='w', columnspan=2)
 
         self.sheet_name = ctk.StringVar(value='Sheet1')
@@ -472,6 +864,9 @@ class ImportFromExcel(ctk.CTkToplevel):
             pady=5
         )
 
+        # progress of the import job
+        self._create_progress_widgets(row=9)
+
         self.after(100, self.lift)
 
     def __open_file(self) -> None:
@@ -483,8 +878,8 @@ class ImportFromExcel(ctk.CTkToplevel):
         """
         file_path = askopenfilename(
             defaultextension='.xlsx',
-            filetypes=[('All Excel Files', '*.xlsx')],
-            title='Select Excel File'
+            filetypes=[('All Excel Files', '*.xlsx'), ('CSV Files', '*.csv')],
+            title='Select Excel or CSV File'
         )
         self.file_path.set(file_path)
         self.after(100, self.lift)
@@ -508,10 +903,10 @@ class ImportFromExcel(ctk.CTkToplevel):
                 text += f'{index + 1: >2}. {column}\n'
 
         if len(columns) > 4:
-            self.geometry('500x655')
+            self.geometry('500x700')
 
         else:
-            self.geometry('500x600')
+            self.geometry('500x645')
 
         return text
 
@@ -522,14 +917,8 @@ class ImportFromExcel(ctk.CTkToplevel):
         Returns:
             None
         """
-        column_names = {
-            'student': ['Name', 'Date of Birth', 'Address', 'Mobile no', 'Email', 'Year of Admission', 'Age', 'Gender', 'Pincode', 'Course ID', 'Father Name', '10th Percentage', '12th Percentage', 'Fee Deposited'],
-            'courses': ['Course ID', 'Course Name', 'Fee', 'Year'],
-            'books': ['Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher']
-        }
-
         text_to_update_on_label = self.__create_label_from_list_in_grid_form(
-            column_names[self.radio_button_selection.get()])[0: -1]
+            self.column_names[self.radio_button_selection.get()])[0: -1]
 
         self.must_contain_label.configure(
             text=text_to_update_on_label, justify='left')
@@ -542,7 +931,7 @@ class ImportFromExcel(ctk.CTkToplevel):
 
     def __import_data(self) -> None:
         """
-        Imports data from the selected Excel file into the database based on user choices.
+        Imports data from the selected Excel or CSV file into the database based on user choices.
 
         Returns:
             None
@@ -556,185 +945,82 @@ class ImportFromExcel(ctk.CTkToplevel):
             ShowError('Import Failed', f'The provided path "{file_path}" does not exists.')
             return None
 
+        if table_name not in self.column_names:
+            ShowError('Import Failed',
+                      'Please select type of data from the radio buttons.')
+            return None
+
         try:
-            data = pd.read_excel(
-                io=file_path,
-                sheet_name=sheet_name
-            )
+            chunks, total_rows = read_chunks(file_path, sheet_name, table_name)
 
         except ValueError as ve:
             ShowError('Import Failed', ve)
             return None
 
-        data_frame = pd.DataFrame(data)
-
         self.import_button.configure(text='Importing...', state='disabled')
 
-        match table_name:
-            case 'student':
-                self.__write_data_in_db_for_student(data_frame)
-
-            case 'courses':
-                self.__write_data_in_db_for_courses(data_frame)
-
-            case 'books':
-                self.__write_data_in_db_for_books(data_frame)
-
-            case _:
-                ShowError('Import Failed',
-                          'Please select type of data from the radio buttons.')
-                self.__enable_import_button()
+        self._start_job(
+            target=self.__run_import,
+            args=(table_name, chunks, total_rows),
+            on_done=self.__import_completed,
+            on_error=lambda error: self.__import_failed(table_name, error),
+            on_cancel=self.__import_cancelled
+        )
 
-    def __write_data_in_db_for_student(self, df: dataframe) -> None:
+    @staticmethod
+    def __run_import(
+        job: BackgroundJob,
+        table_name: str,
+        chunks: Iterator[dataframe],
+        total_rows: int | None
+    ) -> int:
         """
-        Writes student data from DataFrame to the database.
+        Body of the import job, runs on the worker thread. Writes the chunks to the selected table and reports the rows read from the file.
 
         Parameters:
-            df (pd.DataFrame): DataFrame containing student data.
+            job (BackgroundJob): the job running this function.
+            table_name (str): table selected with the radio buttons.
+            chunks (Iterator[pd.DataFrame]): chunks of the file.
+            total_rows (int or None): rows in the file, if known.
 
         Returns:
-            None
+            int: number of inserted rows.
         """
-        with DatabaseConnector() as connector:
-            for row in df.index:
-                data_set = df.iloc[row]
-                null_set = df.isnull().iloc[row]
-
-                if null_set['Name']:
-                    continue
-
-                elif null_set['Date of Birth']:
-                    continue
-
-                elif null_set['Address']:
-                    continue
-
-                elif null_set['Mobile no']:
-                    continue
-
-                elif null_set['Year of Admission']:
-                    continue
-
-                elif null_set['Age']:
-                    continue
-
-                elif null_set['Gender']:
-                    continue
-
-                elif null_set['Pincode']:
-                    continue
-
-                elif null_set['Course ID']:
-                    continue
-
-                elif null_set['10th Percentage']:
-                    continue
-
-                elif null_set['12th Percentage']:
-                    continue
-
-                else:
-                    connector.cursor.execute(
-                        '''
-                        INSERT INTO student(name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per, fee_deposited) 
-                        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-                        ''',
-                        [
-                            data_set['Name'],
-                            pd.Timestamp(data_set['Date of Birth']).to_pydatetime().strftime('%Y-%m-%d'),
-                            data_set['Address'],
-                            str(np.int64(data_set['Mobile no']).item()),
-                            None if null_set['Email'] else data_set['Email'],
-                            np.uint16(data_set['Year of Admission']).item(),
-                            np.uint8(data_set['Age']).item(),
-                            data_set['Gender'],
-                            np.int64(data_set['Pincode']).item(),
-                            np.int32(data_set['Course ID']).item(),
-                            None if null_set['Father Name'] else data_set['Father Name'],
-                            round(np.float16(data_set['10th Percentage']).item(), 2),
-                            round(np.float16(data_set['12th Percentage']).item(), 2),
-                            0 if null_set['Fee Deposited'] else np.int32(data_set['Fee Deposited']).item()
-                        ]
-                    )
-
-                    connector.db.commit()
-
-        ShowInfo('Import Data', 'Successfully imported the data.')
-        self.__enable_import_button()
+        job.set_total(total_rows)
+        return import_chunks(table_name, chunks, job)
 
-    def __write_data_in_db_for_courses(self, df: dataframe) -> None:
+    def __import_completed(self, inserted: int) -> None:
+        """
+        Called on the main thread when the import job finishes.
         """
-        Writes courses data from DataFrame to the database.
+        self._hide_progress()
+        courses.invalidate()
 
-        Parameters:
-            df (pd.DataFrame): DataFrame containing courses data.
+        if self.on_imported:
+            self.on_imported()
 
-        Returns:
-            None
-        """
-        with DatabaseConnector() as connector:
-            for row in df.index:
-                if df.isnull().iloc[row].any():
-                    continue
-
-                else:
-                    data_set = df.iloc[row]
-
-                    try:
-                        connector.cursor.execute(
-                            '''
-                            INSERT INTO courses(course_id, name, fee, year)
-                            VALUES(?, ?, ?, ?);
-                            ''',
-                            [
-                                np.int32(data_set['Course ID']).item(),
-                                data_set['Course Name'],
-                                np.int64(data_set['Fee']).item(),
-                                np.uint8(data_set['Year']).item()
-                            ]
-                        )
-                        connector.db.commit()
-
-                    except:
-                        ShowError(
-                            'Import Failed', 'Your Excel sheet may contain duplicate data, or the row in the Excel sheet is already present in the software. Please remove them.')
-                        self.__enable_import_button()
-                        return None
-
-        ShowInfo('Import Data', 'Successfully imported the data.')
+        ShowInfo('Import Data', f'Successfully imported the data. Rows imported: {inserted}')
         self.__enable_import_button()
 
-    def __write_data_in_db_for_books(self, df: dataframe) -> None:
+    def __import_failed(self, table_name: str, error: Exception) -> None:
         """
-        Writes books data from DataFrame to the database.
+        Called on the main thread when the import job raises an error, nothing is imported in that case.
+        """
+        self._hide_progress()
 
-        Parameters:
-            df (pd.DataFrame): DataFrame containing books data.
+        if table_name == 'courses' and isinstance(error, sqlite3.IntegrityError):
+            ShowError(
+                'Import Failed', 'Your Excel sheet may contain duplicate data, or the row in the Excel sheet is already present in the software. Please remove them.')
 
-        Returns:
-            None
+        else:
+            ShowError('Import Failed', str(error))
+
+        self.__enable_import_button()
+
+    def __import_cancelled(self) -> None:
+        """
+        Called on the main thread when the import job is cancelled, the transaction is rolled back so nothing is imported.
         """
-        with DatabaseConnector() as connector:
-            for row in df.index:
-                if df.isnull().iloc[row].any():
-                    continue
-
-                else:
-                    data_set = df.iloc[row]
-                    connector.cursor.execute(
-                        '''
-                        INSERT INTO books(name, quantity, course_id, isbn, publisher)
-                        VALUES(?, ?, ?, ?, ?);
-                        ''',
-                        [
-                            data_set['Name'],
-                            np.int32(data_set['Quantity']).item(),
-                            np.int32(data_set['Course ID']).item(),
-                            np.int64(data_set['ISBN']).item(),
-                            data_set['Publisher']
-                        ]
-                    )
-                    connector.db.commit()
-
-        ShowInfo('Import Data', 'Successfully imported the data.')
+        self._hide_progress()
+        ShowInfo('Import Cancelled', 'The import was cancelled, no data was imported.')
         self.__enable_import_button()
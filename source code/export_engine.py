@@ -0,0 +1,691 @@
+import os
+import csv
+import gzip
+import queue
+import shutil
+import tempfile
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from zipfile import ZipFile, ZIP_DEFLATED
+from openpyxl import Workbook
+from database_connector import DatabaseConnector, configure_pool, pool
+from background_job import BackgroundJob, JobCancelled
+
+# column headers of every exportable table, also used as the sheet headers in Excel
+HEADERS: dict[str, list[str]] = {
+    'student': ['Enrollment Number', 'Name', 'Date of Birth', 'Address', 'Mobile no', 'Email', 'Year of Admission', 'Age', 'Gender', 'Pincode', 'Course ID', 'Father Name', '10th Percentage', '12th Percentage', 'Fee Deposited'],
+    'courses': ['Course ID', 'Course Name', 'Fee', 'Year'],
+    'books': ['Book ID', 'Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher'],
+    'books_lended': ['Enrollment Number', 'Book ID']
+}
+
+# rows fetched from the cursor at a time, only this many rows are in memory during an export
+FETCH_SIZE = 5000
+
+# below this many rows an Excel export is written by `export_to_excel()`, starting the worker processes would take longer than the export
+PARALLEL_EXPORT_MIN_ROWS = 50000
+
+# seconds between two progress updates of a parallel export
+PROGRESS_INTERVAL = 0.2
+
+# formats offered by the export window, an Excel export is one workbook, the other formats write one file per table
+EXPORT_FORMATS: dict[str, str] = {
+    'xlsx': 'Excel (.xlsx)',
+    'csv.gz': 'CSV (.csv.gz)',
+    'parquet': 'Parquet (.parquet)',
+    'feather': 'Feather (.feather)'
+}
+
+# arrow type of every column, in the order of `HEADERS`, so that every batch of a table has the same schema even if a batch is all NULL
+ARROW_TYPES: dict[str, list[str]] = {
+    'student': ['int64', 'string', 'string', 'string', 'string', 'string', 'int64', 'int64', 'string', 'int64', 'int64', 'string', 'float64', 'float64', 'int64'],
+    'courses': ['int64', 'string', 'int64', 'int64'],
+    'books': ['int64', 'string', 'int64', 'int64', 'string', 'string'],
+    'books_lended': ['int64', 'int64']
+}
+
+# number of leading columns of a table that form the key recorded in change_log, see migrations.py
+KEY_COLUMNS: dict[str, int] = {
+    'student': 1,
+    'courses': 1,
+    'books': 1,
+    'books_lended': 2
+}
+
+# every changed row between two marks, once, with the operation that brings the downstream copy up to date.
+# the key is part of the group because books_lended reuses the rowid of deleted rows.
+CHANGED_ROWS_SQL = '''
+    WITH changed AS (
+        SELECT
+            row_id,
+            row_key,
+            MAX(change_id) AS last_change_id,
+            MIN(change_id) = MIN(CASE WHEN operation = 'I' THEN change_id END) AS first_is_insert
+        FROM change_log
+        WHERE table_name = ? AND change_id > ? AND change_id <= ?
+        GROUP BY row_id, row_key
+    )
+    SELECT changed.row_id, changed.row_key, IFNULL(changed.first_is_insert, 0) AS first_is_insert, change_log.operation
+    FROM changed
+    JOIN change_log ON change_log.change_id = changed.last_change_id
+'''
+
+
+def count_rows(tables: list[str]) -> int:
+    """
+    Counts the rows of the given tables, used as the total of an export job.
+
+    Parameters:
+        - tables (list[str]): names of the tables, keys of `HEADERS`.
+
+    Returns:
+        - int: total number of rows.
+    """
+    with DatabaseConnector() as connector:
+        return sum(
+            connector.cursor.execute(f'SELECT COUNT(*) FROM {table};').fetchall()[0][0]
+            for table in tables
+        )
+
+
+def export_to_excel(
+    tables: list[str],
+    excel_file_path: str,
+    job: BackgroundJob | None = None
+) -> str:
+    """
+    Exports the tables to an Excel file, one sheet per table named after it, with the headers of `HEADERS`.
+
+    The cursor is read with `fetchmany()` and the rows are appended to a write-only workbook, which streams every sheet to a temporary file. So the memory used stays the same whatever the size of the tables.
+
+    Parameters:
+        - tables (list[str]): names of the tables to export, keys of `HEADERS`.
+        - excel_file_path (str): path of the .xlsx file to write.
+        - job (BackgroundJob or None): if given, the exported rows are reported to it and it is checked for cancellation after every batch.
+
+    Returns:
+        - str: path of the written file.
+
+    Example:
+    ```
+    export_to_excel(['student', 'courses'], 'Exported Data.xlsx')
+    ```
+    """
+    if job:
+        job.set_total(count_rows(tables))
+
+    workbook = Workbook(write_only=True)
+    rows_done = 0
+
+    with DatabaseConnector() as connector:
+        for table in tables:
+            worksheet = workbook.create_sheet(title=table)
+            worksheet.append(HEADERS[table])
+
+            connector.cursor.execute(f'SELECT * FROM {table};')
+
+            while rows := connector.cursor.fetchmany(FETCH_SIZE):
+                for row in rows:
+                    worksheet.append(row)
+
+                rows_done += len(rows)
+
+                if job:
+                    job.report(rows_done)
+                    job.check_cancelled()
+
+    workbook.save(excel_file_path)
+
+    return excel_file_path
+
+
+def export_to_excel_parallel(
+    tables: list[str],
+    excel_file_path: str,
+    job: BackgroundJob | None = None,
+    max_workers: int | None = None
+) -> str:
+    """
+    Exports the tables to one Excel file like `export_to_excel()`, but every table is read and serialized by its own worker process, on its own connection, at the same time.
+
+    Each worker writes its table to a temporary single sheet workbook, then the sheets are copied into the final workbook. openpyxl writes strings inline, so a sheet doesn't depend on anything else in its workbook and can be copied as is. With a single table, or fewer than `PARALLEL_EXPORT_MIN_ROWS` rows, the tables are exported by `export_to_excel()` instead.
+
+    Parameters:
+        - tables (list[str]): names of the tables to export, keys of `HEADERS`.
+        - excel_file_path (str): path of the .xlsx file to write.
+        - job (BackgroundJob or None): if given, the rows written by the workers are reported to it every `PROGRESS_INTERVAL` seconds. Cancelling it stops every worker after its current batch.
+        - max_workers (int or None): number of worker processes, by default one per table up to the number of CPUs.
+
+    Returns:
+        - str: path of the written file.
+    """
+    rows_total = count_rows(tables)
+
+    if len(tables) < 2 or rows_total < PARALLEL_EXPORT_MIN_ROWS:
+        return export_to_excel(tables, excel_file_path, job)
+
+    if job:
+        job.set_total(rows_total)
+
+    max_workers = max_workers or min(len(tables), os.cpu_count() or 1)
+    rows_of = dict.fromkeys(tables, 0)
+
+    # spawn, not fork: the export runs on a job thread and the pool has open connections, a forked child would inherit both
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as temp_folder, context.Manager() as manager:
+        part_paths = [os.path.join(temp_folder, f'{table}.xlsx') for table in tables]
+        progress = manager.Queue()
+        cancelled = manager.Event()
+
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        futures = {
+            executor.submit(_export_table_part, pool.database, pool.profile, table, part_path, progress, cancelled): table
+            for table, part_path in zip(tables, part_paths)
+        }
+
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+
+                while True:
+                    try:
+                        table, rows_done = progress.get_nowait()
+
+                    except queue.Empty:
+                        break
+
+                    rows_of[table] = max(rows_of[table], rows_done)
+
+                for future in done:
+                    rows_of[futures[future]] = future.result()
+
+                if job:
+                    job.report(sum(rows_of.values()))
+                    job.check_cancelled()
+
+        except BaseException:
+            # the workers stop after their current batch, waiting for them keeps the temporary folder in use until they are gone
+            cancelled.set()
+            executor.shutdown(cancel_futures=True)
+            raise
+
+        executor.shutdown()
+
+        _assemble_workbook(tables, part_paths, excel_file_path, temp_folder)
+
+    return excel_file_path
+
+
+class _PartProgress:
+    """
+    Stands in for the `BackgroundJob` of `export_to_excel()` in a worker process of `export_to_excel_parallel()`: progress goes to the parent over a manager queue and cancellation comes from a manager event.
+
+    Parameters:
+        - table (str): name of the exported table.
+        - progress (Queue): queue of (table, rows written) tuples read by the parent.
+        - cancelled (Event): set by the parent when the export is cancelled.
+    """
+
+    def __init__(self, table: str, progress, cancelled) -> None:
+        self.table = table
+        self.progress = progress
+        self.cancelled = cancelled
+        self.rows_done = 0
+
+    def set_total(self, rows_total: int | None) -> None:
+        'The total is known by the parent.'
+
+    def report(self, rows_done: int) -> None:
+        'Sends the rows written so far to the parent.'
+        self.rows_done = rows_done
+        self.progress.put((self.table, rows_done))
+
+    def check_cancelled(self) -> None:
+        'Raises JobCancelled once the parent cancelled the export.'
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+
+def _export_table_part(database: str, profile: str | None, table: str, part_path: str, progress, cancelled) -> int:
+    """
+    Runs in a worker process of `export_to_excel_parallel()`, exports one table to its own workbook.
+
+    Parameters:
+        - database (str): path of the database, the worker has its own connection pool.
+        - profile (str or None): PRAGMA profile used by the parent process.
+        - table (str): name of the table.
+        - part_path (str): path of the temporary workbook.
+        - progress (Queue): manager queue the written rows are reported to after every batch.
+        - cancelled (Event): manager event, the worker stops after its current batch once it is set.
+
+    Returns:
+        - int: number of rows written to the workbook.
+    """
+    configure_pool(database=database, profile=profile)
+
+    part_job = _PartProgress(table, progress, cancelled)
+    export_to_excel([table], part_path, part_job)
+
+    return part_job.rows_done
+
+
+def _assemble_workbook(tables: list[str], part_paths: list[str], excel_file_path: str, temp_folder: str) -> None:
+    """
+    Builds the final workbook: an empty write-only workbook with one sheet per table gives the workbook structure, and its sheets are replaced by the sheets of the parts. Everything is copied stream to stream.
+
+    Parameters:
+        - tables (list[str]): names of the tables, in sheet order.
+        - part_paths (list[str]): workbooks written by the workers, in the same order.
+        - excel_file_path (str): path of the final .xlsx file.
+        - temp_folder (str): folder for the skeleton workbook.
+    """
+    skeleton = Workbook(write_only=True)
+    for table in tables:
+        skeleton.create_sheet(title=table)
+
+    skeleton_path = os.path.join(temp_folder, 'skeleton.xlsx')
+    skeleton.save(skeleton_path)
+
+    # openpyxl names the sheets sheet1.xml, sheet2.xml... in creation order
+    sheet_sources = {
+        f'xl/worksheets/sheet{index}.xml': part_path
+        for index, part_path in enumerate(part_paths, start=1)
+    }
+
+    with ZipFile(skeleton_path) as skeleton_zip, ZipFile(excel_file_path, 'w', ZIP_DEFLATED) as output_zip:
+        for name in skeleton_zip.namelist():
+            with output_zip.open(name, 'w', force_zip64=True) as destination:
+                if name in sheet_sources:
+                    with ZipFile(sheet_sources[name]) as part_zip, part_zip.open('xl/worksheets/sheet1.xml') as source:
+                        shutil.copyfileobj(source, destination)
+
+                else:
+                    with skeleton_zip.open(name) as source:
+                        shutil.copyfileobj(source, destination)
+
+
+def export_to_files(
+    tables: list[str],
+    folder_path: str,
+    file_format: str,
+    job: BackgroundJob | None = None
+) -> list[str]:
+    """
+    Exports every table to its own file in the folder, named after the table, with the headers of `HEADERS`. The cursor is read with `fetchmany()` and every batch is written to the file right away, so only `FETCH_SIZE` rows are in memory at a time.
+
+    Parameters:
+        - tables (list[str]): names of the tables to export, keys of `HEADERS`.
+        - folder_path (str): folder of the exported files.
+        - file_format (str): 'csv.gz', 'parquet' or 'feather'. Parquet and Feather need pyarrow.
+        - job (BackgroundJob or None): if given, the exported rows are reported to it and it is checked for cancellation after every batch.
+
+    Returns:
+        - list[str]: paths of the written files.
+
+    Raises:
+        - ValueError: if the format is unknown.
+        - ImportError: if the format needs pyarrow and it is not installed.
+
+    Example:
+    ```
+    export_to_files(['student', 'books'], 'exports', 'parquet')
+    ```
+    """
+    write = _file_writer(file_format, allow_xlsx=False)
+
+    if job:
+        job.set_total(count_rows(tables))
+
+    file_paths = []
+    rows_done = 0
+
+    with DatabaseConnector() as connector:
+        for table in tables:
+            file_path = os.path.join(folder_path, f'{table}.{file_format}')
+            connector.cursor.execute(f'SELECT * FROM {table};')
+
+            columns = list(zip(HEADERS[table], ARROW_TYPES[table]))
+
+            for rows in write(table, columns, _fetch_batches(connector.cursor), file_path):
+                rows_done += rows
+
+                if job:
+                    job.report(rows_done)
+                    job.check_cancelled()
+
+            file_paths.append(file_path)
+
+    return file_paths
+
+
+def export_changes(
+    tables: list[str],
+    folder_path: str,
+    file_format: str,
+    job: BackgroundJob | None = None
+) -> list[str]:
+    """
+    Exports only the rows changed since the last incremental export of every table, to `<table>_changes.<format>` in the folder.
+
+    The triggers of migration 2 record every insert, update and delete in `change_log`. The high-water mark of a table is the last `change_id` it was exported up to, it is saved in the settings table as `export_hwm_<table>` once the file of the table is written. The changes up to the mark are then removed from the log.
+
+    Every file has the headers of `HEADERS` plus an "Operation" column: 'insert' or 'update' rows carry the current values of the row, 'delete' rows only carry the key columns. The first incremental export of a table (no mark yet) exports all its rows as inserts.
+
+    Parameters:
+        - tables (list[str]): names of the tables to export, keys of `HEADERS`.
+        - folder_path (str): folder of the exported files.
+        - file_format (str): key of `EXPORT_FORMATS`.
+        - job (BackgroundJob or None): if given, the exported rows are reported to it and it is checked for cancellation after every batch. A cancelled table keeps its previous mark.
+
+    Returns:
+        - list[str]: paths of the written files.
+
+    Example:
+    ```
+    export_changes(['student', 'books_lended'], 'sync', 'csv.gz')
+    ```
+    """
+    write = _file_writer(file_format)
+
+    with DatabaseConnector() as connector:
+        # changes made while exporting are left for the next export
+        connector.cursor.execute('SELECT COALESCE(MAX(change_id), 0) FROM change_log;')
+        last_change_id = connector.cursor.fetchall()[0][0]
+
+        high_water_marks = {table: _read_high_water_mark(connector, table) for table in tables}
+
+        if job:
+            job.set_total(sum(
+                _count_changes(connector, table, high_water_marks[table], last_change_id)
+                for table in tables
+            ))
+
+        file_paths = []
+        rows_done = 0
+
+        for table in tables:
+            file_path = os.path.join(folder_path, f'{table}_changes.{file_format}')
+            columns = list(zip(HEADERS[table], ARROW_TYPES[table])) + [('Operation', 'string')]
+            batches = _change_batches(connector, table, high_water_marks[table], last_change_id)
+
+            for rows in write(table, columns, batches, file_path):
+                rows_done += rows
+
+                if job:
+                    job.report(rows_done)
+                    job.check_cancelled()
+
+            _save_high_water_mark(connector, table, last_change_id)
+            file_paths.append(file_path)
+
+    prune_change_log()
+    return file_paths
+
+
+def prune_change_log() -> int:
+    """
+    Removes the changes that no incremental export is going to read: the changes of a table up to its high-water mark, and every change of a table that was never exported incrementally, since its first incremental export exports all its rows. It is called after every incremental export and on startup, so the log doesn't grow without end on a site that never uses the "changes only" export.
+
+    Returns:
+        - int: number of removed changes.
+    """
+    removed = 0
+
+    with DatabaseConnector() as connector:
+        connector.cursor.execute('BEGIN IMMEDIATE;')
+        connector.cursor.execute('SELECT COALESCE(MAX(change_id), 0) FROM change_log;')
+        last_change_id = connector.cursor.fetchall()[0][0]
+
+        for table in KEY_COLUMNS:
+            high_water_mark = _read_high_water_mark(connector, table)
+            removed += _delete_changes(connector, table, last_change_id if high_water_mark is None else high_water_mark)
+
+        connector.db.commit()
+
+    return removed
+
+
+def forget_changes(connector: DatabaseConnector) -> None:
+    """
+    Removes every change and every high-water mark, used when all the data is removed. The caller commits.
+
+    Parameters:
+        - connector (DatabaseConnector): connector of the caller's transaction.
+    """
+    connector.cursor.execute("DELETE FROM settings WHERE setting LIKE 'export_hwm_%';")
+    connector.cursor.execute('SELECT COALESCE(MAX(change_id), 0) FROM change_log;')
+    last_change_id = connector.cursor.fetchall()[0][0]
+
+    for table in KEY_COLUMNS:
+        _delete_changes(connector, table, last_change_id)
+
+
+def _read_high_water_mark(connector: DatabaseConnector, table: str) -> int | None:
+    """
+    Returns the last `change_id` the table was exported up to, None if it was never exported incrementally.
+    """
+    connector.cursor.execute(
+        'SELECT value FROM settings WHERE setting = ?;',
+        [f'export_hwm_{table}']
+    )
+    result = connector.cursor.fetchall()
+
+    return int(result[0][0]) if result else None
+
+
+def _save_high_water_mark(connector: DatabaseConnector, table: str, change_id: int) -> None:
+    """
+    Saves the high-water mark of the table and removes the exported changes from the log, in one transaction.
+    """
+    connector.cursor.execute(
+        '''
+        INSERT INTO settings(setting, value)
+        VALUES (?, ?)
+        ON CONFLICT(setting) DO UPDATE SET value = excluded.value;
+        ''',
+        [f'export_hwm_{table}', str(change_id)]
+    )
+    _delete_changes(connector, table, change_id)
+    connector.db.commit()
+
+
+def _delete_changes(connector: DatabaseConnector, table: str, change_id: int) -> int:
+    """
+    Deletes the changes of a table up to a `change_id`.
+    """
+    connector.cursor.execute(
+        'DELETE FROM change_log WHERE table_name = ? AND change_id <= ?;',
+        [table, change_id]
+    )
+
+    return connector.cursor.rowcount
+
+
+def _count_changes(connector: DatabaseConnector, table: str, high_water_mark: int | None, last_change_id: int) -> int:
+    """
+    Returns the number of rows the incremental export of the table is going to write, at most.
+    """
+    if high_water_mark is None:
+        connector.cursor.execute(f'SELECT COUNT(*) FROM {table};')
+
+    else:
+        connector.cursor.execute(
+            f'SELECT COUNT(*) FROM ({CHANGED_ROWS_SQL});',
+            [table, high_water_mark, last_change_id]
+        )
+
+    return connector.cursor.fetchall()[0][0]
+
+
+def _change_batches(connector: DatabaseConnector, table: str, high_water_mark: int | None, last_change_id: int) -> Iterator[list[tuple]]:
+    """
+    Yields the rows of the incremental export of the table, `FETCH_SIZE` rows at a time, each row ends with its operation.
+    """
+    if high_water_mark is None:
+        connector.cursor.execute(f"SELECT *, 'insert' FROM {table} ORDER BY rowid;")
+        yield from _fetch_batches(connector.cursor)
+        return None
+
+    # the current values of inserted and updated rows
+    connector.cursor.execute(
+        f'''
+        WITH changes AS ({CHANGED_ROWS_SQL})
+        SELECT {table}.*, CASE WHEN changes.first_is_insert THEN 'insert' ELSE 'update' END
+        FROM changes
+        JOIN {table} ON {table}.rowid = changes.row_id
+        WHERE changes.operation != 'D'
+        ORDER BY changes.row_id;
+        ''',
+        [table, high_water_mark, last_change_id]
+    )
+    yield from _fetch_batches(connector.cursor)
+
+    # the keys of deleted rows, a row inserted and deleted between the marks was never exported
+    connector.cursor.execute(
+        f'''
+        WITH changes AS ({CHANGED_ROWS_SQL})
+        SELECT row_key
+        FROM changes
+        WHERE operation = 'D' AND NOT first_is_insert
+        ORDER BY row_id;
+        ''',
+        [table, high_water_mark, last_change_id]
+    )
+    padding = (None,) * (len(HEADERS[table]) - KEY_COLUMNS[table])
+
+    for rows in _fetch_batches(connector.cursor):
+        yield [
+            tuple(int(key) for key in row_key.split(',')) + padding + ('delete',)
+            for row_key, in rows
+        ]
+
+
+def _fetch_batches(cursor) -> Iterator[list[tuple]]:
+    """
+    Yields the rows of an executed cursor, `FETCH_SIZE` rows at a time.
+    """
+    while rows := cursor.fetchmany(FETCH_SIZE):
+        yield rows
+
+
+def _write_xlsx(table: str, columns: list[tuple[str, str]], batches: Iterator[list[tuple]], file_path: str) -> Iterator[int]:
+    """
+    Writes the batches to a write-only workbook with one sheet named after the table, yields the number of rows of every written batch.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=table)
+    worksheet.append([header for header, _ in columns])
+
+    for rows in batches:
+        for row in rows:
+            worksheet.append(row)
+
+        yield len(rows)
+
+    workbook.save(file_path)
+
+
+def _write_csv_gz(table: str, columns: list[tuple[str, str]], batches: Iterator[list[tuple]], file_path: str) -> Iterator[int]:
+    """
+    Writes the batches to a gzip compressed CSV file, yields the number of rows of every written batch.
+    """
+    with gzip.open(file_path, 'wt', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow([header for header, _ in columns])
+
+        for rows in batches:
+            writer.writerows(rows)
+            yield len(rows)
+
+
+def _write_parquet(table: str, columns: list[tuple[str, str]], batches: Iterator[list[tuple]], file_path: str) -> Iterator[int]:
+    """
+    Writes the batches to a Parquet file, every batch becomes a row group. Yields the number of rows of every written batch.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, columns)
+
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(pa, schema, rows))
+            yield len(rows)
+
+
+def _write_feather(table: str, columns: list[tuple[str, str]], batches: Iterator[list[tuple]], file_path: str) -> Iterator[int]:
+    """
+    Writes the batches to a Feather (Arrow IPC) file, every batch is a record batch of the file. Yields the number of rows of every written batch.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.ipc
+
+    schema = _arrow_schema(pa, columns)
+
+    with pa.OSFile(file_path, 'wb') as sink, pyarrow.ipc.new_file(sink, schema) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(pa, schema, rows))
+            yield len(rows)
+
+
+def _file_writer(file_format: str, allow_xlsx: bool = True):
+    """
+    Returns the function writing one table to a file of the format.
+
+    Raises:
+        - ValueError: if the format is unknown.
+    """
+    writers = {
+        'csv.gz': _write_csv_gz,
+        'parquet': _write_parquet,
+        'feather': _write_feather
+    }
+
+    if allow_xlsx:
+        writers['xlsx'] = _write_xlsx
+
+    if file_format not in writers:
+        raise ValueError(f'Unknown export format "{file_format}".')
+
+    return writers[file_format]
+
+
+def _import_pyarrow():
+    """
+    Imports pyarrow, it is only needed for the Parquet and Feather exports.
+
+    Raises:
+        - ImportError: if pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+
+    except ImportError as e:
+        raise ImportError('Parquet and Feather exports need pyarrow, install it with "pip install pyarrow".') from e
+
+    return pyarrow
+
+
+def _arrow_schema(pa, columns: list[tuple[str, str]]):
+    """
+    Returns the arrow schema of the columns, given as (header, arrow type) pairs.
+    """
+    return pa.schema([
+        pa.field(header, pa.type_for_alias(arrow_type))
+        for header, arrow_type in columns
+    ])
+
+
+def _record_batch(pa, schema, rows: list[tuple]):
+    """
+    Converts a batch of rows from the cursor to an arrow record batch, column by column.
+    """
+    columns = zip(*rows)
+
+    return pa.record_batch(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema
+    )
@@ -0,0 +1,143 @@
+import os
+import threading
+import tkinter
+import customtkinter as ctk
+from PIL import Image, ImageTk
+
+type icon = ctk.CTkImage
+type photo = ImageTk.PhotoImage
+
+
+class ImageCache:
+    """
+    A process-wide cache of the images of the icons folder.
+
+    Every message box, window and menu button used to open and decode its PNG again, the cache decodes each file once. The decoded images don't depend on tkinter and are kept as long as the process, the tkinter images made from them (`CTkImage` and `PhotoImage`) are shared by all the widgets of the same Tk root.
+
+    Parameters:
+        - folder (str): folder of the images, default 'icons'.
+
+    Usage:
+    ```
+    ctk.CTkButton(master=frame, image=images.get_ctkimage('add_book.png', (40, 40)))
+    window.iconphoto(False, images.get_photoimage('app.png'))
+    ```
+
+    Note:
+        - The sign in form and the main window are two different Tk roots, a tkinter image of one can't be used by the other. The tkinter images are forgotten when the default root changes.
+        - The returned images are shared, they must not be modified.
+    """
+
+    def __init__(self, folder: str = 'icons') -> None:
+        self.folder = folder
+
+        # decoded images by file name
+        self.__decoded: dict[str, Image.Image] = {}
+        self.__lock = threading.Lock()
+
+        # tkinter images of `self.__tk_root`
+        self.__ctk_images: dict[tuple[str, tuple[int, int]], icon] = {}
+        self.__photo_images: dict[str, photo] = {}
+        self.__tk_root = None
+
+    def get_image(self, file_name: str) -> Image.Image:
+        """
+        Returns the decoded image of a file, the file is read and decoded only the first time.
+
+        Parameters:
+            - file_name (str): name of the file in the folder.
+
+        Returns:
+            - Image.Image: the decoded PIL image.
+        """
+        with self.__lock:
+            image = self.__decoded.get(file_name)
+
+        if image is not None:
+            return image
+
+        image = Image.open(os.path.join(self.folder, file_name))
+        # PIL decodes lazily, decode now so that the file is closed and every later use is free
+        image.load()
+
+        with self.__lock:
+            return self.__decoded.setdefault(file_name, image)
+
+    def get_ctkimage(self, file_name: str, size: tuple[int, int]) -> icon:
+        """
+        Returns the CTkImage of a file, shared by every widget showing the same file at the same size.
+
+        Parameters:
+            - file_name (str): name of the file in the folder.
+            - size (tuple[int, int]): size of the image.
+
+        Returns:
+            - icon: customtkinter CTkImage object.
+        """
+        self.__check_tk_root()
+
+        key = (file_name, size)
+        if key not in self.__ctk_images:
+            self.__ctk_images[key] = ctk.CTkImage(self.get_image(file_name), size=size)
+
+        return self.__ctk_images[key]
+
+    def get_photoimage(self, file_name: str) -> photo:
+        """
+        Returns the tkinter PhotoImage of a file, used for the icon of the windows (`iconphoto()`).
+
+        Parameters:
+            - file_name (str): name of the file in the folder.
+
+        Returns:
+            - photo: ImageTk.PhotoImage object.
+        """
+        self.__check_tk_root()
+
+        if file_name not in self.__photo_images:
+            self.__photo_images[file_name] = ImageTk.PhotoImage(self.get_image(file_name))
+
+        return self.__photo_images[file_name]
+
+    def preload(self, file_names: list[str] | None = None) -> threading.Thread:
+        """
+        Decodes images on a background thread, so that the windows opened later don't wait for the disk and the decoder. Only the decoding happens there, tkinter images are created on the main thread when they are first used.
+
+        Parameters:
+            - file_names (list[str] or None): files to decode, every image of the folder if None.
+
+        Returns:
+            - threading.Thread: the started daemon thread.
+        """
+        if file_names is None:
+            file_names = [
+                file_name
+                for file_name in os.listdir(self.folder)
+                if file_name.lower().endswith(('.png', '.jpg'))
+            ]
+
+        def decode_all() -> None:
+            for file_name in file_names:
+                try:
+                    self.get_image(file_name)
+
+                # a broken file is reported when it is used
+                except OSError:
+                    pass
+
+        thread = threading.Thread(target=decode_all, daemon=True)
+        thread.start()
+
+        return thread
+
+    def __check_tk_root(self) -> None:
+        """
+        Forgets the tkinter images if they were made for another Tk root.
+        """
+        if tkinter._default_root is not self.__tk_root:
+            self.__ctk_images.clear()
+            self.__photo_images.clear()
+            self.__tk_root = tkinter._default_root
+
+
+images = ImageCache()
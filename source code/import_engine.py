@@ -0,0 +1,282 @@
+import sqlite3
+import pandas as pd
+import numpy as np
+from collections.abc import Iterator
+from itertools import islice
+from openpyxl import load_workbook, Workbook
+from database_connector import DatabaseConnector
+from background_job import BackgroundJob
+
+type dataframe = pd.DataFrame
+
+# columns that the file must contain for each type of data
+IMPORT_COLUMNS: dict[str, list[str]] = {
+    'student': ['Name', 'Date of Birth', 'Address', 'Mobile no', 'Email', 'Year of Admission', 'Age', 'Gender', 'Pincode', 'Course ID', 'Father Name', '10th Percentage', '12th Percentage', 'Fee Deposited'],
+    'courses': ['Course ID', 'Course Name', 'Fee', 'Year'],
+    'books': ['Name', 'Quantity', 'Course ID', 'ISBN', 'Publisher']
+}
+
+# number of rows read, validated and inserted at a time, bounds the memory used by an import
+CHUNK_SIZE = 5000
+
+INSERT_SQL: dict[str, str] = {
+    'student': '''
+        INSERT INTO student(name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per, fee_deposited)
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+    ''',
+    'courses': '''
+        INSERT INTO courses(course_id, name, fee, year)
+        VALUES(?, ?, ?, ?);
+    ''',
+    'books': '''
+        INSERT INTO books(name, quantity, course_id, isbn, publisher)
+        VALUES(?, ?, ?, ?, ?);
+    '''
+}
+
+
+def read_chunks(file_path: str, sheet_name: str, table: str, chunk_size: int = CHUNK_SIZE) -> tuple[Iterator[dataframe], int | None]:
+    """
+    Opens the Excel or CSV file and returns a generator of DataFrames with at most `chunk_size` rows each, so the file is never loaded at once. The file and its header are checked right away, the rows are read lazily.
+
+    Parameters:
+        - file_path (str): path of the .xlsx or .csv file.
+        - sheet_name (str): name of the sheet to read, ignored for CSV files.
+        - table (str): table the file is imported into, key of `IMPORT_COLUMNS`.
+        - chunk_size (int): rows per chunk, default `CHUNK_SIZE`.
+
+    Returns:
+        - tuple[Iterator[pd.DataFrame], int | None]: chunks of the file, and the number of rows in it if it is known.
+
+    Raises:
+        - ValueError: if the sheet is not found or a column is missing.
+    """
+    columns = IMPORT_COLUMNS[table]
+
+    if file_path.lower().endswith('.csv'):
+        header = list(pd.read_csv(file_path, nrows=0).columns)
+        _check_columns(header, columns)
+
+        return iter(pd.read_csv(file_path, chunksize=chunk_size)), _count_lines(file_path) - 1
+
+    # read only mode parses the sheet row by row instead of building the whole workbook in memory
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        worksheet = workbook[sheet_name]
+        rows = worksheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        _check_columns(header, columns)
+
+    except ValueError:
+        workbook.close()
+        raise
+
+    # max_row comes from the dimension stored in the file, it is None if the file doesn't have one
+    total_rows = worksheet.max_row - 1 if worksheet.max_row else None
+
+    return _chunks_from_rows(workbook, rows, header, chunk_size), total_rows
+
+
+def import_chunks(table: str, chunks: Iterator[dataframe], job: BackgroundJob | None = None) -> int:
+    """
+    Validates, coerces and inserts the chunks into a table, all inside one transaction: read -> validate -> coerce -> insert, only one chunk is in memory at a time.
+
+    Parameters:
+        - table (str): 'student', 'courses' or 'books'.
+        - chunks (Iterator[pd.DataFrame]): chunks of the file, from `read_chunks()`.
+        - job (BackgroundJob or None): if given, the rows read are reported to it and it is checked for cancellation before every chunk.
+
+    Returns:
+        - int: number of inserted rows.
+
+    Raises:
+        - sqlite3.Error: after rolling back the whole import, e.g. sqlite3.IntegrityError for a duplicated course ID.
+    """
+    prepare_rows = {
+        'student': _student_rows,
+        'courses': _course_rows,
+        'books': _book_rows
+    }[table]
+
+    if job:
+        chunks = _track_progress(chunks, job)
+
+    return _insert_chunks((prepare_rows(chunk) for chunk in chunks), INSERT_SQL[table])
+
+
+def import_file(table: str, file_path: str, sheet_name: str = 'Sheet1', job: BackgroundJob | None = None) -> int:
+    """
+    Imports an Excel or CSV file into a table, `read_chunks()` followed by `import_chunks()`.
+
+    Parameters:
+        - table (str): 'student', 'courses' or 'books'.
+        - file_path (str): path of the .xlsx or .csv file.
+        - sheet_name (str): name of the sheet to read, ignored for CSV files, default 'Sheet1'.
+        - job (BackgroundJob or None): if given, the total and the progress are reported to it.
+
+    Returns:
+        - int: number of inserted rows.
+
+    Raises:
+        - ValueError: if the sheet is not found or a column is missing.
+        - sqlite3.Error: if the rows can't be inserted, nothing is imported in that case.
+
+    Example:
+    ```
+    import_file('books', 'books.csv')
+    ```
+    """
+    chunks, total_rows = read_chunks(file_path, sheet_name, table)
+
+    if job:
+        job.set_total(total_rows)
+
+    return import_chunks(table, chunks, job)
+
+
+def _track_progress(chunks: Iterator[dataframe], job: BackgroundJob) -> Iterator[dataframe]:
+    """
+    Passes the chunks through, stops if the job is cancelled and reports the progress once a chunk has been written.
+    """
+    rows_done = 0
+
+    for chunk in chunks:
+        job.check_cancelled()
+        yield chunk
+
+        rows_done += len(chunk)
+        job.report(rows_done)
+
+
+def _count_lines(file_path: str) -> int:
+    """
+    Counts the lines of a text file by reading it in blocks, used as the number of rows of a CSV file for the ETA.
+    """
+    with open(file_path, 'rb') as file:
+        return sum(block.count(b'\n') for block in iter(lambda: file.read(1 << 20), b''))
+
+
+def _check_columns(header: list[str], columns: list[str]) -> None:
+    """
+    Checks that the header of the file contains every required column.
+
+    Raises:
+        - ValueError: naming the missing columns.
+    """
+    if missing_columns := [column for column in columns if column not in header]:
+        raise ValueError(f'The selected file must include the columns: {", ".join(missing_columns)}.')
+
+
+def _chunks_from_rows(workbook: Workbook, rows: Iterator[tuple], header: list[str], chunk_size: int) -> Iterator[dataframe]:
+    """
+    Groups the rows of a read only worksheet into DataFrames of `chunk_size` rows and closes the workbook at the end.
+    """
+    try:
+        while batch := list(islice(rows, chunk_size)):
+            yield pd.DataFrame(batch, columns=header)
+
+    finally:
+        workbook.close()
+
+
+def _validate_chunk(chunk: dataframe, required_columns: list[str]) -> dataframe:
+    """
+    Drops the rows of the chunk that lack a value in any of the required columns, using a single null mask for the whole chunk.
+    """
+    return chunk[chunk[required_columns].notna().all(axis=1)]
+
+
+def _insert_chunks(rows_of_chunks: Iterator[list[tuple]], sql: str) -> int:
+    """
+    Inserts the rows of every chunk with executemany, all inside one transaction that is committed at the end.
+
+    Raises:
+        - sqlite3.Error: after rolling back the whole import.
+    """
+    inserted = 0
+
+    with DatabaseConnector() as connector:
+        try:
+            for rows in rows_of_chunks:
+                connector.cursor.executemany(sql, rows)
+                inserted += len(rows)
+
+            connector.db.commit()
+
+        except sqlite3.Error:
+            connector.db.rollback()
+            raise
+
+    return inserted
+
+
+def _student_rows(df: dataframe) -> list[tuple]:
+    """
+    Drops the rows that lack a required value and coerces every column of the DataFrame at once into the values of the student table.
+
+    Returns:
+        - list[tuple]: rows in the column order of the INSERT statement, containing only python objects.
+    """
+    required_columns = [column for column in IMPORT_COLUMNS['student'] if column not in ('Email', 'Father Name', 'Fee Deposited')]
+
+    df = _validate_chunk(df, required_columns)
+
+    if df.empty:
+        return []
+
+    columns = [
+        df['Name'],
+        pd.to_datetime(df['Date of Birth'], format='mixed').dt.strftime('%Y-%m-%d'),
+        df['Address'],
+        df['Mobile no'].astype(np.int64).astype(str),
+        df['Email'].astype(object).where(df['Email'].notna(), None),
+        df['Year of Admission'].astype(np.uint16),
+        df['Age'].astype(np.uint8),
+        df['Gender'],
+        df['Pincode'].astype(np.int64),
+        df['Course ID'].astype(np.int32),
+        df['Father Name'].astype(object).where(df['Father Name'].notna(), None),
+        df['10th Percentage'].astype(np.float16).astype(np.float64).round(2),
+        df['12th Percentage'].astype(np.float16).astype(np.float64).round(2),
+        df['Fee Deposited'].fillna(0).astype(np.int32)
+    ]
+
+    # tolist() converts numpy scalars to python objects, which sqlite3 can bind
+    return list(zip(*(column.tolist() for column in columns)))
+
+
+def _course_rows(df: dataframe) -> list[tuple]:
+    """
+    Drops the incomplete rows and coerces the DataFrame into the values of the courses table.
+    """
+    df = _validate_chunk(df, IMPORT_COLUMNS['courses'])
+
+    columns = [
+        df['Course ID'].astype(np.int32),
+        df['Course Name'],
+        df['Fee'].astype(np.int64),
+        df['Year'].astype(np.uint8)
+    ]
+
+    return list(zip(*(column.tolist() for column in columns)))
+
+
+def _book_rows(df: dataframe) -> list[tuple]:
+    """
+    Drops the incomplete rows and coerces the DataFrame into the values of the books table.
+    """
+    df = _validate_chunk(df, IMPORT_COLUMNS['books'])
+
+    columns = [
+        df['Name'],
+        df['Quantity'].astype(np.int32),
+        df['Course ID'].astype(np.int32),
+        df['ISBN'].astype(np.int64),
+        df['Publisher']
+    ]
+
+    return list(zip(*(column.tolist() for column in columns)))
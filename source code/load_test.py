@@ -0,0 +1,392 @@
+import os
+import csv
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from database_connector import PRAGMA_PROFILES, DatabaseConnector, configure_pool
+from migrations import run_migrations
+from import_engine import IMPORT_COLUMNS, import_file
+from export_engine import export_to_files
+from services import ServiceError, StudentForm, fee_service, library_service, student_service
+from synthetic_data import SyntheticData
+
+# share of every operation in the load, like a day at the front desk: mostly looking students up
+DEFAULT_MIX: dict[str, int] = {
+    'admission': 10,
+    'fetch': 50,
+    'fee_deposit': 20,
+    'lend_return': 15,
+    'import': 3,
+    'export': 2
+}
+
+PERCENTILES = [50, 90, 95, 99]
+
+OUTCOMES = ['ok', 'skipped', 'refused', 'busy', 'error']
+
+
+class Skipped(Exception):
+    """
+    Raised by an operation that found nothing to do, e.g. the student has no fee left to pay. It isn't a refusal of a service.
+    """
+
+
+@dataclass(frozen=True)
+class Sample:
+    """
+    One operation run by the load test.
+
+    Attributes:
+        - operation (str): key of `DEFAULT_MIX`.
+        - outcome (str): 'ok', 'skipped' (nothing to do, e.g. no fee left to pay), 'refused' (a service refused it, e.g. no copy left), 'busy' (the database stayed locked) or 'error'.
+        - scheduled (float): `time.perf_counter()` the operation was due at.
+        - started (float): when a worker started it.
+        - finished (float): when it finished.
+    """
+    operation: str
+    outcome: str
+    scheduled: float
+    started: float
+    finished: float
+
+    @property
+    def latency(self) -> float:
+        'Seconds from when the operation was due to when it finished, the wait for a free worker included.'
+        return self.finished - self.scheduled
+
+    @property
+    def wait(self) -> float:
+        'Seconds the operation waited for a free worker.'
+        return self.started - self.scheduled
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values, 0 for no values.
+
+    Parameters:
+        - sorted_values (list[float]): the values, sorted.
+        - percent (float): e.g. 99.
+
+    Returns:
+        - float
+    """
+    if not sorted_values:
+        return 0.0
+
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadTest:
+    """
+    Drives the services of the program at a target rate and measures the latency of every operation, like several front-desk terminals working on one database at once.
+
+    The load is open: operations arrive at random (Poisson) times at the target rate whether the earlier ones finished or not, and their latency is counted from when they were due. A database that can't keep up shows up as growing latencies instead of a lower rate that looks fine.
+
+    Operations:
+        - admission: admits a synthetic student.
+        - fetch: reads a random student with its course.
+        - fee_deposit: reads the fee status of a random student and deposits a part of the remaining fee.
+        - lend_return: lends one of the available books to a random student and takes it back.
+        - import: imports a CSV file of `import_rows` synthetic students.
+        - export: exports every table to gzip CSV files.
+
+    Parameters:
+        - rate (float): operations started per second.
+        - duration (float): seconds operations are started for, the last ones are then waited for.
+        - mix (dict[str, int]): weight of every operation, keys of `DEFAULT_MIX`.
+        - workers (int): threads running the operations, the terminals working at the same time.
+        - import_rows (int): students in the imported file, default 200.
+        - seed (int or None): seed of the random numbers.
+
+    Usage:
+    ```
+    configure_pool(database='synthetic.sqlite', size=8)
+    samples = LoadTest(rate=20, duration=60, mix=DEFAULT_MIX, workers=8).run()
+    print(report(samples))
+    ```
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        duration: float,
+        mix: dict[str, int],
+        workers: int,
+        import_rows: int = 200,
+        seed: int | None = None
+    ) -> None:
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix
+        self.workers = workers
+        self.import_rows = import_rows
+        self.random = random.Random(seed)
+
+        # first error message of every operation, shown with the report
+        self.errors: dict[str, str] = {}
+
+    def run(self) -> list[Sample]:
+        """
+        Runs the load test.
+
+        Returns:
+            - list[Sample]: every operation that was run, in the order they were due.
+        """
+        self.work_folder = tempfile.mkdtemp(prefix='load_test_')
+
+        try:
+            self.__prepare()
+            operations = list(self.mix)
+            weights = [self.mix[operation] for operation in operations]
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='terminal') as executor:
+                futures = []
+                start = time.perf_counter()
+                due = start
+
+                while True:
+                    due += self.random.expovariate(self.rate)
+
+                    if due - start > self.duration:
+                        break
+
+                    # open load: sleep until the operation is due, never until a worker is free
+                    if (delay := due - time.perf_counter()) > 0:
+                        time.sleep(delay)
+
+                    operation = self.random.choices(operations, weights)[0]
+                    futures.append(executor.submit(self.__run_operation, operation, due, self.random.getrandbits(32)))
+
+                return [future.result() for future in futures]
+
+        finally:
+            shutil.rmtree(self.work_folder, ignore_errors=True)
+
+    def __prepare(self) -> None:
+        'Reads the courses and the enrollment numbers the operations pick from, and writes the file of the import.'
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('SELECT course_id, name, fee, year FROM courses ORDER BY course_id;')
+            self.course_rows = connector.cursor.fetchall()
+            connector.cursor.execute('SELECT IFNULL(MAX(enrollment_no), 0) FROM student;')
+            self.last_enrollment_no = connector.cursor.fetchall()[0][0]
+
+        if not self.course_rows or not self.last_enrollment_no:
+            raise ValueError('The database has no courses or no students, fill it with synthetic_data.py first.')
+
+        data = SyntheticData(self.random.getrandbits(32))
+        self.course_weights = data.course_weights(self.course_rows)
+        self.import_path = os.path.join(self.work_folder, 'students.csv')
+
+        with open(self.import_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(IMPORT_COLUMNS['student'])
+
+            for course in data.random.choices(self.course_rows, self.course_weights, k=self.import_rows):
+                name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per = data.student(course)
+                writer.writerow([name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per, 0])
+
+    def __run_operation(self, operation: str, due: float, seed: int) -> Sample:
+        'Runs on a worker thread, runs one operation and records its outcome and times.'
+        started = time.perf_counter()
+        data = SyntheticData(seed)
+
+        try:
+            match operation:
+                case 'admission':
+                    self.__admission(data)
+
+                case 'fetch':
+                    self.__fetch(data)
+
+                case 'fee_deposit':
+                    self.__fee_deposit(data)
+
+                case 'lend_return':
+                    self.__lend_return(data)
+
+                case 'import':
+                    import_file('student', self.import_path)
+
+                case 'export':
+                    self.__export()
+
+            outcome = 'ok'
+
+        except Skipped:
+            outcome = 'skipped'
+
+        except ServiceError:
+            outcome = 'refused'
+
+        except sqlite3.OperationalError:
+            outcome = 'busy'
+
+        except Exception as e:
+            outcome = 'error'
+            self.errors.setdefault(operation, f'{type(e).__name__}: {e}')
+
+        return Sample(operation, outcome, due, started, time.perf_counter())
+
+    def __random_enrollment_no(self, data: SyntheticData) -> int:
+        'Returns a random enrollment number of the students the test started with.'
+        return data.random.randint(1, self.last_enrollment_no)
+
+    def __admission(self, data: SyntheticData) -> None:
+        course = data.random.choices(self.course_rows, self.course_weights)[0]
+        name, dob, address, phone_no, email, _, _, gender, pincode, course_id, f_name, class_10_per, class_12_per = data.student(course)
+
+        student_service.admit(
+            StudentForm(
+                name=name,
+                f_name=f_name,
+                dob=dob,
+                address=address,
+                phone_no=phone_no,
+                email=email,
+                gender=gender,
+                pincode=str(pincode),
+                course_id=str(course_id),
+                class_10_per=str(class_10_per),
+                class_12_per=str(class_12_per)
+            )
+        )
+
+    def __fetch(self, data: SyntheticData) -> None:
+        student_service.get(self.__random_enrollment_no(data))
+
+    def __fee_deposit(self, data: SyntheticData) -> None:
+        status = fee_service.status(self.__random_enrollment_no(data))
+
+        if status is None or status.remaining_fee <= 0:
+            raise Skipped('Nothing to deposit.')
+
+        fee_service.deposit(status.student.enrollment_no, min(status.remaining_fee, data.random.randint(1, 10) * 500))
+
+    def __lend_return(self, data: SyntheticData) -> None:
+        enrollment_no = self.__random_enrollment_no(data)
+        available = library_service.available_for(enrollment_no)
+
+        if not available:
+            raise Skipped('No book to lend.')
+
+        book_ids = [data.random.choice(available).book_id]
+        library_service.lend(enrollment_no, book_ids)
+        library_service.give_back(enrollment_no, book_ids)
+
+    def __export(self) -> None:
+        folder_path = tempfile.mkdtemp(dir=self.work_folder)
+
+        try:
+            export_to_files(['student', 'courses', 'books', 'books_lended'], folder_path, 'csv.gz')
+
+        finally:
+            shutil.rmtree(folder_path, ignore_errors=True)
+
+
+def report(samples: list[Sample], errors: dict[str, str] | None = None) -> str:
+    """
+    Returns the report of a load test: for every operation the count, the outcomes and the latency percentiles in milliseconds, and the throughput that was reached. Skipped operations only read, they are left out of the percentiles.
+
+    Parameters:
+        - samples (list[Sample]): from `LoadTest.run()`.
+        - errors (dict[str, str] or None): first error message of every operation, from `LoadTest.errors`.
+
+    Returns:
+        - str: the report as a text table.
+    """
+    header = ['operation', 'count', *OUTCOMES, *(f'p{p} ms' for p in PERCENTILES), 'max ms', 'wait p99 ms']
+    rows = []
+
+    for operation in [*dict.fromkeys(sample.operation for sample in samples), 'all']:
+        selected = [sample for sample in samples if operation in ('all', sample.operation)]
+        measured = [sample for sample in selected if sample.outcome != 'skipped']
+        latencies = sorted(sample.latency * 1000 for sample in measured)
+        waits = sorted(sample.wait * 1000 for sample in measured)
+        outcomes = [sample.outcome for sample in selected]
+
+        rows.append([
+            operation,
+            len(selected),
+            *(outcomes.count(outcome) for outcome in OUTCOMES),
+            *(f'{percentile(latencies, p):.1f}' for p in PERCENTILES),
+            f'{latencies[-1]:.1f}' if latencies else '0.0',
+            f'{percentile(waits, 99):.1f}'
+        ])
+
+    widths = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    lines = ['  '.join(str(value).rjust(width) for value, width in zip(row, widths)) for row in [header, *rows]]
+
+    if samples:
+        elapsed = max(sample.finished for sample in samples) - min(sample.scheduled for sample in samples)
+        lines.append(f'\n{len(samples):,} operations in {elapsed:.1f} s, {len(samples) / elapsed:.1f} operations/s')
+
+    for operation, message in (errors or {}).items():
+        lines.append(f'first error of {operation}: {message}')
+
+    return '\n'.join(lines)
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """
+    Parses a mix like 'fetch=70,fee_deposit=30', operations left out are not run.
+
+    Raises:
+        - argparse.ArgumentTypeError: if an operation is unknown or a weight is not a number.
+    """
+    mix = {}
+
+    for part in text.split(','):
+        operation, _, weight = part.partition('=')
+
+        if operation.strip() not in DEFAULT_MIX or not weight.strip().isdigit():
+            raise argparse.ArgumentTypeError(f'{part!r} must be <operation>=<weight>, operations: {", ".join(DEFAULT_MIX)}.')
+
+        mix[operation.strip()] = int(weight)
+
+    return mix
+
+
+def main() -> None:
+    'Entry point of `python load_test.py`.'
+    parser = argparse.ArgumentParser(description='Runs the operations of the program against a database at a target rate and reports their latency.')
+    parser.add_argument('database', help='path of the database, it is written to, use one made by synthetic_data.py')
+    parser.add_argument('--rate', type=float, default=10, help='operations per second, default 10')
+    parser.add_argument('--duration', type=float, default=30, help='seconds the load lasts, default 30')
+    parser.add_argument('--workers', type=int, default=8, help='operations running at the same time, default 8')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='weights of the operations, e.g. fetch=70,fee_deposit=30')
+    parser.add_argument('--import-rows', type=int, default=200, help='students in every imported file, default 200')
+    parser.add_argument('--profile', choices=list(PRAGMA_PROFILES), help='PRAGMA profile of the connections, see settings')
+    parser.add_argument('--seed', type=int, help='seed of the random numbers')
+    parser.add_argument('--samples', help='CSV file to save every operation to')
+    arguments = parser.parse_args()
+
+    if not os.path.exists(arguments.database):
+        parser.error(f'{arguments.database} does not exist.')
+
+    configure_pool(database=arguments.database, size=arguments.workers, profile=arguments.profile)
+    run_migrations()
+
+    load_test = LoadTest(arguments.rate, arguments.duration, arguments.mix, arguments.workers, arguments.import_rows, arguments.seed)
+    samples = load_test.run()
+
+    if arguments.samples:
+        with open(arguments.samples, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['operation', 'outcome', 'latency_ms', 'wait_ms'])
+            writer.writerows(
+                [sample.operation, sample.outcome, round(sample.latency * 1000, 3), round(sample.wait * 1000, 3)]
+                for sample in samples
+            )
+
+    print(report(samples, load_test.errors))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,20 @@
 #Achievement Unlocked: 5000+ lines of code in this project.
 import customtkinter as ctk
-import os
-from PIL import ImageTk, Image
 from menu import Menu
 from content_frame import ContentFrame
-from database_connector import DatabaseConnector
+from migrations import run_migrations
+from export_engine import prune_change_log
 from pre_req_test import PreReqTester
 from signin_form import SigninForm
+from image_cache import images
+from settings_service import settings
 import sys 
+import sqlite3
+import multiprocessing
+import logging
+from time import perf_counter
 
-#running pre-requisite test
-error = PreReqTester()
-if len(error):
-    app = ctk.CTk()
-    app.geometry("300x100")
-    app.title('College Management System')
-
-    ctk.CTkLabel(
-        master= app,
-        text= f"! {error}",
-        text_color= 'red'
-    ).pack(pady= 10)
-
-    app.mainloop()
-    sys.exit()
+logger = logging.getLogger(__name__)
 
 
 class MainWindow(ctk.CTk):
@@ -43,6 +34,7 @@ class MainWindow(ctk.CTk):
         - menu: An instance of Menu, providing menu options for various functionalities.
         - settings_image: An instance of CTkImage representing the settings icon.
         - setting_button: A button for accessing application settings.
+        - started_at: perf_counter() value the startup time is measured from.
 
     Example:
     ```
@@ -54,10 +46,11 @@ class MainWindow(ctk.CTk):
     Ensure that the 'icons' directory contains the necessary image files for the window icon and settings button.
     """
 
-    def __init__(self, user: str) -> None:
+    def __init__(self, user: str, started_at: float | None = None) -> None:
         super().__init__()
         
         self.user = user
+        self.started_at = started_at if started_at is not None else perf_counter()
         self.__version__ = "1.1"
 
         # basic attributes
@@ -66,8 +59,7 @@ class MainWindow(ctk.CTk):
         self.title('College Management System')
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.iconphoto(False, self.imagepath)
 
@@ -101,12 +93,7 @@ class MainWindow(ctk.CTk):
         )
 
         # settings
-        img_path = os.path.join('icons', 'settings.png')
-
-        self.settings_image = ctk.CTkImage(
-            Image.open(img_path),
-            size= (40, 40)
-        )
+        self.settings_image = images.get_ctkimage('settings.png', (40, 40))
         self.setting_button = ctk.CTkButton(
             master=self,
             image=self.settings_image,
@@ -154,9 +141,67 @@ class MainWindow(ctk.CTk):
         # for settings
         self.bind('<Control-`>', self.content.settings_gui)
 
+        logger.info('Main window built in %.0f ms', (perf_counter() - self.started_at) * 1000)
+
+        # runs once the main loop has drawn the first frame and is idle, i.e. when the user can start working
+        self.after(0, lambda: self.after_idle(self.__log_time_to_interactive))
+
+    def __log_time_to_interactive(self) -> None:
+        """
+        Logs the time from `started_at` to the first idle main loop.
+        """
+        logger.info('Main window interactive after %.0f ms', (perf_counter() - self.started_at) * 1000)
+
 
 if __name__ == '__main__':
+    # the export worker processes are started from a frozen .exe too
+    multiprocessing.freeze_support()
+
+    logging.basicConfig(
+        level= logging.INFO,
+        format= '%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+    process_started_at = perf_counter()
+
+    #running pre-requisite test
+    error = PreReqTester()
+
+    # bringing the database schema up to date, trimming the change log and reading the settings
+    if not len(error):
+        try:
+            run_migrations()
+
+            try:
+                prune_change_log()
+
+            except sqlite3.OperationalError:
+                # another terminal is writing, the log is trimmed on the next start
+                logger.warning('Change log not pruned, the database is busy')
+
+            settings.load()
+
+        except sqlite3.Error as e:
+            error = str(e)
+
+    if len(error):
+        app = ctk.CTk()
+        app.geometry("300x100")
+        app.title('College Management System')
+
+        ctk.CTkLabel(
+            master= app,
+            text= f"! {error}",
+            text_color= 'red'
+        ).pack(pady= 10)
+
+        app.mainloop()
+        sys.exit()
+
+    # the icons of the main window are decoded while the user signs in
+    images.preload()
+
     sign_in_form = SigninForm(fg_color= '#ceefff')
+    logger.info('Sign in form built %.0f ms after start', (perf_counter() - process_started_at) * 1000)
     sign_in_form.mainloop()
 
     user_name = sign_in_form.user_name.get()
@@ -165,16 +210,11 @@ if __name__ == '__main__':
         sys.exit()
 
 
-    app = MainWindow(user= user_name)
-    with DatabaseConnector() as connector:
-        connector.cursor.execute(
-            '''
-            SELECT value
-            FROM settings
-            WHERE setting = "theme";
-            '''
-        )
-        theme = connector.cursor.fetchall()[0][0]
+    signed_in_at = perf_counter()
+
+    # the theme is set before the window is built, changing it afterwards redraws every widget
+    ctk.set_appearance_mode(settings.get('theme'))
+    settings.subscribe('theme', lambda name, theme: ctk.set_appearance_mode(theme))
 
-    ctk.set_appearance_mode(theme)
+    app = MainWindow(user= user_name, started_at= signed_in_at)
     app.mainloop()
@@ -1,9 +1,8 @@
 import customtkinter as ctk
 from content_frame import CTkWindow, ContentFrame
-from excel_connector import ExportToExcel, ImportFromExcel
-from database_connector import DatabaseConnector
-from PIL import Image
-import os
+from excel_connector import ExportReceipts, ExportToExcel, ImportFromExcel
+from settings_service import settings
+from image_cache import images
 
 type ScrollableFrame = ContentFrame
 type icon = ctk.CTkImage
@@ -38,6 +37,7 @@ class Menu(ctk.CTkTabview):
         Student Related Buttons
         - new_admission_button (ctk.CTkButton): Button to initiate a new student admission.
         - fetch_data_button (ctk.CTkButton): Button to fetch student data.
+        - search_student_button (ctk.CTkButton): Button to search students by name, email, phone...
         - update_data_button (ctk.CTkButton): Button to update student data.
         - deposit_fee_button (ctk.CTkButton): Button to deposit fees for a student.
         - remove_student_button (ctk.CTkButton): Button to remove a student record.
@@ -46,6 +46,7 @@ class Menu(ctk.CTkTabview):
         - lend_book_button (ctk.CTkButton): Button to lend a book from the library.
         - return_book_button (ctk.CTkButton): Button to return a book to the library.
         - book_list_button (ctk.CTkButton): Button to view the list of available books.
+        - search_book_button (ctk.CTkButton): Button to search books by name, publisher or ISBN.
         - add_book_button (ctk.CTkButton): Button to add a new book to the library.
         - remove_book_button (ctk.CTkButton): Button to remove a book from the library.
         - update_book_stock_button (ctk.CTkButton): Button to update the stock of a book in the library.
@@ -59,8 +60,10 @@ class Menu(ctk.CTkTabview):
         Excel Related Buttons
         - export_data_button (ctk.CTkButton): Button to export data to excel file.
         - import_data_button (ctk.CTkButton): Button to import data from excel file.
+        - export_receipts_button (ctk.CTkButton): Button to export the fee receipts of a period.
 
     Note:
+        - The buttons of a tab (and their icons) are only created the first time the tab is shown, so the attributes above exist once their tab has been shown.
         - master must be a customtkinter window instance
         - self.content_frame prefered to be a customtkinter ScrollableFrame
     """
@@ -72,9 +75,17 @@ class Menu(ctk.CTkTabview):
             **kwargs
         ) -> None:
 
-        super().__init__(master, **kwargs)
+        super().__init__(master, command= self.__build_current_tab, **kwargs)
         self.content_frame = content_frame
 
+        self.__tab_builders = {
+            'Accounts': self.__build_accounts_tab,
+            'Library': self.__build_library_tab,
+            'Courses': self.__build_courses_tab,
+            'Excel': self.__build_excel_tab
+        }
+        self.__built_tabs: set[str] = set()
+
         self.pack(fill='y')
 
         # tabs
@@ -85,20 +96,34 @@ class Menu(ctk.CTkTabview):
 
         self._segmented_button.configure(font= ('arial', 12, 'bold'))
 
-        #getting default tab from db and setting it
-        with DatabaseConnector() as connector:
-            connector.cursor.execute(
-                '''
-                SELECT value
-                FROM settings
-                WHERE setting = "default_tab";
-                '''
-            )
-            tab = connector.cursor.fetchall()[0][0]
-            self.set(tab)
-
-        # adding widgets
-        # accounts
+        #setting the default tab
+        self.set(settings.get('default_tab'))
+
+    def set(self, name: str) -> None:
+        """
+        Shows a tab, creating its buttons if it is shown for the first time.
+
+        Parameters:
+            - name (str): name of the tab.
+
+        Returns:
+            - None
+        """
+        super().set(name)
+        self.__build_current_tab()
+
+    def __build_current_tab(self) -> None:
+        """
+        Creates the buttons of the current tab if they don't exist yet. Called when a tab is selected with the mouse and by `set()`.
+        """
+        name = self.get()
+
+        if name not in self.__built_tabs:
+            self.__built_tabs.add(name)
+            self.__tab_builders[name]()
+
+    def __build_accounts_tab(self) -> None:
+        'Creates the buttons of the Accounts tab.'
         self.new_admission_button = ctk.CTkButton(
             master=self.tab('Accounts'),
             text='New Admission',
@@ -121,6 +146,17 @@ class Menu(ctk.CTkTabview):
             fg_color= '#1F6AA5'
         )
 
+        self.search_student_button = ctk.CTkButton(
+            master=self.tab('Accounts'),
+            text='Search Student',
+            command= self.content_frame.search_student_gui,
+            image= self.__create_ctkimage('fetch_student.png'),
+            font= ('arial', 14),
+            anchor= 'w',
+            width= 200,
+            fg_color= '#1F6AA5'
+        )
+
         self.update_data_button = ctk.CTkButton(
             master=self.tab('Accounts'),
             text='Update Student Data',
@@ -159,6 +195,8 @@ class Menu(ctk.CTkTabview):
         self.__create_canvas_and_line('Accounts')
         self.fetch_data_button.pack(pady=5)
         self.__create_canvas_and_line('Accounts')
+        self.search_student_button.pack(pady=5)
+        self.__create_canvas_and_line('Accounts')
         self.update_data_button.pack(pady=5)
         self.__create_canvas_and_line('Accounts')
         self.deposit_fee_button.pack(pady=5)
@@ -166,7 +204,8 @@ class Menu(ctk.CTkTabview):
         self.remove_student_button.pack(pady=5)
         self.__create_canvas_and_line('Accounts')
 
-        # library
+    def __build_library_tab(self) -> None:
+        'Creates the buttons of the Library tab.'
         self.lend_book_button = ctk.CTkButton(
             master=self.tab('Library'),
             text='Lend Book',
@@ -200,6 +239,17 @@ class Menu(ctk.CTkTabview):
             fg_color= '#1F6AA5'
         )
 
+        self.search_book_button = ctk.CTkButton(
+            master=self.tab('Library'),
+            text='Search Book',
+            command= self.content_frame.search_book_gui,
+            image= self.__create_ctkimage('book_list.png'),
+            font= ('arial', 14),
+            anchor= 'w',
+            width= 200,
+            fg_color= '#1F6AA5'
+        )
+
         self.add_book_button = ctk.CTkButton(
             master=self.tab('Library'),
             text='Add Book',
@@ -240,6 +290,8 @@ class Menu(ctk.CTkTabview):
         self.__create_canvas_and_line('Library')
         self.book_list_button.pack(pady=5)
         self.__create_canvas_and_line('Library')
+        self.search_book_button.pack(pady=5)
+        self.__create_canvas_and_line('Library')
         self.add_book_button.pack(pady=5)
         self.__create_canvas_and_line('Library')
         self.remove_book_button.pack(pady=5)
@@ -247,7 +299,8 @@ class Menu(ctk.CTkTabview):
         self.update_book_stock_button.pack(pady=5)
         self.__create_canvas_and_line('Library')
 
-        # courses
+    def __build_courses_tab(self) -> None:
+        'Creates the buttons of the Courses tab.'
         self.add_course_button = ctk.CTkButton(
             master=self.tab('Courses'),
             text='Add Course',
@@ -302,7 +355,8 @@ class Menu(ctk.CTkTabview):
         self.show_course_button.pack(pady=5)
         self.__create_canvas_and_line('Courses')
 
-        # excel
+    def __build_excel_tab(self) -> None:
+        'Creates the buttons of the Excel tab.'
         self.export_data_button = ctk.CTkButton(
             master=self.tab('Excel'),
             text='Export Data',
@@ -325,11 +379,24 @@ class Menu(ctk.CTkTabview):
             fg_color= '#1F6AA5'
         )
 
+        self.export_receipts_button = ctk.CTkButton(
+            master=self.tab('Excel'),
+            text='Export Receipts',
+            command= self.export_fee_receipts,
+            image= self.__create_ctkimage('fee_deposit.png'),
+            font= ('arial', 14),
+            anchor= 'w',
+            width= 200,
+            fg_color= '#1F6AA5'
+        )
+
 
         self.export_data_button.pack(pady=5)
         self.__create_canvas_and_line('Excel')
         self.import_data_button.pack(pady=5)
         self.__create_canvas_and_line('Excel')
+        self.export_receipts_button.pack(pady=5)
+        self.__create_canvas_and_line('Excel')
 
     def export_data_to_excel(self, event: any = None) -> None:
         self.content_frame.content_remover()
@@ -337,7 +404,12 @@ class Menu(ctk.CTkTabview):
 
     def import_data_from_excel(self, event: any = None) -> None:
         self.content_frame.content_remover()
-        ImportFromExcel()
+        # imported courses must show up in the cached course lists
+        ImportFromExcel(on_imported=self.content_frame.screens.invalidate)
+
+    def export_fee_receipts(self, event: any = None) -> None:
+        self.content_frame.content_remover()
+        ExportReceipts()
 
     def __create_canvas_and_line(self, tab_name: str) -> None:
         """
@@ -363,7 +435,7 @@ class Menu(ctk.CTkTabview):
     @staticmethod
     def __create_ctkimage(file_name: str) -> icon:
         """
-        Gets the image from the icons folder, creates and CTkImage object and returns it.
+        Gets the CTkImage of an image of the icons folder from the image cache, the image is decoded only once.
 
         Parameters:
             - file_name (str): name of the image file in icons folder.
@@ -371,5 +443,4 @@ class Menu(ctk.CTkTabview):
         Returns:
             - icon: customtkinter CTkImage object.
         """
-        img = ctk.CTkImage(Image.open(os.path.join('icons', file_name)), size= (40, 40))
-        return img
+        return images.get_ctkimage(file_name, (40, 40))
@@ -1,6 +1,5 @@
 import customtkinter as ctk
-from PIL import ImageTk, Image
-import os
+from image_cache import images
 
 type NoneOrCallable = None | callable
 
@@ -33,18 +32,11 @@ class ShowError(ctk.CTkToplevel):
         self.resizable(False, False)
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.after(300, lambda: self.iconphoto(False, self.imagepath))
 
-        img_path = os.path.join('icons', 'error.png')
-
-        self.icon = ctk.CTkImage(
-            dark_image=Image.open(img_path),
-            light_image=Image.open(img_path),
-            size=(30, 30)
-        )
+        self.icon = images.get_ctkimage('error.png', (30, 30))
 
         self.icon_label = ctk.CTkLabel(
             master=self,
@@ -109,18 +101,11 @@ class ShowInfo(ctk.CTkToplevel):
         self.resizable(False, False)
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.after(300, lambda: self.iconphoto(False, self.imagepath))
 
-        img_path = os.path.join('icons', 'info.png')
-
-        self.icon = ctk.CTkImage(
-            dark_image=Image.open(img_path),
-            light_image=Image.open(img_path),
-            size=(30, 30)
-        )
+        self.icon = images.get_ctkimage('info.png', (30, 30))
 
         self.icon_label = ctk.CTkLabel(
             master=self,
@@ -187,18 +172,11 @@ class ShowWarning(ctk.CTkToplevel):
         self.resizable(False, False)
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(
-            file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.after(300, lambda: self.iconphoto(False, self.imagepath))
 
-        img_path = os.path.join('icons', 'warning.png')
-
-        self.icon = ctk.CTkImage(
-            dark_image=Image.open(img_path),
-            light_image=Image.open(img_path),
-            size=(30, 30)
-        )
+        self.icon = images.get_ctkimage('warning.png', (30, 30))
 
         self.icon_label = ctk.CTkLabel(
             master=self,
@@ -0,0 +1,290 @@
+import sqlite3
+from database_connector import DatabaseConnector
+
+type Migration = tuple[int, str, list[str]]
+
+
+def change_log_triggers(table: str, row_key: str) -> list[str]:
+    """
+    Returns the statements creating the triggers that record every insert, update and delete of a table in `change_log`, used by the incremental export.
+
+    Parameters:
+        - table (str): name of the table.
+        - row_key (str): SQL expression of the key of a row with `{row}` in place of NEW or OLD, e.g. `{row}.book_id`. Keys of more than one column are joined with commas.
+
+    Returns:
+        - list[str]: the CREATE TRIGGER statements.
+    """
+    new_key = row_key.format(row='NEW')
+    old_key = row_key.format(row='OLD')
+
+    return [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS change_log_{table}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO change_log(table_name, row_id, row_key, operation)
+            VALUES ('{table}', NEW.rowid, {new_key}, 'I');
+        END;
+        ''',
+        # an update of the key is recorded as a delete of the old key, so the old row is removed downstream
+        f'''
+        CREATE TRIGGER IF NOT EXISTS change_log_{table}_update AFTER UPDATE ON {table}
+        BEGIN
+            INSERT INTO change_log(table_name, row_id, row_key, operation)
+            SELECT '{table}', OLD.rowid, {old_key}, 'D'
+            WHERE {old_key} IS NOT {new_key};
+
+            INSERT INTO change_log(table_name, row_id, row_key, operation)
+            VALUES ('{table}', NEW.rowid, {new_key}, 'U');
+        END;
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS change_log_{table}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO change_log(table_name, row_id, row_key, operation)
+            VALUES ('{table}', OLD.rowid, {old_key}, 'D');
+        END;
+        '''
+    ]
+
+
+def fts_statements(table: str, key: str, columns: list[str]) -> list[str]:
+    """
+    Returns the statements creating an FTS5 index `<table>_fts` over some columns of a table, the triggers keeping it in sync and the statement filling it with the existing rows.
+
+    The index is an external content table, it only stores the index and reads the texts from the table itself. Prefix indexes of 2 and 3 characters make search-as-you-type (`term*`) queries fast.
+
+    Parameters:
+        - table (str): name of the table.
+        - key (str): INTEGER PRIMARY KEY of the table, the rowid of the index.
+        - columns (list[str]): indexed columns.
+
+    Returns:
+        - list[str]: the statements.
+    """
+    fts = f'{table}_fts'
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'NEW.{column}' for column in columns)
+    old_values = ', '.join(f'OLD.{column}' for column in columns)
+
+    return [
+        f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {column_list},
+            content='{table}',
+            content_rowid='{key}',
+            prefix='2 3'
+        );
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (NEW.{key}, {new_values});
+        END;
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', OLD.{key}, {old_values});
+        END;
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE ON {table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', OLD.{key}, {old_values});
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (NEW.{key}, {new_values});
+        END;
+        ''',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild');"
+    ]
+
+
+# Every migration is (version, description, statements). Versions must be increasing, a migration is never edited once it is released, add a new one instead.
+MIGRATIONS: list[Migration] = [
+    (
+        1,
+        'Secondary indexes for library and course lookups',
+        [
+            # books lended to a student (return book) and deleting a lend record
+            'CREATE INDEX IF NOT EXISTS idx_books_lended_enrollment_book ON books_lended(enrollment_no, book_id);',
+            # removing a book deletes its lend records by book_id
+            'CREATE INDEX IF NOT EXISTS idx_books_lended_book ON books_lended(book_id);',
+            # books of a course that are in stock (lend book)
+            'CREATE INDEX IF NOT EXISTS idx_books_course_quantity ON books(course_id, quantity);',
+            # students of a course (remove course)
+            'CREATE INDEX IF NOT EXISTS idx_student_course ON student(course_id);'
+        ]
+    ),
+    (
+        2,
+        'Change log for the incremental export',
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS change_log(
+                change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                row_key TEXT NOT NULL,
+                operation TEXT NOT NULL CHECK (operation IN ('I', 'U', 'D'))
+            );
+            ''',
+            # changes of a table after its high-water mark
+            'CREATE INDEX IF NOT EXISTS idx_change_log_table_change ON change_log(table_name, change_id);',
+            *change_log_triggers('student', '{row}.enrollment_no'),
+            *change_log_triggers('courses', '{row}.course_id'),
+            *change_log_triggers('books', '{row}.book_id'),
+            *change_log_triggers('books_lended', "{row}.enrollment_no || ',' || {row}.book_id")
+        ]
+    ),
+    (
+        3,
+        'Indexes for sorting the book and course listings',
+        [
+            # pages of the book list sorted by name
+            'CREATE INDEX IF NOT EXISTS idx_books_name ON books(name);',
+            # pages of the book list sorted by quantity, e.g. books running out of stock
+            'CREATE INDEX IF NOT EXISTS idx_books_quantity ON books(quantity);'
+        ]
+    ),
+    (
+        4,
+        'Full-text search indexes of students and books',
+        [
+            *fts_statements('student', 'enrollment_no', ['name', 'f_name', 'address', 'email', 'phone_no']),
+            *fts_statements('books', 'book_id', ['name', 'publisher', 'isbn'])
+        ]
+    ),
+    (
+        5,
+        'Fee ledger with maintained balances and daily collection totals',
+        [
+            # every deposit is appended, 'opening' rows record fee deposited before the ledger existed (or imported from Excel)
+            '''
+            CREATE TABLE IF NOT EXISTS fee_transaction(
+                transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                enrollment_no INTEGER NOT NULL,
+                amount INTEGER NOT NULL CHECK (amount > 0),
+                kind TEXT NOT NULL DEFAULT 'deposit' CHECK (kind IN ('deposit', 'opening')),
+                paid_on TEXT NOT NULL DEFAULT (date('now', 'localtime')),
+                paid_at TEXT NOT NULL DEFAULT (time('now', 'localtime'))
+            );
+            ''',
+            # history of a student and transactions of a day
+            'CREATE INDEX IF NOT EXISTS idx_fee_transaction_enrollment ON fee_transaction(enrollment_no, transaction_id);',
+            'CREATE INDEX IF NOT EXISTS idx_fee_transaction_paid_on ON fee_transaction(paid_on);',
+            # deposits collected per day, a month is at most 31 rows
+            '''
+            CREATE TABLE IF NOT EXISTS fee_daily_total(
+                paid_on TEXT PRIMARY KEY,
+                amount INTEGER NOT NULL,
+                transactions INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            ''',
+            # student.fee_deposited is the balance of the ledger, kept up to date in the transaction of the deposit
+            '''
+            CREATE TRIGGER IF NOT EXISTS fee_transaction_deposit AFTER INSERT ON fee_transaction
+            WHEN NEW.kind = 'deposit'
+            BEGIN
+                UPDATE student
+                SET fee_deposited = COALESCE(fee_deposited, 0) + NEW.amount
+                WHERE enrollment_no = NEW.enrollment_no;
+
+                INSERT INTO fee_daily_total(paid_on, amount, transactions)
+                VALUES (NEW.paid_on, NEW.amount, 1)
+                ON CONFLICT(paid_on) DO UPDATE SET
+                    amount = amount + excluded.amount,
+                    transactions = transactions + 1;
+            END;
+            ''',
+            # the ledger is append-only, a wrong deposit is corrected by the next one
+            '''
+            CREATE TRIGGER IF NOT EXISTS fee_transaction_no_update BEFORE UPDATE ON fee_transaction
+            BEGIN
+                SELECT RAISE(ABORT, 'fee transactions can not be changed');
+            END;
+            ''',
+            # students added with fee already deposited (e.g. imported) get an opening row, so the ledger always adds up to the balance
+            '''
+            CREATE TRIGGER IF NOT EXISTS student_opening_balance AFTER INSERT ON student
+            WHEN NEW.fee_deposited > 0
+            BEGIN
+                INSERT INTO fee_transaction(enrollment_no, amount, kind)
+                VALUES (NEW.enrollment_no, NEW.fee_deposited, 'opening');
+            END;
+            ''',
+            '''
+            INSERT INTO fee_transaction(enrollment_no, amount, kind)
+            SELECT enrollment_no, fee_deposited, 'opening'
+            FROM student
+            WHERE fee_deposited > 0;
+            '''
+        ]
+    ),
+    (
+        6,
+        'Version number of the courses table',
+        [
+            # other processes (api_server) compare it to see if their course cache is stale, change_log is pruned so it can't be used for that
+            '''
+            INSERT INTO settings(setting, value)
+            VALUES ('courses_version', '0')
+            ON CONFLICT(setting) DO NOTHING;
+            ''',
+            *(
+                f'''
+                CREATE TRIGGER IF NOT EXISTS courses_version_{operation.lower()} AFTER {operation} ON courses
+                BEGIN
+                    UPDATE settings
+                    SET value = CAST(value AS INTEGER) + 1
+                    WHERE setting = 'courses_version';
+                END;
+                '''
+                for operation in ('INSERT', 'UPDATE', 'DELETE')
+            )
+        ]
+    )
+]
+
+
+def schema_version() -> int:
+    """
+    Returns the schema version recorded in the database (sqlite's `user_version`), 0 for a database that was never migrated.
+    """
+    with DatabaseConnector() as connector:
+        connector.cursor.execute('PRAGMA user_version;')
+        return connector.cursor.fetchall()[0][0]
+
+
+def run_migrations() -> int:
+    """
+    Applies every migration newer than the schema version of the database, each one in its own transaction together with the new version number. It is called on startup by main.py.
+
+    Returns:
+        - int: the schema version after running the migrations.
+
+    Raises:
+        - sqlite3.Error: if a migration fails, that migration is rolled back and the earlier ones stay applied.
+    """
+    current_version = schema_version()
+
+    with DatabaseConnector() as connector:
+        for version, description, statements in MIGRATIONS:
+            if version <= current_version:
+                continue
+
+            try:
+                connector.cursor.execute('BEGIN;')
+                for statement in statements:
+                    connector.cursor.execute(statement)
+
+                # PRAGMA doesn't accept parameters, version is always an int from the list above
+                connector.cursor.execute(f'PRAGMA user_version = {int(version)};')
+                connector.db.commit()
+
+            except sqlite3.Error as e:
+                connector.db.rollback()
+                raise sqlite3.Error(f'Migration {version} ({description}) failed: {e}') from e
+
+            current_version = version
+
+    return current_version
@@ -0,0 +1,234 @@
+import customtkinter as ctk
+from database_connector import DatabaseConnector
+from virtual_table import VirtualTable
+
+type ctkFrame = ctk.CTkFrame
+
+
+class PagedListing(ctk.CTkFrame):
+    """
+    A listing of a table that is filtered, sorted and paged by sqlite. Only the rows of the current page are fetched and shown (in a `VirtualTable`), so the listing stays responsive whatever the size of the table.
+
+    The filter is a `LIKE '%text%'` on the filter columns, the sort column is one of the listed columns (the key column breaks ties) and pages are read with `LIMIT`/`OFFSET`.
+
+    Parameters:
+        - master (ctkFrame): the parent widget.
+        - header (str): title shown above the listing.
+        - table (str): name of the table.
+        - columns (dict[str, str]): column of the table and its header, in display order. Only these columns can be sorted on.
+        - key (str): primary key of the table, the default sort and the tie breaker.
+        - filter_columns (list[str]): columns searched by the filter box.
+        - word_wrap_length (int): wraplength of the cells, default 400.
+
+    Usage:
+    ```
+    PagedListing(
+        master=frame,
+        header='Books List',
+        table='books',
+        columns={'book_id': 'Book ID', 'name': 'Name'},
+        key='book_id',
+        filter_columns=['name']
+    ).pack()
+    ```
+
+    Note:
+        - `table`, `columns`, `key` and `filter_columns` are put in the SQL as is, they must come from the code and never from the user.
+    """
+    page_size = 100
+    # milliseconds without typing before the filter is applied
+    filter_delay = 300
+
+    def __init__(
+        self,
+        master: ctkFrame,
+        header: str,
+        table: str,
+        columns: dict[str, str],
+        key: str,
+        filter_columns: list[str],
+        word_wrap_length: int = 400,
+        **kwargs
+    ) -> None:
+        super().__init__(master, fg_color='transparent', **kwargs)
+
+        self.table = table
+        self.columns = columns
+        self.key = key
+        self.filter_columns = filter_columns
+
+        self.page = 0
+        self.total_rows = 0
+        self.__filter_job = None
+
+        ctk.CTkLabel(
+            master=self,
+            text=header,
+            font=('arial', 28)
+        ).pack(pady=5, padx=5)
+
+        # controls
+        controls_frame = ctk.CTkFrame(
+            master=self,
+            fg_color='transparent'
+        )
+        controls_frame.pack(pady=(0, 5))
+
+        self.filter_var = ctk.StringVar()
+        self.filter_var.trace_add('write', lambda *_: self.__schedule_filter())
+
+        ctk.CTkLabel(
+            master=controls_frame,
+            text='Filter:'
+        ).grid(row=0, column=0, padx=(5, 0))
+
+        ctk.CTkEntry(
+            master=controls_frame,
+            textvariable=self.filter_var,
+            width=200
+        ).grid(row=0, column=1, padx=5)
+
+        self.sort_var = ctk.StringVar(value=columns[key])
+
+        ctk.CTkOptionMenu(
+            master=controls_frame,
+            values=list(columns.values()),
+            variable=self.sort_var,
+            width=130,
+            command=lambda _: self.load_page(0)
+        ).grid(row=0, column=2, padx=5)
+
+        self.order_var = ctk.StringVar(value='Ascending')
+
+        ctk.CTkSegmentedButton(
+            master=controls_frame,
+            values=['Ascending', 'Descending'],
+            variable=self.order_var,
+            command=lambda _: self.load_page(0)
+        ).grid(row=0, column=3, padx=5)
+
+        # page navigation
+        navigation_frame = ctk.CTkFrame(
+            master=self,
+            fg_color='transparent'
+        )
+        navigation_frame.pack(pady=(0, 5))
+
+        self.previous_button = ctk.CTkButton(
+            master=navigation_frame,
+            text='< Previous',
+            width=90,
+            command=lambda: self.load_page(self.page - 1)
+        )
+        self.previous_button.grid(row=0, column=0, padx=5)
+
+        self.page_label = ctk.CTkLabel(
+            master=navigation_frame,
+            text='',
+            width=220
+        )
+        self.page_label.grid(row=0, column=1, padx=5)
+
+        self.next_button = ctk.CTkButton(
+            master=navigation_frame,
+            text='Next >',
+            width=90,
+            command=lambda: self.load_page(self.page + 1)
+        )
+        self.next_button.grid(row=0, column=2, padx=5)
+
+        self.table_widget = VirtualTable(
+            master=self,
+            columns=tuple(columns.values()),
+            rows=[],
+            word_wrap_length=word_wrap_length
+        )
+        self.table_widget.pack()
+
+        self.__count_rows()
+        self.load_page(0)
+
+    @property
+    def page_count(self) -> int:
+        'Number of pages of the current filter, at least 1.'
+        return max((self.total_rows + self.page_size - 1) // self.page_size, 1)
+
+    def load_page(self, page: int) -> None:
+        """
+        Fetches and shows one page of the listing, with the current filter and sort.
+
+        Parameters:
+            - page (int): index of the page, clamped to the existing pages.
+
+        Returns:
+            - None
+        """
+        self.page = min(max(page, 0), self.page_count - 1)
+
+        where, parameters = self.__where_clause()
+        sort_column = next(column for column, header in self.columns.items() if header == self.sort_var.get())
+        direction = 'DESC' if self.order_var.get() == 'Descending' else 'ASC'
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'''
+                SELECT {', '.join(self.columns)}
+                FROM {self.table}
+                {where}
+                ORDER BY {sort_column} {direction}, {self.key} {direction}
+                LIMIT ? OFFSET ?;
+                ''',
+                [*parameters, self.page_size, self.page * self.page_size]
+            )
+            rows = connector.cursor.fetchall()
+
+        self.table_widget.set_rows(rows)
+
+        first_row = self.page * self.page_size + 1 if rows else 0
+        self.page_label.configure(
+            text=f'Page {self.page + 1} of {self.page_count}  ({first_row}-{first_row + len(rows) - 1 if rows else 0} of {self.total_rows})'
+        )
+        self.previous_button.configure(state='normal' if self.page > 0 else 'disabled')
+        self.next_button.configure(state='normal' if self.page < self.page_count - 1 else 'disabled')
+
+    def __where_clause(self) -> tuple[str, list[str]]:
+        """
+        Returns the WHERE clause of the filter and its parameters, an empty clause if there is no filter.
+        """
+        text = self.filter_var.get().strip()
+
+        if not text:
+            return '', []
+
+        # % and _ typed by the user are matched literally
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions = ' OR '.join(f"{column} LIKE ? ESCAPE '\\'" for column in self.filter_columns)
+
+        return f'WHERE {conditions}', [pattern] * len(self.filter_columns)
+
+    def __count_rows(self) -> None:
+        """
+        Counts the rows matching the current filter, only needed when the filter changes.
+        """
+        where, parameters = self.__where_clause()
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(f'SELECT COUNT(*) FROM {self.table} {where};', parameters)
+            self.total_rows = connector.cursor.fetchall()[0][0]
+
+    def __schedule_filter(self) -> None:
+        """
+        Applies the filter once the user stops typing for `filter_delay` milliseconds.
+        """
+        if self.__filter_job is not None:
+            self.after_cancel(self.__filter_job)
+
+        self.__filter_job = self.after(self.filter_delay, self.__apply_filter)
+
+    def __apply_filter(self) -> None:
+        """
+        Recounts the rows and shows the first page of the new filter.
+        """
+        self.__filter_job = None
+        self.__count_rows()
+        self.load_page(0)
@@ -0,0 +1,449 @@
+import os
+import html
+import textwrap
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date
+from functools import cache
+from itertools import islice
+from PIL import Image, ImageDraw, ImageFont
+from database_connector import DatabaseConnector
+from background_job import BackgroundJob
+
+type font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+# formats a receipt can be saved in, PDF and PNG are drawn by Pillow, HTML is a standalone page
+RECEIPT_FORMATS: dict[str, str] = {
+    'pdf': 'PDF (.pdf)',
+    'png': 'PNG (.png)',
+    'html': 'HTML (.html)'
+}
+
+# receipts sent to a worker process at a time, large enough that pickling and scheduling don't dominate
+CHUNK_SIZE = 200
+
+# rows fetched from the cursor at a time by `receipts_between()`
+FETCH_SIZE = 5000
+
+# size of a page in pixels, A4 at 150 dpi
+PAGE_SIZE = (1240, 1754)
+PAGE_DPI = 150
+
+# a receipt is one deposit, the overall fee deposited is the balance right after it (opening rows included), so a receipt printed again later shows the same amounts
+RECEIPT_SQL = '''
+    SELECT
+        fee_transaction.transaction_id,
+        fee_transaction.enrollment_no,
+        student.name,
+        student.phone_no,
+        student.address,
+        courses.name,
+        courses.year,
+        fee_transaction.paid_on,
+        courses.fee,
+        fee_transaction.amount,
+        (
+            SELECT SUM(earlier.amount)
+            FROM fee_transaction AS earlier
+            WHERE earlier.enrollment_no = fee_transaction.enrollment_no
+            AND earlier.transaction_id <= fee_transaction.transaction_id
+        )
+    FROM fee_transaction
+    INNER JOIN student
+    ON fee_transaction.enrollment_no = student.enrollment_no
+    INNER JOIN courses
+    ON student.course_id = courses.course_id
+'''
+
+
+@dataclass(frozen=True)
+class Receipt:
+    """
+    The fields of a fee receipt, the same ones shown on screen after a deposit.
+
+    Attributes:
+        - receipt_no (int): ID of the fee transaction.
+        - enrollment_no (int): enrollment number of the student.
+        - name (str): name of the student.
+        - phone_no (str): phone number of the student.
+        - address (str): address of the student.
+        - course_name (str): name of the course.
+        - course_year (int): duration of the course in years.
+        - paid_on (str): date of payment, 'YYYY-MM-DD'.
+        - total_fee (int): fee of the course.
+        - amount (int): fee deposited by this transaction.
+        - fee_deposited (int): overall fee deposited after this transaction.
+    """
+    receipt_no: int
+    enrollment_no: int
+    name: str
+    phone_no: str
+    address: str
+    course_name: str
+    course_year: int
+    paid_on: str
+    total_fee: int
+    amount: int
+    fee_deposited: int
+
+    @property
+    def remaining_fee(self) -> int:
+        'Fee left to deposit after this transaction.'
+        return self.total_fee - self.fee_deposited
+
+    @property
+    def file_name(self) -> str:
+        'Name of the receipt file without the extension, e.g. "receipt_42".'
+        return f'receipt_{self.receipt_no}'
+
+    def details(self) -> list[tuple[str, str]]:
+        'Returns the details of the student and the payment as (label, value) pairs, in the order of the receipt.'
+        return [
+            ('Name of Student', str(self.name)),
+            ('Phone Number', str(self.phone_no)),
+            ('Address', str(self.address)),
+            ('Course Name', str(self.course_name)),
+            ('Course Year', str(self.course_year)),
+            ('Date of Payment', date.fromisoformat(self.paid_on).strftime('%d/%m/%Y'))
+        ]
+
+    def fee_table(self, currency: str = '₹') -> list[tuple]:
+        'Returns the fee structure table, the header first, like the table on screen.'
+        return [
+            ('Sr.No.', 'Particulars', f'Amount({currency})'),
+            (1, 'Total Fee', self.total_fee),
+            (2, 'Fee Deposited (current transaction)', self.amount),
+            (3, 'Overall Fee Deposited', self.fee_deposited),
+            (4, 'Remaining Fee', self.remaining_fee)
+        ]
+
+
+def receipt_for_transaction(transaction_id: int) -> Receipt | None:
+    """
+    Returns the receipt of a deposit.
+
+    Parameters:
+        - transaction_id (int): ID of the fee transaction.
+
+    Returns:
+        - Receipt or None: the receipt, None if there is no such deposit or its student or course was removed.
+    """
+    with DatabaseConnector() as connector:
+        connector.cursor.execute(
+            f"{RECEIPT_SQL} WHERE fee_transaction.transaction_id = ? AND fee_transaction.kind = 'deposit';",
+            [transaction_id]
+        )
+        row = connector.cursor.fetchone()
+
+    return Receipt(*row) if row else None
+
+
+def count_receipts(first_day: str, last_day: str) -> int:
+    """
+    Returns the number of deposits made in a period, the total of a batch run.
+
+    Parameters:
+        - first_day (str): first day of the period, 'YYYY-MM-DD'.
+        - last_day (str): last day of the period (included), 'YYYY-MM-DD'.
+
+    Returns:
+        - int
+    """
+    with DatabaseConnector() as connector:
+        connector.cursor.execute(
+            'SELECT COALESCE(SUM(transactions), 0) FROM fee_daily_total WHERE paid_on BETWEEN ? AND ?;',
+            [first_day, last_day]
+        )
+        return connector.cursor.fetchall()[0][0]
+
+
+def receipts_between(first_day: str, last_day: str) -> Iterator[Receipt]:
+    """
+    Yields the receipts of every deposit made in a period, oldest first, reading `FETCH_SIZE` rows at a time.
+
+    Parameters:
+        - first_day (str): first day of the period, 'YYYY-MM-DD'.
+        - last_day (str): last day of the period (included), 'YYYY-MM-DD'.
+
+    Returns:
+        - Iterator[Receipt]
+    """
+    with DatabaseConnector() as connector:
+        connector.cursor.execute(
+            f'''
+            {RECEIPT_SQL}
+            WHERE fee_transaction.paid_on BETWEEN ? AND ? AND fee_transaction.kind = 'deposit'
+            ORDER BY fee_transaction.transaction_id;
+            ''',
+            [first_day, last_day]
+        )
+
+        while rows := connector.cursor.fetchmany(FETCH_SIZE):
+            for row in rows:
+                yield Receipt(*row)
+
+
+def render_html(receipt: Receipt) -> str:
+    """
+    Renders a receipt as a standalone HTML page.
+
+    Parameters:
+        - receipt (Receipt): the receipt.
+
+    Returns:
+        - str: the page.
+    """
+    details = '\n'.join(
+        f'<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>'
+        for label, value in receipt.details()
+    )
+
+    header, *rows = receipt.fee_table()
+    fee_rows = '\n'.join(
+        '<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in row) + '</tr>'
+        for row in rows
+    )
+    fee_header = ''.join(f'<th>{html.escape(cell)}</th>' for cell in header)
+
+    return f'''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Receipt {receipt.receipt_no}</title>
+<style>
+body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; }}
+h1 {{ text-align: center; margin: 4px 0 24px; }}
+.title {{ text-align: center; text-decoration: underline; }}
+.receipt-no {{ text-align: right; }}
+table {{ border-collapse: collapse; width: 100%; margin-bottom: 24px; }}
+.details th {{ text-align: left; width: 200px; font-weight: normal; }}
+.details th, .details td {{ padding: 4px 0; font-family: Consolas, monospace; }}
+.fees th, .fees td {{ border: 1px solid #000; padding: 6px 10px; text-align: left; }}
+.signatures {{ display: flex; justify-content: space-between; margin-top: 100px; }}
+</style>
+</head>
+<body>
+<div class="title">Receipt</div>
+<h1>College Management System</h1>
+<p class="receipt-no">Receipt No. {receipt.receipt_no}</p>
+<table class="details">
+{details}
+</table>
+<h3>Fee Structure</h3>
+<table class="fees">
+<tr>{fee_header}</tr>
+{fee_rows}
+</table>
+<div class="signatures"><span>Signature of Principal</span><span>Signature of Student</span></div>
+</body>
+</html>
+'''
+
+
+def render_image(receipt: Receipt) -> Image.Image:
+    """
+    Draws a receipt on an A4 page, with the layout of the receipt on screen.
+
+    Parameters:
+        - receipt (Receipt): the receipt.
+
+    Returns:
+        - Image.Image: a grayscale page of `PAGE_SIZE` pixels.
+    """
+    width, height = PAGE_SIZE
+    margin = 100
+    page = Image.new('L', PAGE_SIZE, 255)
+    draw = ImageDraw.Draw(page)
+
+    draw.text((width // 2, 110), 'Receipt', font=_font(30), fill=0, anchor='mm')
+    draw.line((width // 2 - 55, 130, width // 2 + 55, 130), fill=0, width=2)
+    draw.text((width // 2, 190), 'College Management System', font=_font(52, bold=True), fill=0, anchor='mm')
+    draw.text((width - margin, 270), f'Receipt No. {receipt.receipt_no}', font=_font(24), fill=0, anchor='rm')
+
+    # details, aligned like the monospaced label on screen
+    y = 330
+    for label, value in receipt.details():
+        for line in textwrap.wrap(f'{label: <20}: {value}', width=62, subsequent_indent=' ' * 22):
+            draw.text((margin, y), line, font=_font(26, mono=True), fill=0)
+            y += 36
+
+        y += 14
+
+    # fee structure, the rupee sign is missing from many fonts
+    y += 40
+    draw.text((margin, y), 'Fee Structure', font=_font(30, bold=True), fill=0)
+    y += 60
+
+    column_x = (margin, margin + 150, margin + 750, width - margin)
+    row_height = 60
+
+    for index, row in enumerate(receipt.fee_table(currency='Rs.')):
+        cell_font = _font(26, bold=index == 0)
+
+        for column, cell in enumerate(row):
+            draw.rectangle(
+                (column_x[column], y, column_x[column + 1], y + row_height),
+                outline=0,
+                width=2
+            )
+            draw.text((column_x[column] + 15, y + row_height // 2), str(cell), font=cell_font, fill=0, anchor='lm')
+
+        y += row_height
+
+    signature_y = height - 250
+    draw.text((margin, signature_y), 'Signature of Principal', font=_font(26), fill=0)
+    draw.text((width - margin, signature_y), 'Signature of Student', font=_font(26), fill=0, anchor='ra')
+
+    return page
+
+
+def save_receipt(receipt: Receipt, file_path: str) -> str:
+    """
+    Saves a receipt, the format is taken from the extension of the file.
+
+    Parameters:
+        - receipt (Receipt): the receipt.
+        - file_path (str): path of the .pdf, .png or .html file to write.
+
+    Returns:
+        - str: path of the written file.
+
+    Raises:
+        - ValueError: if the extension is not a key of `RECEIPT_FORMATS`.
+    """
+    file_format = os.path.splitext(file_path)[1].lstrip('.').lower()
+
+    if file_format not in RECEIPT_FORMATS:
+        raise ValueError(f'Receipts can be saved as {", ".join(RECEIPT_FORMATS)}, not "{file_format}".')
+
+    if file_format == 'html':
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(render_html(receipt))
+
+    elif file_format == 'pdf':
+        # black and white pages are stored with CCITT compression, a few KB per page
+        render_image(receipt).convert('1').save(file_path, 'PDF', resolution=PAGE_DPI)
+
+    else:
+        render_image(receipt).save(file_path, 'PNG', dpi=(PAGE_DPI, PAGE_DPI), optimize=False)
+
+    return file_path
+
+
+def save_receipts(
+    receipts: Iterable[Receipt],
+    folder_path: str,
+    file_format: str,
+    job: BackgroundJob | None = None,
+    max_workers: int | None = None,
+    total: int | None = None
+) -> int:
+    """
+    Saves many receipts, one file per receipt named after its receipt number, e.g. for the fee run at the start of a semester.
+
+    Drawing and compressing a page is CPU bound, so the receipts are sent in chunks of `CHUNK_SIZE` to a pool of worker processes. The receipts are read lazily, at most two chunks per worker are waiting at a time, so the memory used doesn't depend on the number of receipts.
+
+    Parameters:
+        - receipts (Iterable[Receipt]): the receipts, e.g. `receipts_between()`.
+        - folder_path (str): folder of the receipt files.
+        - file_format (str): key of `RECEIPT_FORMATS`.
+        - job (BackgroundJob or None): if given, the saved receipts are reported to it, and it is checked for cancellation.
+        - max_workers (int or None): number of worker processes, by default the number of CPUs. With 1 the receipts are saved in this process.
+        - total (int or None): number of receipts, reported to the job, e.g. `count_receipts()`.
+
+    Returns:
+        - int: number of saved receipts.
+    """
+    if job and total is not None:
+        job.set_total(total)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    receipts = iter(receipts)
+    chunks = iter(lambda: list(islice(receipts, CHUNK_SIZE)), [])
+    receipts_done = 0
+
+    if max_workers == 1:
+        for chunk in chunks:
+            receipts_done += _save_receipt_chunk(chunk, folder_path, file_format)
+
+            if job:
+                job.report(receipts_done)
+                job.check_cancelled()
+
+        return receipts_done
+
+    # spawn, not fork: a receipts_between() cursor is open on a pooled connection of this job thread, the workers only need the pickled chunks
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        running = set()
+
+        try:
+            for chunk in chunks:
+                running.add(
+                    executor.submit(_save_receipt_chunk, chunk, folder_path, file_format)
+                )
+
+                if len(running) < max_workers * 2:
+                    continue
+
+                # wait for one chunk before reading the next one
+                future = next(as_completed(running))
+                running.remove(future)
+                receipts_done += future.result()
+
+                if job:
+                    job.report(receipts_done)
+                    job.check_cancelled()
+
+            for future in as_completed(running):
+                receipts_done += future.result()
+
+                if job:
+                    job.report(receipts_done)
+                    job.check_cancelled()
+
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return receipts_done
+
+
+def _save_receipt_chunk(chunk: list[Receipt], folder_path: str, file_format: str) -> int:
+    """
+    Runs in a worker process of `save_receipts()`, saves a chunk of receipts. The receipts carry every field, so the workers don't open the database.
+
+    Parameters:
+        - chunk (list[Receipt]): the receipts.
+        - folder_path (str): folder of the receipt files.
+        - file_format (str): key of `RECEIPT_FORMATS`.
+
+    Returns:
+        - int: number of saved receipts.
+    """
+    for receipt in chunk:
+        save_receipt(receipt, os.path.join(folder_path, f'{receipt.file_name}.{file_format}'))
+
+    return len(chunk)
+
+
+@cache
+def _font(size: int, bold: bool = False, mono: bool = False) -> font:
+    """
+    Returns the font used to draw receipts, loaded once per process. Arial and Consolas are the fonts of the screen on Windows, DejaVu is tried on other systems and Pillow's own font is the last resort.
+    """
+    if mono:
+        names = ('consolab.ttf', 'DejaVuSansMono-Bold.ttf') if bold else ('consola.ttf', 'DejaVuSansMono.ttf')
+
+    else:
+        names = ('arialbd.ttf', 'DejaVuSans-Bold.ttf') if bold else ('arial.ttf', 'DejaVuSans.ttf')
+
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+
+        except OSError:
+            continue
+
+    return ImageFont.load_default(size=size)
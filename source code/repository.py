@@ -0,0 +1,517 @@
+from dataclasses import dataclass, fields
+from database_connector import DatabaseConnector
+
+
+@dataclass(frozen=True)
+class Book:
+    """
+    A row of the books table.
+
+    Attributes:
+        - book_id (int): ID of the book.
+        - name (str): name of the book.
+        - quantity (int): copies available for lending.
+        - course_id (int): course the book belongs to.
+        - isbn (str): ISBN number of the book.
+        - publisher (str): publisher of the book.
+    """
+    book_id: int
+    name: str
+    quantity: int
+    course_id: int
+    isbn: str
+    publisher: str
+
+
+@dataclass(frozen=True)
+class Student:
+    """
+    A row of the student table.
+
+    Attributes:
+        - enrollment_no (int): enrollment number of the student.
+        - name (str): name of the student.
+        - dob (str): date of birth, 'YYYY-MM-DD'.
+        - address (str): address of the student.
+        - phone_no (str): phone number of the student.
+        - email (str or None): email of the student.
+        - year_of_ad (int): year of admission.
+        - age (int): age of the student at admission.
+        - gender (str): 'M', 'F' or 'O'.
+        - pincode (int): pincode of the address.
+        - course_id (int): course of the student.
+        - f_name (str or None): father name of the student.
+        - class_10_per (float): 10th percentage.
+        - class_12_per (float): 12th percentage.
+        - fee_deposited (int): fee deposited so far.
+    """
+    enrollment_no: int
+    name: str
+    dob: str
+    address: str
+    phone_no: str
+    email: str | None
+    year_of_ad: int
+    age: int
+    gender: str
+    pincode: int
+    course_id: int
+    f_name: str | None
+    class_10_per: float
+    class_12_per: float
+    fee_deposited: int
+
+
+@dataclass(frozen=True)
+class FeeTransaction:
+    """
+    A row of the fee_transaction ledger.
+
+    Attributes:
+        - transaction_id (int): ID of the transaction, also the receipt number.
+        - enrollment_no (int): enrollment number of the student.
+        - amount (int): amount deposited.
+        - kind (str): 'deposit', or 'opening' for fee deposited before the ledger existed or imported.
+        - paid_on (str): date of the deposit, 'YYYY-MM-DD'.
+        - paid_at (str): local time of the deposit, 'HH:MM:SS'.
+    """
+    transaction_id: int
+    enrollment_no: int
+    amount: int
+    kind: str
+    paid_on: str
+    paid_at: str
+
+
+BOOK_COLUMNS = ', '.join(field.name for field in fields(Book))
+STUDENT_COLUMNS = ', '.join(field.name for field in fields(Student))
+FEE_TRANSACTION_COLUMNS = ', '.join(field.name for field in fields(FeeTransaction))
+
+
+class BookRepository:
+    """
+    Lookups and changes of single books. Every method finds the book by its primary key, so its cost doesn't depend on the number of books.
+
+    Usage:
+    ```
+    if not books.exists(book_id):
+        ShowError('Remove Book', 'This book ID is not found.')
+    ```
+    """
+
+    def exists(self, book_id: int | str) -> bool:
+        """
+        Returns True if there is a book with this ID.
+
+        Parameters:
+            - book_id (int or str): ID of the book.
+
+        Returns:
+            - bool
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('SELECT EXISTS(SELECT 1 FROM books WHERE book_id = ?);', [book_id])
+            return bool(connector.cursor.fetchall()[0][0])
+
+    def get(self, book_id: int | str) -> Book | None:
+        """
+        Returns a book by its ID.
+
+        Parameters:
+            - book_id (int or str): ID of the book.
+
+        Returns:
+            - Book or None: the book, None if there is no such book.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(f'SELECT {BOOK_COLUMNS} FROM books WHERE book_id = ?;', [book_id])
+            row = connector.cursor.fetchone()
+
+        return Book(*row) if row else None
+
+    def any(self) -> bool:
+        'Returns True if there is at least one book.'
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('SELECT EXISTS(SELECT 1 FROM books);')
+            return bool(connector.cursor.fetchall()[0][0])
+
+    def available_for_course(self, course_id: int) -> list[Book]:
+        """
+        Returns the books of a course that have copies left to lend.
+
+        Parameters:
+            - course_id (int): ID of the course.
+
+        Returns:
+            - list[Book]
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'''
+                SELECT {BOOK_COLUMNS}
+                FROM books
+                WHERE course_id = ? AND quantity > 0;
+                ''',
+                [course_id]
+            )
+            return [Book(*row) for row in connector.cursor.fetchall()]
+
+    def lended_to(self, enrollment_no: int | str) -> list[Book]:
+        """
+        Returns the books lended to a student.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - list[Book]
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'''
+                SELECT {BOOK_COLUMNS}
+                FROM books
+                WHERE book_id IN (SELECT book_id FROM books_lended WHERE enrollment_no = ?);
+                ''',
+                [enrollment_no]
+            )
+            return [Book(*row) for row in connector.cursor.fetchall()]
+
+    def add_stock(self, book_id: int | str, quantity: int) -> bool:
+        """
+        Adds copies to the stock of a book.
+
+        Parameters:
+            - book_id (int or str): ID of the book.
+            - quantity (int): number of copies to add.
+
+        Returns:
+            - bool: False if there is no such book.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''
+                UPDATE books
+                SET quantity = quantity + ?
+                WHERE book_id = ?;
+                ''',
+                [quantity, book_id]
+            )
+            connector.db.commit()
+
+            return connector.cursor.rowcount > 0
+
+    def lend(self, enrollment_no: int | str, book_ids: list[int]) -> list[int]:
+        """
+        Lends books to a student, all of them or none, in one transaction.
+
+        The stock is checked and decremented by the same statement (`UPDATE ... WHERE quantity >= 1`), so two desks lending the last copy at the same time can't both succeed and the quantity never goes negative. The transaction is started with `BEGIN IMMEDIATE`, so it waits for (or is refused by) another writer up front instead of failing halfway.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - book_ids (list[int]): IDs of the books, a book listed twice lends two copies.
+
+        Returns:
+            - list[int]: IDs of the books without a copy left (or not found). If it isn't empty nothing is lended.
+
+        Raises:
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('BEGIN IMMEDIATE;')
+
+            out_of_stock = []
+            for book_id in book_ids:
+                connector.cursor.execute(
+                    '''
+                    UPDATE books
+                    SET quantity = quantity - 1
+                    WHERE book_id = ? AND quantity >= 1;
+                    ''',
+                    [book_id]
+                )
+
+                if not connector.cursor.rowcount:
+                    out_of_stock.append(book_id)
+
+            if out_of_stock:
+                connector.db.rollback()
+                return out_of_stock
+
+            connector.cursor.executemany(
+                'INSERT INTO books_lended(enrollment_no, book_id) VALUES(?, ?);',
+                [(enrollment_no, book_id) for book_id in book_ids]
+            )
+            connector.db.commit()
+
+        return []
+
+    def give_back(self, enrollment_no: int | str, book_ids: list[int]) -> list[int]:
+        """
+        Returns books lended to a student, in one transaction. A copy goes back to the stock only if its lending record is removed, so returning the same book twice from two desks doesn't add two copies.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - book_ids (list[int]): IDs of the books, a book listed twice returns two copies.
+
+        Returns:
+            - list[int]: IDs of the books that were not lended to the student, they are skipped.
+
+        Raises:
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('BEGIN IMMEDIATE;')
+
+            not_lended = []
+            for book_id in book_ids:
+                # books_lended has no key, one record is removed per copy
+                connector.cursor.execute(
+                    '''
+                    DELETE FROM books_lended
+                    WHERE rowid = (
+                        SELECT rowid
+                        FROM books_lended
+                        WHERE enrollment_no = ? AND book_id = ?
+                        LIMIT 1
+                    );
+                    ''',
+                    [enrollment_no, book_id]
+                )
+
+                if not connector.cursor.rowcount:
+                    not_lended.append(book_id)
+                    continue
+
+                connector.cursor.execute(
+                    '''
+                    UPDATE books
+                    SET quantity = quantity + 1
+                    WHERE book_id = ?;
+                    ''',
+                    [book_id]
+                )
+
+            connector.db.commit()
+
+        return not_lended
+
+    def remove(self, book_id: int | str) -> bool:
+        """
+        Removes a book and its lending records, in one transaction.
+
+        Parameters:
+            - book_id (int or str): ID of the book.
+
+        Returns:
+            - bool: False if there is no such book.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('DELETE FROM books WHERE book_id = ?;', [book_id])
+
+            if not connector.cursor.rowcount:
+                return False
+
+            connector.cursor.execute('DELETE FROM books_lended WHERE book_id = ?;', [book_id])
+            connector.db.commit()
+
+        return True
+
+
+class StudentRepository:
+    """
+    Lookups and changes of single students. Every method finds the student by its primary key (the enrollment number), so its cost doesn't depend on the number of students.
+
+    Usage:
+    ```
+    student = students.get(enrollment_no)
+    if student is None:
+        ShowError('Fetch Student Data', 'This enrollment number is not found.')
+    ```
+    """
+
+    def exists(self, enrollment_no: int | str) -> bool:
+        """
+        Returns True if there is a student with this enrollment number.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - bool
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('SELECT EXISTS(SELECT 1 FROM student WHERE enrollment_no = ?);', [enrollment_no])
+            return bool(connector.cursor.fetchall()[0][0])
+
+    def get(self, enrollment_no: int | str) -> Student | None:
+        """
+        Returns a student by enrollment number.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - Student or None: the student, None if there is no such student.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(f'SELECT {STUDENT_COLUMNS} FROM student WHERE enrollment_no = ?;', [enrollment_no])
+            row = connector.cursor.fetchone()
+
+        return Student(*row) if row else None
+
+    def remove(self, enrollment_no: int | str) -> bool:
+        """
+        Removes a student.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - bool: False if there is no such student.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('DELETE FROM student WHERE enrollment_no = ?;', [enrollment_no])
+            connector.db.commit()
+
+            return connector.cursor.rowcount > 0
+
+
+class FeeRepository:
+    """
+    The append-only fee ledger. A deposit is a new row of fee_transaction, the triggers of the ledger add it to the balance of the student (`student.fee_deposited`) and to the collection of the day (fee_daily_total) in the same transaction. So the balance of a student is a primary key lookup and the collection of a month is the sum of at most 31 rows.
+
+    Usage:
+    ```
+    transaction = fees.deposit(enrollment_no, 5000)
+    collected = fees.collected('2024-06-01', '2024-06-30')
+    ```
+    """
+
+    def deposit(self, enrollment_no: int | str, amount: int) -> FeeTransaction | None:
+        """
+        Appends a deposit to the ledger, if it doesn't take the fee deposited over the fee of the course. The check and the insert are one statement in one transaction, so two deposits made at the same time can't both pass the check.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - amount (int): amount to deposit, more than 0.
+
+        Returns:
+            - FeeTransaction or None: the new transaction, None if the student is not found or the amount is more than the remaining fee.
+
+        Raises:
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute('BEGIN IMMEDIATE;')
+            connector.cursor.execute(
+                '''
+                INSERT INTO fee_transaction(enrollment_no, amount)
+                SELECT student.enrollment_no, ?
+                FROM student
+                INNER JOIN courses
+                ON student.course_id = courses.course_id
+                WHERE student.enrollment_no = ? AND COALESCE(student.fee_deposited, 0) + ? <= courses.fee;
+                ''',
+                [amount, enrollment_no, amount]
+            )
+
+            if not connector.cursor.rowcount:
+                connector.db.rollback()
+                return None
+
+            connector.cursor.execute(
+                f'SELECT {FEE_TRANSACTION_COLUMNS} FROM fee_transaction WHERE transaction_id = ?;',
+                [connector.cursor.lastrowid]
+            )
+            transaction = FeeTransaction(*connector.cursor.fetchone())
+            connector.db.commit()
+
+        return transaction
+
+    def get(self, transaction_id: int) -> FeeTransaction | None:
+        """
+        Returns a transaction by its ID (receipt number).
+
+        Parameters:
+            - transaction_id (int): ID of the transaction.
+
+        Returns:
+            - FeeTransaction or None: the transaction, None if there is no such transaction.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'SELECT {FEE_TRANSACTION_COLUMNS} FROM fee_transaction WHERE transaction_id = ?;',
+                [transaction_id]
+            )
+            row = connector.cursor.fetchone()
+
+        return FeeTransaction(*row) if row else None
+
+    def history(self, enrollment_no: int | str) -> list[FeeTransaction]:
+        """
+        Returns the transactions of a student, oldest first.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - list[FeeTransaction]
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                f'''
+                SELECT {FEE_TRANSACTION_COLUMNS}
+                FROM fee_transaction
+                WHERE enrollment_no = ?
+                ORDER BY transaction_id;
+                ''',
+                [enrollment_no]
+            )
+            return [FeeTransaction(*row) for row in connector.cursor.fetchall()]
+
+    def daily_totals(self, first_day: str, last_day: str) -> list[tuple[str, int, int]]:
+        """
+        Returns the deposits collected on every day of a period, days without deposits are left out.
+
+        Parameters:
+            - first_day (str): first day of the period, 'YYYY-MM-DD'.
+            - last_day (str): last day of the period (included), 'YYYY-MM-DD'.
+
+        Returns:
+            - list[tuple[str, int, int]]: (day, amount collected, number of deposits), oldest day first.
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''
+                SELECT paid_on, amount, transactions
+                FROM fee_daily_total
+                WHERE paid_on BETWEEN ? AND ?
+                ORDER BY paid_on;
+                ''',
+                [first_day, last_day]
+            )
+            return connector.cursor.fetchall()
+
+    def collected(self, first_day: str, last_day: str) -> int:
+        """
+        Returns the total of the deposits collected in a period, e.g. a month for the month-end reconciliation.
+
+        Parameters:
+            - first_day (str): first day of the period, 'YYYY-MM-DD'.
+            - last_day (str): last day of the period (included), 'YYYY-MM-DD'.
+
+        Returns:
+            - int
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                'SELECT COALESCE(SUM(amount), 0) FROM fee_daily_total WHERE paid_on BETWEEN ? AND ?;',
+                [first_day, last_day]
+            )
+            return connector.cursor.fetchall()[0][0]
+
+
+books = BookRepository()
+students = StudentRepository()
+fees = FeeRepository()
@@ -0,0 +1,190 @@
+import tkinter
+from dataclasses import dataclass
+from collections.abc import Callable
+
+type widget = any
+
+
+@dataclass
+class Screen:
+    """
+    A form built once and kept hidden while another screen is shown.
+
+    Attributes:
+        - widgets (list[tuple[widget, str, dict]]): top level widgets of the form, their geometry manager ('grid', 'pack' or 'place') and their pack or place options.
+        - attributes (dict[str, any]): attributes set on the owner while building the form (StringVars, widgets...), restored when the form is shown again because other forms may use the same names.
+        - variables (dict[str, tuple[tkinter.Variable, any]]): every variable of the form by its tcl name, with its value right after building. The form is reset to these values when it is shown again.
+        - on_show (callable or None): called after the form is shown again.
+    """
+    widgets: list[tuple[widget, str, dict]]
+    attributes: dict[str, any]
+    variables: dict[str, tuple[tkinter.Variable, any]]
+    on_show: Callable | None = None
+
+
+class ScreenCache:
+    """
+    Caches the forms of a frame. Each form is built the first time it is shown, after that navigating away only hides its widgets, and navigating back shows them again with their variables reset, instead of destroying and rebuilding dozens of widgets.
+
+    The builders don't need to know about the cache: the widgets a builder puts in the owner and the attributes it sets on the owner are recorded after it runs.
+
+    Parameters:
+        - owner (widget): the frame the forms are built in, it must call `hide()` for the widgets it removes (see `owns()`).
+
+    Usage:
+    ```
+    self.screens = ScreenCache(self)
+    ...
+    def add_book_gui(self, event=None):
+        self.screens.show('add_book', self.__add_book_form)
+    ```
+
+    Note:
+        - A form whose content depends on the database (like a list of courses) must be invalidated when that data changes, see `invalidate()`.
+    """
+
+    def __init__(self, owner: widget) -> None:
+        self.owner = owner
+        self.screens: dict[str, Screen] = {}
+        # names of the widgets that belong to a cached screen
+        self.__owned: set[str] = set()
+
+    def show(self, key: str, build: Callable, on_show: Callable | None = None) -> None:
+        """
+        Shows the cached form, or builds it and caches it.
+
+        Parameters:
+            - key (str): name of the screen.
+            - build (callable): builds the form in the owner, it is called without arguments.
+            - on_show (callable or None): called every time the cached form is shown again, to reset what its variables don't cover.
+
+        Returns:
+            - None
+        """
+        if key in self.screens:
+            self.owner.content_remover()
+            self.__restore(self.screens[key])
+            return None
+
+        attributes_before = dict(vars(self.owner))
+        build()
+
+        widgets = [
+            (child, child.winfo_manager(), self.__geometry_options(child))
+            for child in self.owner.winfo_children()
+            if child.winfo_manager() and not self.owns(child)
+        ]
+
+        # the builder gave up (e.g. after an error message), nothing to cache
+        if not widgets:
+            return None
+
+        attributes = {
+            name: value
+            for name, value in vars(self.owner).items()
+            if attributes_before.get(name, self) is not value
+        }
+
+        variables = {}
+        for value in attributes.values():
+            if isinstance(value, tkinter.Variable):
+                variables[str(value)] = (value, value.get())
+
+        for child, _, _ in widgets:
+            self.__collect_variables(child, variables)
+            self.__owned.add(str(child))
+
+        self.screens[key] = Screen(widgets, attributes, variables, on_show)
+
+    def owns(self, child: widget) -> bool:
+        """
+        Returns True if the widget belongs to a cached screen, it must be hidden and not destroyed.
+        """
+        return str(child) in self.__owned
+
+    @staticmethod
+    def hide(child: widget) -> None:
+        """
+        Hides a widget of a cached screen, the grid options are remembered by tkinter.
+        """
+        manager = child.winfo_manager()
+
+        if manager == 'grid':
+            child.grid_remove()
+
+        elif manager == 'pack':
+            child.pack_forget()
+
+        elif manager == 'place':
+            child.place_forget()
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Forgets cached screens, they are built again the next time they are shown. Their widgets are destroyed with the other transient widgets on the next navigation, so a screen that is currently shown stays usable.
+
+        Parameters:
+            - keys (str): names of the screens, every screen if no name is given.
+
+        Returns:
+            - None
+        """
+        for key in keys or list(self.screens):
+            screen = self.screens.pop(key, None)
+
+            if screen is None:
+                continue
+
+            for child, _, _ in screen.widgets:
+                self.__owned.discard(str(child))
+
+    def __restore(self, screen: Screen) -> None:
+        """
+        Restores the attributes of a cached screen, resets its variables and shows its widgets in their original order.
+        """
+        for name, value in screen.attributes.items():
+            setattr(self.owner, name, value)
+
+        for variable, value in screen.variables.values():
+            variable.set(value)
+
+        for child, manager, options in screen.widgets:
+            if manager == 'grid':
+                child.grid()
+
+            # tkinter's own methods, pack_info() returns the paddings already scaled by customtkinter
+            elif manager == 'pack':
+                tkinter.Pack.pack_configure(child, **options)
+
+            elif manager == 'place':
+                tkinter.Place.place_configure(child, **options)
+
+        if screen.on_show:
+            screen.on_show()
+
+    @staticmethod
+    def __geometry_options(child: widget) -> dict:
+        """
+        Returns the pack or place options of a widget, grid options are kept by `grid_remove()` itself.
+        """
+        manager = child.winfo_manager()
+
+        if manager == 'pack':
+            return child.pack_info()
+
+        if manager == 'place':
+            return child.place_info()
+
+        return {}
+
+    def __collect_variables(self, child: widget, variables: dict[str, tuple[tkinter.Variable, any]]) -> None:
+        """
+        Adds the variables of the customtkinter widgets below `child` (entries, combo boxes, check boxes, radio buttons...) that are not attributes of the owner.
+        """
+        for name in ('_variable', '_textvariable'):
+            variable = getattr(child, name, None)
+
+            if isinstance(variable, tkinter.Variable) and str(variable) not in variables:
+                variables[str(variable)] = (variable, variable.get())
+
+        for grandchild in child.winfo_children():
+            self.__collect_variables(grandchild, variables)
@@ -0,0 +1,141 @@
+import re
+from database_connector import DatabaseConnector
+
+# words of the search text, the same characters the unicode61 tokenizer of the FTS5 indexes keeps
+WORD_PATTERN = re.compile(r'\w+')
+
+# largest sqlite INTEGER, a longer number can't be an enrollment number or a book ID
+MAX_ID = 2 ** 63 - 1
+
+
+def fts_query(text: str) -> str | None:
+    """
+    Turns what the user typed into an FTS5 query: every word is quoted (so that words like AND or NEAR are not operators) and matched as a prefix, and all words must match.
+
+    Parameters:
+        - text (str): the search text.
+
+    Returns:
+        - str or None: the FTS5 query, None if the text has no words.
+
+    Example:
+    ```
+    fts_query('harsh kum')  # '"harsh"* "kum"*'
+    ```
+    """
+    words = WORD_PATTERN.findall(text)
+
+    if not words:
+        return None
+
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def exact_id(text: str) -> int | None:
+    """
+    Returns the search text as an ID if it is a number that can be one: ASCII digits only (not e.g. '²' or '٣') and within the sqlite INTEGER range.
+
+    Parameters:
+        - text (str): the search text.
+
+    Returns:
+        - int or None: the ID, None if the text is not one.
+    """
+    text = text.strip()
+
+    if not (text.isascii() and text.isdigit()):
+        return None
+
+    number = int(text)
+
+    return number if number <= MAX_ID else None
+
+
+def search_students(text: str, limit: int = 50) -> list[tuple]:
+    """
+    Searches the students by name, father name, address, email and phone number, best matches first (bm25). A number is also matched exactly against the enrollment number, that student comes first.
+
+    Parameters:
+        - text (str): the search text, the last word may be incomplete.
+        - limit (int): maximum number of students returned, default 50.
+
+    Returns:
+        - list[tuple]: (enrollment_no, name, f_name, phone_no, email, course_id) of the matching students.
+    """
+    query = fts_query(text)
+
+    if query is None:
+        return []
+
+    with DatabaseConnector() as connector:
+        connector.cursor.execute(
+            '''
+            SELECT student.enrollment_no, student.name, student.f_name, student.phone_no, student.email, student.course_id
+            FROM student_fts
+            JOIN student ON student.enrollment_no = student_fts.rowid
+            WHERE student_fts MATCH ?
+            ORDER BY student_fts.rank
+            LIMIT ?;
+            ''',
+            [query, limit]
+        )
+        results = connector.cursor.fetchall()
+
+        enrollment_no = exact_id(text)
+
+        if enrollment_no is not None:
+            connector.cursor.execute(
+                '''
+                SELECT enrollment_no, name, f_name, phone_no, email, course_id
+                FROM student
+                WHERE enrollment_no = ?;
+                ''',
+                [enrollment_no]
+            )
+            exact = connector.cursor.fetchall()
+            results = exact + [row for row in results if row not in exact][:limit - len(exact)]
+
+    return results
+
+
+def search_books(text: str, limit: int = 50) -> list[tuple]:
+    """
+    Searches the books by name, publisher and ISBN, best matches first (bm25). A number is also matched exactly against the book ID, that book comes first.
+
+    Parameters:
+        - text (str): the search text, the last word may be incomplete.
+        - limit (int): maximum number of books returned, default 50.
+
+    Returns:
+        - list[tuple]: (book_id, name, quantity, course_id, isbn, publisher) of the matching books.
+    """
+    query = fts_query(text)
+
+    if query is None:
+        return []
+
+    with DatabaseConnector() as connector:
+        connector.cursor.execute(
+            '''
+            SELECT books.book_id, books.name, books.quantity, books.course_id, books.isbn, books.publisher
+            FROM books_fts
+            JOIN books ON books.book_id = books_fts.rowid
+            WHERE books_fts MATCH ?
+            ORDER BY books_fts.rank
+            LIMIT ?;
+            ''',
+            [query, limit]
+        )
+        results = connector.cursor.fetchall()
+
+        book_id = exact_id(text)
+
+        if book_id is not None:
+            connector.cursor.execute(
+                'SELECT * FROM books WHERE book_id = ?;',
+                [book_id]
+            )
+            exact = connector.cursor.fetchall()
+            results = exact + [row for row in results if row not in exact][:limit - len(exact)]
+
+    return results
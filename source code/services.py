@@ -0,0 +1,853 @@
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from database_connector import DatabaseConnector
+from course_cache import Course, courses
+from repository import Book, FeeTransaction, Student, books, fees, students
+from receipt import Receipt, receipt_for_transaction
+
+type IntOrStr = int | str
+type StrOrNone = str | None
+
+NAME_PATTERN = r'^[a-zA-Z ]+$'
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+# largest sqlite INTEGER, IDs and amounts above it can't be stored or looked up
+MAX_INTEGER = 2 ** 63 - 1
+
+
+class ServiceError(ValueError):
+    """
+    Raised by the services when an operation is refused (invalid input, unknown record, not enough stock or fee...). The message is written for the user and shown as is.
+    """
+
+
+class OutOfStock(ServiceError):
+    """
+    Raised by `LibraryService.lend()` when a book has no copy left, nothing is lended.
+
+    Attributes:
+        - book_ids (list[int]): IDs of the books without a copy left.
+    """
+
+    def __init__(self, book_ids: list[int]) -> None:
+        super().__init__(f'No copy left of the book IDs: {', '.join(str(id) for id in book_ids)}. No book was lended.')
+        self.book_ids = book_ids
+
+
+@dataclass(frozen=True)
+class StudentForm:
+    """
+    The values of the admission form, as entered. Empty values are None.
+
+    Attributes:
+        - name (str or None): name of the student.
+        - f_name (str or None): father name, optional.
+        - dob (str or None): date of birth, 'YYYY-MM-DD'.
+        - address (str or None): address of the student.
+        - phone_no (str or None): phone number, 10 digits.
+        - email (str or None): email, optional.
+        - gender (str or None): 'M', 'F' or 'O'.
+        - pincode (str or None): pincode, 6 digits.
+        - course_id (int, str or None): course of the student.
+        - class_10_per (str or None): 10th percentage.
+        - class_12_per (str or None): 12th percentage.
+    """
+    name: StrOrNone
+    f_name: StrOrNone
+    dob: StrOrNone
+    address: StrOrNone
+    phone_no: StrOrNone
+    email: StrOrNone
+    gender: StrOrNone
+    pincode: StrOrNone
+    course_id: IntOrStr | None
+    class_10_per: StrOrNone
+    class_12_per: StrOrNone
+
+
+@dataclass(frozen=True)
+class StudentRecord:
+    """
+    A student with its course, e.g. for the fetch student screen.
+
+    Attributes:
+        - student (Student): the student.
+        - course (Course): the course of the student.
+    """
+    student: Student
+    course: Course
+
+
+@dataclass(frozen=True)
+class FeeStatus:
+    """
+    The fee account of a student.
+
+    Attributes:
+        - student (Student): the student.
+        - course (Course): the course of the student, its fee is the total fee.
+    """
+    student: Student
+    course: Course
+
+    @property
+    def total_fee(self) -> int:
+        return self.course.fee
+
+    @property
+    def fee_deposited(self) -> int:
+        return self.student.fee_deposited or 0
+
+    @property
+    def remaining_fee(self) -> int:
+        return self.total_fee - self.fee_deposited
+
+
+@dataclass(frozen=True)
+class Lending:
+    """
+    Books lended to (or returned by) a student.
+
+    Attributes:
+        - enrollment_no (int): enrollment number of the student.
+        - book_ids (list[int]): IDs of the books.
+        - on (str): date, 'YYYY-MM-DD'.
+    """
+    enrollment_no: int
+    book_ids: list[int]
+    on: str
+
+
+def age_on(dob: str, today: date | None = None) -> int:
+    """
+    Returns the age of a person.
+
+    Parameters:
+        - dob (str): date of birth, 'YYYY-MM-DD'.
+        - today (date or None): the day of the age, today by default.
+
+    Returns:
+        - int
+
+    Raises:
+        - ValueError: if dob is not a date.
+    """
+    birth_date = datetime.strptime(dob, '%Y-%m-%d')
+    today = today or date.today()
+
+    # the birthday of this year may not have come yet
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+def _is_digits(text: str) -> bool:
+    'True for a string of ASCII digits, str.isnumeric() also accepts e.g. "²", "½" or "٣" which int() rejects or reads as another number.'
+    return text.isascii() and text.isdigit()
+
+
+def _is_number(value: IntOrStr | None) -> bool:
+    'True for a non-negative int or a string of ASCII digits that fits in a sqlite INTEGER.'
+    if value is None:
+        return False
+
+    text = str(value).strip()
+
+    return _is_digits(text) and int(text) <= MAX_INTEGER
+
+
+class StudentService:
+    """
+    Admission, update and removal of students. The methods take plain values and can run without the GUI, e.g. in a batch or a benchmark.
+
+    Usage:
+    ```
+    try:
+        student = student_service.admit(form)
+
+    except ServiceError as e:
+        ShowError('New Admission', str(e))
+    ```
+    """
+
+    def validate(self, form: StudentForm) -> StrOrNone:
+        """
+        Checks the values of the admission form.
+
+        Parameters:
+            - form (StudentForm): the values.
+
+        Returns:
+            - str or None: the first error message, None if the form is valid.
+        """
+        if not form.name:
+            return "Please enter Name."
+
+        if not re.match(NAME_PATTERN, form.name):
+            return "Invalid Name, please enter a proper name."
+
+        if form.f_name and not re.match(NAME_PATTERN, form.f_name):
+            return "Invalid Father Name, please enter a proper name."
+
+        try:
+            age_on(form.dob or '')
+
+        except ValueError:
+            return "Invalid Date, please enter a proper date."
+
+        if not form.address:
+            return "Please enter Address."
+
+        if not form.phone_no:
+            return "Please enter Phone Number."
+
+        if not _is_digits(form.phone_no) or len(form.phone_no) != 10:
+            return "Invalid Phone Number, please enter a proper number"
+
+        if form.email and not re.match(EMAIL_PATTERN, form.email):
+            return "Invalid Email, please enter a proper email."
+
+        if not form.gender:
+            return "Please select Gender."
+
+        if form.gender not in ('M', 'F', 'O'):
+            return "Invalid Gender."
+
+        if not form.pincode:
+            return "Please enter Pincode."
+
+        if not _is_digits(form.pincode) or len(form.pincode) != 6:
+            return "Invalid Pincode, please enter a proper pincode."
+
+        if not form.class_10_per or not form.class_12_per:
+            return "Please enter percentage."
+
+        if not _is_digits(form.class_10_per.replace('.', '')) or not _is_digits(form.class_12_per.replace('.', '')):
+            return "Invalid Percentage, please enter a decimal or numeric value."
+
+        if form.course_id is None or form.course_id == '':
+            return "Please select Course."
+
+        if not _is_number(form.course_id) or int(form.course_id) not in courses:
+            return "Please select correct course from the list."
+
+        return None
+
+    def admit(self, form: StudentForm) -> Student:
+        """
+        Admits a new student, the year of admission is this year.
+
+        Parameters:
+            - form (StudentForm): the values of the admission form.
+
+        Returns:
+            - Student: the new student, with its enrollment number.
+
+        Raises:
+            - ServiceError: if the form is not valid.
+        """
+        if error_msg := self.validate(form):
+            raise ServiceError(error_msg)
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''
+                INSERT INTO student(name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                ''',
+                self.__row(form)
+            )
+            enrollment_no = connector.cursor.lastrowid
+            connector.db.commit()
+
+        return students.get(enrollment_no)
+
+    def get(self, enrollment_no: IntOrStr) -> StudentRecord | None:
+        """
+        Returns a student with its course.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - StudentRecord or None: None if there is no such student (or its course was removed).
+        """
+        if not _is_number(enrollment_no):
+            return None
+
+        student = students.get(int(enrollment_no))
+        course = courses.get(student.course_id) if student else None
+
+        if course is None:
+            return None
+
+        return StudentRecord(student, course)
+
+    def update(self, enrollment_no: IntOrStr, form: StudentForm) -> Student:
+        """
+        Replaces the data of a student, the year of admission is set to this year like on admission.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - form (StudentForm): the new values.
+
+        Returns:
+            - Student: the updated student.
+
+        Raises:
+            - ServiceError: if the form is not valid or there is no such student.
+        """
+        if error_msg := self.validate(form):
+            raise ServiceError(error_msg)
+
+        if not _is_number(enrollment_no):
+            raise ServiceError('This enrollment number is not found.')
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''
+                UPDATE student
+                SET name=?, dob=?, address=?, phone_no=?, email=?, year_of_ad=?, age=?, gender=?, pincode=?, course_id=?, f_name=?, class_10_per=?, class_12_per=?
+                WHERE enrollment_no = ?;
+                ''',
+                [*self.__row(form), int(enrollment_no)]
+            )
+            updated = connector.cursor.rowcount
+            connector.db.commit()
+
+        if not updated:
+            raise ServiceError('This enrollment number is not found.')
+
+        return students.get(enrollment_no)
+
+    def remove(self, enrollment_no: IntOrStr) -> bool:
+        """
+        Removes a student.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - bool: False if there is no such student.
+        """
+        return _is_number(enrollment_no) and students.remove(int(enrollment_no))
+
+    @staticmethod
+    def __row(form: StudentForm) -> tuple:
+        'Values of the student columns of a valid form, in the order of the INSERT and UPDATE statements.'
+        return (
+            form.name, form.dob, form.address, form.phone_no, form.email, date.today().year, age_on(form.dob),
+            form.gender, form.pincode, int(form.course_id), form.f_name, form.class_10_per, form.class_12_per
+        )
+
+
+class CourseService:
+    """
+    Adding, updating and removing courses. Every change invalidates the course cache, so the dropdowns and validators see it.
+
+    Usage:
+    ```
+    course = course_service.add(7, 'BBA', 90000, 3)
+    removed_students = course_service.remove(7)
+    ```
+    """
+
+    def validate(
+        self,
+        course_id: IntOrStr | None,
+        name: StrOrNone,
+        fee: IntOrStr | None,
+        year: IntOrStr | None,
+        update: bool = False
+    ) -> StrOrNone:
+        """
+        Checks the values of the course form.
+
+        Parameters:
+            - course_id (int, str or None): ID of the course.
+            - name (str or None): name of the course.
+            - fee (int, str or None): fee of the course.
+            - year (int, str or None): duration of the course in years.
+            - update (bool): True if the course exists already (update course).
+
+        Returns:
+            - str or None: the first error message, None if the values are valid.
+        """
+        if course_id is None or course_id == '':
+            return 'Please enter course id.'
+
+        if not _is_number(course_id):
+            return 'Invalid course id, ID must be a numeric value.'
+
+        if not update and int(course_id) in courses:
+            return 'This course ID is already present.'
+
+        if not name:
+            return 'Please enter course name'
+
+        if fee is None or fee == '':
+            return 'Please enter fee.'
+
+        if not _is_number(fee):
+            return 'Invalid fee, fee must be a numeric value.'
+
+        if year is None or year == '':
+            return 'Please select course year.'
+
+        if not _is_number(year):
+            return 'Invalid course year, it must be a numeric value.'
+
+        return None
+
+    def get(self, course_id: IntOrStr) -> Course | None:
+        'Returns a course by its ID, None if there is no such course.'
+        return courses.get(int(course_id)) if _is_number(course_id) else None
+
+    def all(self) -> list[Course]:
+        'Returns every course.'
+        return courses.all()
+
+    def add(self, course_id: IntOrStr, name: str, fee: IntOrStr, year: IntOrStr) -> Course:
+        """
+        Adds a course.
+
+        Parameters:
+            - course_id (int or str): ID of the new course.
+            - name (str): name of the course.
+            - fee (int or str): fee of the course.
+            - year (int or str): duration of the course in years.
+
+        Returns:
+            - Course: the new course.
+
+        Raises:
+            - ServiceError: if the values are not valid or the ID is taken.
+        """
+        if error_msg := self.validate(course_id, name, fee, year):
+            raise ServiceError(error_msg)
+
+        course = Course(int(course_id), name, int(fee), int(year))
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''INSERT INTO courses(course_id, name, fee, year)
+                VALUES(?, ?, ?, ?);
+                ''',
+                [course.course_id, course.name, course.fee, course.year]
+            )
+            connector.db.commit()
+
+        courses.invalidate()
+        return course
+
+    def update(self, course_id: IntOrStr, name: str, fee: IntOrStr, year: IntOrStr) -> Course:
+        """
+        Changes the name, fee and year of a course.
+
+        Parameters:
+            - course_id (int or str): ID of the course.
+            - name (str): new name.
+            - fee (int or str): new fee.
+            - year (int or str): new duration in years.
+
+        Returns:
+            - Course: the updated course.
+
+        Raises:
+            - ServiceError: if the values are not valid or there is no such course.
+        """
+        if error_msg := self.validate(course_id, name, fee, year, update=True):
+            raise ServiceError(error_msg)
+
+        course = Course(int(course_id), name, int(fee), int(year))
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''UPDATE courses
+                SET name = ?, fee = ?, year = ?
+                WHERE course_id = ?;
+                ''',
+                [course.name, course.fee, course.year, course.course_id]
+            )
+            updated = connector.cursor.rowcount
+            connector.db.commit()
+
+        if not updated:
+            raise ServiceError('This course ID is not present.')
+
+        courses.invalidate()
+        return course
+
+    def remove(self, course_id: IntOrStr) -> int:
+        """
+        Removes a course and its students, in one transaction.
+
+        Parameters:
+            - course_id (int or str): ID of the course.
+
+        Returns:
+            - int: number of students removed with the course.
+
+        Raises:
+            - ServiceError: if there is no such course.
+        """
+        if self.get(course_id) is None:
+            raise ServiceError('Please select a course from the list.')
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                'DELETE FROM courses WHERE course_id = ?',
+                [int(course_id)]
+            )
+
+            connector.cursor.execute(
+                'DELETE FROM student WHERE course_id = ?',
+                [int(course_id)]
+            )
+            removed_students = connector.cursor.rowcount
+
+            connector.db.commit()
+
+        courses.invalidate()
+        return removed_students
+
+
+class LibraryService:
+    """
+    Books, their stock and lending. Lending and returning are atomic, see `BookRepository.lend()`.
+
+    Usage:
+    ```
+    try:
+        lending = library_service.lend(enrollment_no, [3, 5])
+
+    except OutOfStock as e:
+        print(e.book_ids)
+    ```
+    """
+
+    def validate_book(
+        self,
+        name: StrOrNone,
+        quantity: IntOrStr | None,
+        course_id: IntOrStr | None,
+        isbn: StrOrNone,
+        publisher: StrOrNone
+    ) -> StrOrNone:
+        """
+        Checks the values of the add book form.
+
+        Parameters:
+            - name (str or None): name of the book.
+            - quantity (int, str or None): copies of the book.
+            - course_id (int, str or None): course the book belongs to.
+            - isbn (str or None): ISBN number, 13 digits.
+            - publisher (str or None): publisher of the book.
+
+        Returns:
+            - str or None: the first error message, None if the values are valid.
+        """
+        if not name:
+            return 'Please enter book name.'
+
+        if quantity is None or quantity == '':
+            return 'Please enter quantity of books.'
+
+        if not _is_number(quantity):
+            return 'Invalid quantity of books, it must be a numeric value.'
+
+        if course_id is None or course_id == '':
+            return 'Please select the course ID.'
+
+        if not isbn:
+            return 'Please enter ISBN number.'
+
+        if not _is_digits(isbn):
+            return 'Inavlid ISBN, it must be a numeric value.'
+
+        if len(isbn) != 13:
+            return 'Invalid ISBN, it must contain 13 digits.'
+
+        if not publisher:
+            return 'Please enter name of Publisher.'
+
+        if not _is_number(course_id) or int(course_id) not in courses:
+            return 'Please select a course ID from the list.'
+
+        return None
+
+    def get(self, book_id: IntOrStr) -> Book | None:
+        'Returns a book by its ID, None if there is no such book.'
+        return books.get(int(book_id)) if _is_number(book_id) else None
+
+    def has_books(self) -> bool:
+        'Returns True if there is at least one book.'
+        return books.any()
+
+    def add_book(
+        self,
+        name: str,
+        quantity: IntOrStr,
+        course_id: IntOrStr,
+        isbn: str,
+        publisher: str
+    ) -> Book:
+        """
+        Adds a book.
+
+        Parameters:
+            - name (str): name of the book.
+            - quantity (int or str): copies of the book.
+            - course_id (int or str): course the book belongs to.
+            - isbn (str): ISBN number, 13 digits.
+            - publisher (str): publisher of the book.
+
+        Returns:
+            - Book: the new book, with its ID.
+
+        Raises:
+            - ServiceError: if the values are not valid.
+        """
+        if error_msg := self.validate_book(name, quantity, course_id, isbn, publisher):
+            raise ServiceError(error_msg)
+
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''INSERT INTO books(name, quantity, course_id, isbn, publisher)
+                VALUES(?, ?, ?, ?, ?);
+                ''',
+                [name, int(quantity), int(course_id), isbn, publisher]
+            )
+            book_id = connector.cursor.lastrowid
+            connector.db.commit()
+
+        return Book(book_id, name, int(quantity), int(course_id), isbn, publisher)
+
+    def remove_book(self, book_id: IntOrStr) -> bool:
+        """
+        Removes a book and its lending records.
+
+        Parameters:
+            - book_id (int or str): ID of the book.
+
+        Returns:
+            - bool: False if there is no such book.
+        """
+        return _is_number(book_id) and books.remove(int(book_id))
+
+    def add_stock(self, book_id: IntOrStr | None, quantity: IntOrStr | None) -> Book:
+        """
+        Adds copies to the stock of a book.
+
+        Parameters:
+            - book_id (int, str or None): ID of the book.
+            - quantity (int, str or None): copies to add.
+
+        Returns:
+            - Book: the book with its new quantity.
+
+        Raises:
+            - ServiceError: if the values are not valid or there is no such book.
+        """
+        if quantity is None or quantity == '':
+            raise ServiceError('Please enter quantity.')
+
+        if book_id is None or book_id == '':
+            raise ServiceError('Please enter book ID')
+
+        if not _is_number(quantity):
+            raise ServiceError('Invalid quantity, it must be a numeric value.')
+
+        if not _is_number(book_id):
+            raise ServiceError('Invalid book ID, it must be a numeric value.')
+
+        if not books.add_stock(int(book_id), int(quantity)):
+            raise ServiceError('This book ID is not present.')
+
+        return books.get(int(book_id))
+
+    def available_for(self, enrollment_no: IntOrStr) -> list[Book]:
+        """
+        Returns the books of the course of a student that have copies left.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - list[Book]
+
+        Raises:
+            - ServiceError: if there is no such student.
+        """
+        if not _is_number(enrollment_no):
+            raise ServiceError('Invalid enrollment number, it must be a numeric value.')
+
+        student = students.get(int(enrollment_no))
+
+        if student is None:
+            raise ServiceError('This enrollment no is not found.')
+
+        return books.available_for_course(student.course_id)
+
+    def lended_to(self, enrollment_no: IntOrStr) -> list[Book]:
+        """
+        Returns the books lended to a student.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - list[Book]
+
+        Raises:
+            - ServiceError: if the enrollment number is not a number.
+        """
+        if not _is_number(enrollment_no):
+            raise ServiceError('Invalid enrollment number, it must be a numeric value.')
+
+        return books.lended_to(int(enrollment_no))
+
+    def lend(self, enrollment_no: IntOrStr, book_ids: list[int]) -> Lending:
+        """
+        Lends books to a student, all of them or none.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - book_ids (list[int]): IDs of the books.
+
+        Returns:
+            - Lending: the lended books.
+
+        Raises:
+            - ServiceError: if no book is given, the student is not found or a book is not a book of the course of the student.
+            - OutOfStock: if a book has no copy left, nothing is lended.
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        if not book_ids:
+            raise ServiceError('Please select atleast one book.')
+
+        student = students.get(int(enrollment_no)) if _is_number(enrollment_no) else None
+
+        if student is None:
+            raise ServiceError('This enrollment no is not found.')
+
+        # books that are not found are reported by books.lend() like books without a copy left
+        other_course = [
+            book_id for book_id in dict.fromkeys(book_ids)
+            if (book := books.get(book_id)) is not None and book.course_id != student.course_id
+        ]
+
+        if other_course:
+            raise ServiceError(f'These books are not books of the course of the student: {", ".join(map(str, other_course))}.')
+
+        if out_of_stock := books.lend(int(enrollment_no), book_ids):
+            raise OutOfStock(out_of_stock)
+
+        return Lending(int(enrollment_no), list(book_ids), date.today().isoformat())
+
+    def give_back(self, enrollment_no: IntOrStr, book_ids: list[int]) -> Lending:
+        """
+        Returns books lended to a student, books that are not lended to the student are skipped.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - book_ids (list[int]): IDs of the books.
+
+        Returns:
+            - Lending: the returned books.
+
+        Raises:
+            - ServiceError: if no book is given, the enrollment number is not a number or none of the books is lended to the student (e.g. returned from another desk).
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        if not book_ids:
+            raise ServiceError('Please select atleast one book.')
+
+        if not _is_number(enrollment_no):
+            raise ServiceError('Invalid enrollment number, it must be a numeric value.')
+
+        not_lended = books.give_back(int(enrollment_no), book_ids)
+        returned = [book_id for book_id in book_ids if book_id not in not_lended]
+
+        if not returned:
+            raise ServiceError('These books are already returned.')
+
+        return Lending(int(enrollment_no), returned, date.today().isoformat())
+
+
+class FeeService:
+    """
+    Fee accounts of the students, deposits and receipts. Deposits are appended to the fee ledger, see `FeeRepository`.
+
+    Usage:
+    ```
+    status = fee_service.status(enrollment_no)
+    transaction = fee_service.deposit(enrollment_no, '5000')
+    receipt = fee_service.receipt(transaction.transaction_id)
+    ```
+    """
+
+    def status(self, enrollment_no: IntOrStr) -> FeeStatus | None:
+        """
+        Returns the fee account of a student.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+
+        Returns:
+            - FeeStatus or None: None if there is no such student (or its course was removed).
+        """
+        record = student_service.get(enrollment_no)
+        return FeeStatus(record.student, record.course) if record else None
+
+    def deposit(self, enrollment_no: IntOrStr, amount: IntOrStr | None) -> FeeTransaction:
+        """
+        Deposits fee for a student. The remaining fee is checked again in the transaction of the deposit, another desk may have deposited meanwhile.
+
+        Parameters:
+            - enrollment_no (int or str): enrollment number of the student.
+            - amount (int, str or None): amount to deposit.
+
+        Returns:
+            - FeeTransaction: the deposit, its ID is the receipt number.
+
+        Raises:
+            - ServiceError: if the amount is not valid or more than the remaining fee, or there is no such student.
+            - sqlite3.OperationalError: if the database stays locked by another writer longer than the busy timeout.
+        """
+        if not _is_number(amount) or int(amount) <= 0:
+            raise ServiceError('Add a valid amount.')
+
+        amount = int(amount)
+
+        status = self.status(enrollment_no)
+
+        if status is None:
+            raise ServiceError('This enrollment number is not found.')
+
+        if amount > status.remaining_fee:
+            raise ServiceError('The amount is greater than remaining fee.')
+
+        transaction = fees.deposit(int(enrollment_no), amount)
+
+        if transaction is None:
+            raise ServiceError('The amount is greater than remaining fee.')
+
+        return transaction
+
+    def history(self, enrollment_no: IntOrStr) -> list[FeeTransaction]:
+        'Returns the fee transactions of a student, oldest first.'
+        return fees.history(int(enrollment_no)) if _is_number(enrollment_no) else []
+
+    def receipt(self, transaction_id: int) -> Receipt | None:
+        'Returns the receipt of a deposit, None if there is no such deposit.'
+        return receipt_for_transaction(transaction_id)
+
+    def collected(self, first_day: str, last_day: str) -> int:
+        'Returns the total of the deposits collected in a period, days are "YYYY-MM-DD".'
+        return fees.collected(first_day, last_day)
+
+
+student_service = StudentService()
+course_service = CourseService()
+library_service = LibraryService()
+fee_service = FeeService()
@@ -0,0 +1,252 @@
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from database_connector import DatabaseConnector, DEFAULT_PROFILE, PRAGMA_PROFILES, pool
+
+type subscriber = Callable[[str, any], None]
+
+
+@dataclass(frozen=True)
+class Setting:
+    """
+    Definition of a row of the settings table.
+
+    Attributes:
+        - value_type (type): type of the value (str, int, float or bool), values are stored as text.
+        - default (any): value used when the row doesn't exist.
+        - choices (tuple or None): allowed values, any value of the type if None.
+    """
+    value_type: type
+    default: any
+    choices: tuple | None = None
+
+
+# every setting of the program, the export high-water marks (export_hwm_<table>) are kept by export_engine itself
+SETTINGS: dict[str, Setting] = {
+    'theme': Setting(str, 'dark', ('light', 'dark')),
+    'default_tab': Setting(str, 'Accounts', ('Accounts', 'Library', 'Courses', 'Excel')),
+    'db_profile': Setting(str, DEFAULT_PROFILE, tuple(PRAGMA_PROFILES))
+}
+
+
+class SettingsService:
+    """
+    Process-wide access to the settings table.
+
+    All settings are read with one query the first time a setting is needed (or on `load()`), after that reads are served from memory. Writes update the memory and go through to the database right away, writes made inside `batch()` are saved together in one transaction when the batch ends.
+
+    Components that depend on a setting subscribe to it instead of reading the table again, the callback is called with the name and the new value every time it changes.
+
+    Usage:
+    ```
+    theme = settings.get('theme')
+    settings.subscribe('theme', lambda name, value: ctk.set_appearance_mode(value))
+    settings.set('theme', 'light')
+
+    with settings.batch():
+        settings.set('theme', 'dark')
+        settings.set('default_tab', 'Library')
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.__values: dict[str, any] | None = None
+        self.__pending: dict[str, any] = {}
+        self.__batch_depth = 0
+        self.__subscribers: dict[str, list[subscriber]] = {}
+        self.__lock = threading.RLock()
+
+    def load(self) -> None:
+        """
+        Reads every setting from the database, replacing the values in memory. Values of settings that don't exist in the table are the defaults of `SETTINGS`.
+
+        Returns:
+            - None
+        """
+        with DatabaseConnector() as connector:
+            connector.cursor.execute(
+                '''
+                SELECT setting, value
+                FROM settings;
+                '''
+            )
+            rows = connector.cursor.fetchall()
+
+        values = {name: setting.default for name, setting in SETTINGS.items()}
+
+        for name, value in rows:
+            if name in SETTINGS:
+                try:
+                    values[name] = self.__decode(name, value)
+
+                # a value written by hand that can't be read keeps the default
+                except ValueError:
+                    pass
+
+        with self.__lock:
+            self.__values = values
+
+    def get(self, name: str) -> any:
+        """
+        Returns the value of a setting.
+
+        Parameters:
+            - name (str): name of the setting, a key of `SETTINGS`.
+
+        Returns:
+            - any: the value, of the type of the setting.
+        """
+        self.__check_name(name)
+
+        with self.__lock:
+            if self.__values is None:
+                self.load()
+
+            return self.__values[name]
+
+    def set(self, name: str, value: any) -> None:
+        """
+        Changes a setting, saves it (at the end of the batch inside `batch()`) and notifies the subscribers. Nothing happens if the value doesn't change.
+
+        Parameters:
+            - name (str): name of the setting, a key of `SETTINGS`.
+            - value (any): the new value.
+
+        Returns:
+            - None
+
+        Raises:
+            - ValueError: if the value is not of the type of the setting or not one of its choices.
+        """
+        self.__check_name(name)
+        value = self.__decode(name, self.__encode(name, value))
+
+        with self.__lock:
+            if self.__values is None:
+                self.load()
+
+            if self.__values[name] == value:
+                return None
+
+            self.__values[name] = value
+            self.__pending[name] = value
+
+            if not self.__batch_depth:
+                self.__flush()
+
+            callbacks = list(self.__subscribers.get(name, []))
+
+        for callback in callbacks:
+            callback(name, value)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Saves the settings changed inside the block in one transaction when the block ends, batches can be nested.
+        """
+        with self.__lock:
+            self.__batch_depth += 1
+
+        try:
+            yield
+
+        finally:
+            with self.__lock:
+                self.__batch_depth -= 1
+
+                if not self.__batch_depth:
+                    self.__flush()
+
+    def subscribe(self, name: str, callback: subscriber) -> None:
+        """
+        Calls `callback(name, value)` every time the setting changes.
+
+        Parameters:
+            - name (str): name of the setting, a key of `SETTINGS`.
+            - callback (subscriber): the function to call.
+
+        Returns:
+            - None
+        """
+        self.__check_name(name)
+
+        with self.__lock:
+            self.__subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name: str, callback: subscriber) -> None:
+        """
+        Stops calling a callback given to `subscribe()`.
+        """
+        with self.__lock:
+            if callback in self.__subscribers.get(name, []):
+                self.__subscribers[name].remove(callback)
+
+    def __flush(self) -> None:
+        """
+        Saves the pending changes in one transaction.
+        """
+        if not self.__pending:
+            return None
+
+        rows = [(name, self.__encode(name, value)) for name, value in self.__pending.items()]
+        self.__pending.clear()
+
+        with DatabaseConnector() as connector:
+            connector.cursor.executemany(
+                '''
+                INSERT INTO settings(setting, value)
+                VALUES (?, ?)
+                ON CONFLICT(setting) DO UPDATE SET value = excluded.value;
+                ''',
+                rows
+            )
+            connector.db.commit()
+
+    @staticmethod
+    def __check_name(name: str) -> None:
+        'Raises KeyError for a setting missing from `SETTINGS`.'
+        if name not in SETTINGS:
+            raise KeyError(f'Unknown setting "{name}".')
+
+    @staticmethod
+    def __encode(name: str, value: any) -> str:
+        """
+        Converts a value to the text stored in the settings table.
+        """
+        setting = SETTINGS[name]
+
+        if not isinstance(value, setting.value_type):
+            raise ValueError(f'Setting "{name}" must be of type {setting.value_type.__name__}.')
+
+        if setting.choices is not None and value not in setting.choices:
+            raise ValueError(f'Setting "{name}" must be one of {", ".join(map(str, setting.choices))}.')
+
+        if setting.value_type is bool:
+            return '1' if value else '0'
+
+        return str(value)
+
+    @staticmethod
+    def __decode(name: str, text: str) -> any:
+        """
+        Converts the text stored in the settings table to the type of the setting.
+        """
+        setting = SETTINGS[name]
+
+        if setting.value_type is bool:
+            value = text in ('1', 'true', 'True')
+
+        else:
+            value = setting.value_type(text)
+
+        if setting.choices is not None and value not in setting.choices:
+            raise ValueError(f'Setting "{name}" must be one of {", ".join(map(str, setting.choices))}.')
+
+        return value
+
+
+settings = SettingsService()
+
+# the pool reads the profile itself when it connects the first time, a new profile applies to the connections opened afterwards
+settings.subscribe('db_profile', lambda name, profile: pool.configure(profile=profile))
@@ -6,8 +6,7 @@ import random
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from PIL import ImageTk, Image
-import os
+from image_cache import images
 import sys
 
 
@@ -25,7 +24,7 @@ class SigninForm(ctk.CTk):
         self.resizable(False, False)
 
         # changing icon
-        self.imagepath = ImageTk.PhotoImage(file=os.path.join('icons', 'app.png'))
+        self.imagepath = images.get_photoimage('app.png')
         self.wm_iconbitmap()
         self.iconphoto(False, self.imagepath)
 
@@ -186,10 +185,7 @@ class SigninForm(ctk.CTk):
         )
 
         #adding image
-        image = ctk.CTkImage(
-            Image.open(os.path.join('icons', 'sigin_form_img.jpg')), 
-            size= (300, 600)
-        )
+        image = images.get_ctkimage('sigin_form_img.jpg', (300, 600))
 
         self.decorative_image = ctk.CTkLabel(
             master= self,
@@ -424,10 +420,7 @@ class SigninForm(ctk.CTk):
         self.geometry('600x430')
 
         #adding image
-        image = ctk.CTkImage(
-            Image.open(os.path.join('icons', 'sigin_form_img.jpg')), 
-            size= (300, 600)
-        )
+        image = images.get_ctkimage('sigin_form_img.jpg', (300, 600))
 
         self.decorative_image = ctk.CTkLabel(
             master= self,
@@ -640,10 +633,7 @@ Harshit Kumawat
             self.geometry('600x430')
 
             #adding image
-            image = ctk.CTkImage(
-                Image.open(os.path.join('icons', 'sigin_form_img.jpg')), 
-                size= (300, 600)
-            )
+            image = images.get_ctkimage('sigin_form_img.jpg', (300, 600))
 
             self.decorative_image = ctk.CTkLabel(
                 master= self,
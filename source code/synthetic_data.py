@@ -0,0 +1,456 @@
+import os
+import random
+import sqlite3
+import argparse
+from bisect import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+from database_connector import DatabaseConnector, configure_pool
+from migrations import run_migrations
+from services import age_on
+
+# programs offered by the generated college: (name, years, fee of a year), the fee of every year of a program is the same
+PROGRAMS: list[tuple[str, int, int]] = [
+    ('BCA', 3, 20000), ('BBA', 3, 22000), ('BCom', 3, 15000), ('BSc', 3, 18000), ('BA', 3, 12000),
+    ('BTech', 4, 85000), ('MCA', 2, 45000), ('MBA', 2, 90000), ('MCom', 2, 20000), ('MSc', 2, 30000),
+    ('MA', 2, 15000), ('BEd', 2, 35000), ('BPharm', 4, 70000), ('BBA LLB', 5, 60000), ('Diploma', 3, 25000)
+]
+
+# specialisations appended to the program names once every program is used
+SPECIALISATIONS = ['Computer Science', 'Physics', 'Chemistry', 'Mathematics', 'Economics', 'English', 'History', 'Finance', 'Marketing', 'Electronics']
+
+MALE_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Arjun', 'Rohit', 'Rahul', 'Amit', 'Harshit', 'Karan', 'Vikas', 'Sanjay', 'Manish', 'Deepak', 'Ankit', 'Nikhil', 'Suresh', 'Rajesh', 'Mohan', 'Vijay', 'Ramesh', 'Sunil', 'Pankaj', 'Yash', 'Kunal', 'Gaurav']
+FEMALE_NAMES = ['Aanya', 'Diya', 'Priya', 'Pooja', 'Neha', 'Sneha', 'Anjali', 'Kavya', 'Riya', 'Shreya', 'Nisha', 'Meera', 'Sunita', 'Divya', 'Aarti', 'Komal', 'Swati', 'Payal', 'Isha', 'Tanvi']
+SURNAMES = ['Sharma', 'Verma', 'Gupta', 'Kumawat', 'Singh', 'Yadav', 'Jain', 'Agarwal', 'Meena', 'Choudhary', 'Saini', 'Patel', 'Joshi', 'Mehta', 'Kumar', 'Mishra', 'Pandey', 'Rathore', 'Shekhawat', 'Bansal']
+STREETS = ['Main Road', 'Station Road', 'Gandhi Nagar', 'Nehru Marg', 'Civil Lines', 'Shastri Nagar', 'Malviya Nagar', 'Raja Park', 'Vaishali Nagar', 'Mansarovar', 'Fouj Mohalla', 'Tilak Nagar']
+EMAIL_DOMAINS = ['gmail.com', 'gmail.com', 'gmail.com', 'yahoo.com', 'outlook.com', 'rediffmail.com']
+
+SUBJECTS = ['Computer Organization', 'C Programming', 'Data Structures', 'Operating Systems', 'Database Systems', 'Computer Networks', 'Discrete Mathematics', 'Financial Accounting', 'Business Economics', 'Principles of Management', 'Marketing Management', 'Cost Accounting', 'Business Law', 'Organic Chemistry', 'Physical Chemistry', 'Classical Mechanics', 'Linear Algebra', 'Calculus', 'Indian History', 'English Literature', 'Environmental Studies', 'Statistics', 'Pharmacology', 'Constitutional Law']
+BOOK_KINDS = ['', 'Second Edition', 'Third Edition', 'Made Easy', 'Handbook', 'Question Bank', 'Vol. 1', 'Vol. 2']
+PUBLISHERS = ['Pearson', 'McGraw Hill', 'Oxford University Press', 'S. Chand', 'Arihant', 'Laxmi Publications', 'PHI Learning', 'Wiley', 'Cengage', 'BPB Publications']
+
+# first 3 digits of the pincodes of the city of the college and of the rest of the country, most students are local
+LOCAL_PINCODE_PREFIXES = [302, 303]
+
+# rows inserted with one executemany
+BATCH_SIZE = 5000
+
+
+class SyntheticData:
+    """
+    Makes random rows of the college tables with realistic distributions, for measuring the program with more data than the shipped database has.
+
+    - Courses are programs of 2 to 5 years, every year is a course with the fee of the program. A few programs have most of the students (Zipf weights) and fewer students reach the later years.
+    - Students are 52% male, 46% female and 2% other, their age and year of admission follow their course year, marks are normal around 72% and the 12th marks follow the 10th marks.
+    - 15% of the students deposited nothing this academic year, 45% paid the whole fee and 40% a part of it, in 1 to 3 installments.
+    - Every course has its books, their quantities are log-normal and a few titles of a course are lended much more than the others.
+
+    Parameters:
+        - seed (int or None): seed of the random numbers, the same seed makes the same rows.
+        - today (date or None): the day the data is made for, today by default.
+
+    Usage:
+    ```
+    data = SyntheticData(seed=1)
+    course_rows = data.courses(30)
+    student_row = data.student(course_rows[0])
+    ```
+    """
+
+    def __init__(self, seed: int | None = None, today: date | None = None) -> None:
+        self.random = random.Random(seed)
+        self.today = today or date.today()
+
+        # academic years start in July
+        self.session_start = date(self.today.year if self.today.month >= 7 else self.today.year - 1, 7, 1)
+
+    def courses(self, count: int, first_course_id: int = 101) -> list[tuple]:
+        """
+        Returns the rows of `count` courses, every year of a program is a course.
+
+        Parameters:
+            - count (int): number of courses.
+            - first_course_id (int): ID of the first course, the next ones follow it, default 101 like the shipped database.
+
+        Returns:
+            - list[tuple]: (course_id, name, fee, year) rows.
+        """
+        rows = []
+        round_no = 0
+
+        while len(rows) < count:
+            for program, years, fee in PROGRAMS:
+                name = program if round_no == 0 else f'{program} {SPECIALISATIONS[(round_no - 1) % len(SPECIALISATIONS)]}'
+
+                # later rounds are specialisations, their fee differs a little from the program's
+                program_fee = fee if round_no == 0 else round(fee * self.random.uniform(0.8, 1.3) / 500) * 500
+
+                for year in range(1, years + 1):
+                    if len(rows) == count:
+                        return rows
+
+                    rows.append((first_course_id + len(rows), name, program_fee, year))
+
+            round_no += 1
+
+        return rows
+
+    def course_weights(self, course_rows: list[tuple]) -> list[float]:
+        """
+        Returns the share of the students in every course: Zipf over the programs (s = 1) and 10% fewer students in every later year.
+
+        Parameters:
+            - course_rows (list[tuple]): rows from `courses()`.
+
+        Returns:
+            - list[float]: one weight per course.
+        """
+        programs = list(dict.fromkeys(row[1] for row in course_rows))
+
+        # the popularity of the programs isn't their order in the list
+        ranks = list(range(1, len(programs) + 1))
+        self.random.shuffle(ranks)
+        rank_of = dict(zip(programs, ranks))
+
+        return [(0.9 ** (year - 1)) / rank_of[name] for _, name, _, year in course_rows]
+
+    def student(self, course: tuple) -> tuple:
+        """
+        Returns the row of a new student of a course, without the fee deposited (see `deposits()`).
+
+        Parameters:
+            - course (tuple): (course_id, name, fee, year) row of the course.
+
+        Returns:
+            - tuple: (name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per) in the column order of the student table.
+        """
+        course_id, course_name, _, year = course
+        rng = self.random
+
+        gender = rng.choices(['M', 'F', 'O'], weights=[52, 46, 2])[0]
+        first_name = rng.choice(FEMALE_NAMES if gender == 'F' else MALE_NAMES)
+        surname = rng.choice(SURNAMES)
+
+        # 18 when joining a bachelor's program, 21 for a master's, and a year or two more for some
+        year_of_ad = self.session_start.year - (year - 1)
+        age_on_admission = (21 if course_name.startswith('M') else 18) + min(int(rng.expovariate(1.2)), 6)
+        dob = date(year_of_ad - age_on_admission, 7, 1) - timedelta(days=rng.randrange(365))
+
+        class_10_per = min(max(rng.gauss(72, 11), 33), 99.6)
+        class_12_per = min(max(class_10_per + rng.gauss(-1.5, 6), 33), 99.6)
+
+        # most students are local
+        if rng.random() < 0.7:
+            pincode = rng.choice(LOCAL_PINCODE_PREFIXES) * 1000 + rng.randrange(1, 60)
+
+        else:
+            pincode = rng.randrange(110001, 855999)
+
+        email = None
+        if rng.random() < 0.85:
+            email = f'{first_name}.{surname}{rng.randrange(1, 1000)}@{rng.choice(EMAIL_DOMAINS)}'.lower()
+
+        f_name = f'{rng.choice(MALE_NAMES)} {surname}' if rng.random() < 0.9 else None
+
+        return (
+            f'{first_name} {surname}',
+            dob.isoformat(),
+            f'{rng.randrange(1, 400)}, {rng.choice(STREETS)}',
+            f'{rng.choice("6789")}{rng.randrange(10 ** 9):09d}',
+            email,
+            year_of_ad,
+            age_on(dob.isoformat(), self.today),
+            gender,
+            pincode,
+            course_id,
+            f_name,
+            round(class_10_per, 2),
+            round(class_12_per, 2)
+        )
+
+    def deposits(self, enrollment_no: int, fee: int) -> list[tuple]:
+        """
+        Returns the fee deposits of a student in this academic year: nothing (15%), the whole fee (45%) or a part of it (40%), in 1 to 3 installments of multiples of 500.
+
+        Parameters:
+            - enrollment_no (int): enrollment number of the student.
+            - fee (int): fee of the course of the student.
+
+        Returns:
+            - list[tuple]: (enrollment_no, amount, paid_on, paid_at) rows of fee_transaction, oldest first.
+        """
+        rng = self.random
+        units = fee // 500
+        plan = rng.random()
+
+        if units == 0 or plan < 0.15:
+            return []
+
+        paid_units = units if plan < 0.6 or units == 1 else rng.randrange(1, units)
+
+        # cut the paid amount in installments at random multiples of 500
+        installments = min(rng.choice([1, 1, 2, 3]), paid_units)
+        cuts = sorted(rng.sample(range(1, paid_units), installments - 1)) if installments > 1 else []
+        amounts = [(end - start) * 500 for start, end in zip([0, *cuts], [*cuts, paid_units])]
+
+        session_days = max((self.today - self.session_start).days, 0)
+        days = sorted(rng.randint(0, session_days) for _ in amounts)
+
+        return [
+            (
+                enrollment_no,
+                amount,
+                (self.session_start + timedelta(days=day)).isoformat(),
+                f'{rng.randrange(9, 17):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}'
+            )
+            for amount, day in zip(amounts, days)
+        ]
+
+    def book(self, course_id: int) -> tuple:
+        """
+        Returns the row of a book of a course, the quantity is log-normal (median 20 copies) and 3% of the books are out of stock.
+
+        Parameters:
+            - course_id (int): course of the book.
+
+        Returns:
+            - tuple: (name, quantity, course_id, isbn, publisher) in the column order of the books table.
+        """
+        rng = self.random
+        name = f'{rng.choice(SUBJECTS)} {rng.choice(BOOK_KINDS)}'.strip()
+        quantity = 0 if rng.random() < 0.03 else max(1, round(rng.lognormvariate(3, 0.8)))
+
+        return name, quantity, course_id, self.isbn(), rng.choice(PUBLISHERS)
+
+    def isbn(self) -> str:
+        'Returns a random ISBN-13 with a valid check digit.'
+        digits = [9, 7, 8] + [self.random.randrange(10) for _ in range(9)]
+        check = -sum(digit * (3 if i % 2 else 1) for i, digit in enumerate(digits)) % 10
+
+        return ''.join(map(str, digits + [check]))
+
+    def lendings(self, count: int, students: list[tuple[int, int]], books: list[tuple[int, int]]) -> list[tuple]:
+        """
+        Returns `count` lendings of books to students of their course, a student has a book at most once. The books of a course are lended with Zipf weights, so a few textbooks are out most of the time. The quantities of the books are the copies left on the shelf, they are not lowered.
+
+        Parameters:
+            - count (int): number of lendings, fewer are returned if the courses don't have enough books.
+            - students (list[tuple[int, int]]): (enrollment_no, course_id) of the students.
+            - books (list[tuple[int, int]]): (book_id, course_id) of the books.
+
+        Returns:
+            - list[tuple]: (enrollment_no, book_id) rows of books_lended.
+        """
+        books_of_course: dict[int, list[int]] = {}
+        for book_id, course_id in books:
+            books_of_course.setdefault(course_id, []).append(book_id)
+
+        # cumulative Zipf weights of the books of every course, for bisect
+        cumulative = {
+            course_id: list(accumulate(1 / rank for rank in range(1, len(book_ids) + 1)))
+            for course_id, book_ids in books_of_course.items()
+        }
+
+        borrowers = [student for student in students if student[1] in books_of_course]
+        lended = set()
+
+        # give up after a number of tries, the courses may have fewer books than the lendings asked for
+        for _ in range(count * 3):
+            if len(lended) == count or not borrowers:
+                break
+
+            enrollment_no, course_id = self.random.choice(borrowers)
+            weights = cumulative[course_id]
+            index = min(bisect(weights, self.random.random() * weights[-1]), len(weights) - 1)
+            lended.add((enrollment_no, books_of_course[course_id][index]))
+
+        return sorted(lended)
+
+
+def create_database(file_path: str, template: str = 'data.sqlite') -> None:
+    """
+    Creates an empty database with the exact schema of the template: the template is copied (it is only read, never changed), migrated and emptied, the user accounts and settings are kept so the program can sign in to it. The connection pool is pointed at the new database.
+
+    Parameters:
+        - file_path (str): path of the new database, it must not exist.
+        - template (str): database whose schema is copied, default 'data.sqlite'.
+
+    Raises:
+        - FileExistsError: if the file already exists.
+    """
+    if os.path.exists(file_path):
+        raise FileExistsError(f'{file_path} already exists.')
+
+    # a read-only connection outside the pool, the pool would apply its PRAGMA profile (e.g. WAL) to the template and change its file
+    template_db = sqlite3.connect(f'{Path(template).resolve().as_uri()}?mode=ro', uri=True)
+
+    try:
+        template_db.execute('VACUUM INTO ?;', [file_path])
+
+    finally:
+        template_db.close()
+
+    configure_pool(database=file_path)
+    run_migrations()
+
+    with DatabaseConnector() as connector:
+        for statement in [
+            'DELETE FROM books_lended;',
+            'DELETE FROM fee_transaction;',
+            'DELETE FROM fee_daily_total;',
+            'DELETE FROM student;',
+            'DELETE FROM books;',
+            'DELETE FROM courses;',
+            'DELETE FROM change_log;',
+            "DELETE FROM settings WHERE setting LIKE 'export_hwm_%';",
+            "DELETE FROM sqlite_sequence WHERE name IN ('student', 'books', 'fee_transaction', 'change_log');"
+        ]:
+            connector.cursor.execute(statement)
+
+        connector.db.commit()
+
+
+def generate(
+    students: int,
+    courses: int = 30,
+    books: int | None = None,
+    lendings: int | None = None,
+    seed: int | None = None
+) -> dict[str, int]:
+    """
+    Fills the database of the connection pool with synthetic courses, students, fee deposits, books and lendings (see `SyntheticData`), in one transaction. The rows go through the triggers of the schema, so the fee ledger, the daily totals, the search indexes and the change log stay consistent.
+
+    Parameters:
+        - students (int): number of students.
+        - courses (int): number of courses, default 30.
+        - books (int or None): number of books, one for every 20 students by default.
+        - lendings (int or None): number of books lended, one for every 2 students by default.
+        - seed (int or None): seed of the random numbers.
+
+    Returns:
+        - dict[str, int]: rows inserted in every table.
+
+    Raises:
+        - sqlite3.IntegrityError: if a generated course ID already exists, nothing is inserted in that case.
+
+    Example:
+    ```
+    create_database('synthetic.sqlite')
+    generate(100_000, seed=1)
+    ```
+    """
+    books = students // 20 if books is None else books
+    lendings = students // 2 if lendings is None else lendings
+    data = SyntheticData(seed)
+
+    with DatabaseConnector() as connector:
+        try:
+            connector.cursor.execute('SELECT IFNULL(MAX(course_id), 100) FROM courses;')
+            course_rows = data.courses(courses, connector.cursor.fetchall()[0][0] + 1)
+            connector.cursor.executemany('INSERT INTO courses(course_id, name, fee, year) VALUES(?, ?, ?, ?);', course_rows)
+
+            # the new rows are read back by key, so the existing rows of the database don't matter
+            connector.cursor.execute('SELECT IFNULL(MAX(enrollment_no), 0) FROM student;')
+            last_enrollment_no = connector.cursor.fetchall()[0][0]
+            connector.cursor.execute('SELECT IFNULL(MAX(book_id), 0) FROM books;')
+            last_book_id = connector.cursor.fetchall()[0][0]
+
+            weights = data.course_weights(course_rows)
+
+            for start in range(0, students, BATCH_SIZE):
+                batch = data.random.choices(course_rows, weights=weights, k=min(BATCH_SIZE, students - start))
+                connector.cursor.executemany(
+                    '''
+                    INSERT INTO student(name, dob, address, phone_no, email, year_of_ad, age, gender, pincode, course_id, f_name, class_10_per, class_12_per, fee_deposited)
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0);
+                    ''',
+                    [data.student(course) for course in batch]
+                )
+
+            # the deposits of the whole session in the order they were paid, the ledger triggers add them up
+            connector.cursor.execute(
+                '''
+                SELECT student.enrollment_no, student.course_id, courses.fee
+                FROM student
+                INNER JOIN courses
+                ON student.course_id = courses.course_id
+                WHERE student.enrollment_no > ?
+                ORDER BY student.enrollment_no;
+                ''',
+                [last_enrollment_no]
+            )
+            new_students = connector.cursor.fetchall()
+
+            deposits = sorted(
+                (deposit for enrollment_no, _, fee in new_students for deposit in data.deposits(enrollment_no, fee)),
+                key=lambda deposit: (deposit[2], deposit[3])
+            )
+
+            for start in range(0, len(deposits), BATCH_SIZE):
+                connector.cursor.executemany(
+                    'INSERT INTO fee_transaction(enrollment_no, amount, paid_on, paid_at) VALUES(?, ?, ?, ?);',
+                    deposits[start: start + BATCH_SIZE]
+                )
+
+            # every course gets a share of the books that follows its students, at least one if there are enough books
+            course_ids = data.random.choices([row[0] for row in course_rows], weights=[weight ** 0.5 for weight in weights], k=max(books - len(course_rows), 0))
+            course_ids = ([row[0] for row in course_rows] + course_ids)[:books]
+
+            for start in range(0, len(course_ids), BATCH_SIZE):
+                connector.cursor.executemany(
+                    'INSERT INTO books(name, quantity, course_id, isbn, publisher) VALUES(?, ?, ?, ?, ?);',
+                    [data.book(course_id) for course_id in course_ids[start: start + BATCH_SIZE]]
+                )
+
+            connector.cursor.execute('SELECT book_id, course_id FROM books WHERE book_id > ?;', [last_book_id])
+            new_books = connector.cursor.fetchall()
+
+            lending_rows = data.lendings(lendings, [(enrollment_no, course_id) for enrollment_no, course_id, _ in new_students], new_books)
+            connector.cursor.executemany('INSERT INTO books_lended(enrollment_no, book_id) VALUES(?, ?);', lending_rows)
+
+            connector.db.commit()
+
+        except Exception:
+            connector.db.rollback()
+            raise
+
+        connector.cursor.execute('ANALYZE;')
+
+    return {
+        'courses': len(course_rows),
+        'student': len(new_students),
+        'fee_transaction': len(deposits),
+        'books': len(new_books),
+        'books_lended': len(lending_rows)
+    }
+
+
+def main() -> None:
+    'Entry point of `python synthetic_data.py`.'
+    parser = argparse.ArgumentParser(description='Creates a database with the schema of data.sqlite filled with synthetic data.')
+    parser.add_argument('database', help='path of the database to create')
+    parser.add_argument('--students', type=int, default=10000, help='number of students, default 10000')
+    parser.add_argument('--courses', type=int, default=30, help='number of courses, default 30')
+    parser.add_argument('--books', type=int, help='number of books, default 1 for every 20 students')
+    parser.add_argument('--lendings', type=int, help='number of books lended, default 1 for every 2 students')
+    parser.add_argument('--seed', type=int, help='seed of the random numbers')
+    parser.add_argument('--template', default='data.sqlite', help='database whose schema is copied, default data.sqlite')
+    parser.add_argument('--append', action='store_true', help='add the rows to an existing database instead of creating it')
+    arguments = parser.parse_args()
+
+    if arguments.append:
+        configure_pool(database=arguments.database)
+        run_migrations()
+
+    else:
+        create_database(arguments.database, arguments.template)
+
+    inserted = generate(arguments.students, arguments.courses, arguments.books, arguments.lendings, arguments.seed)
+
+    for table, rows in inserted.items():
+        print(f'{table}: {rows:,} rows')
+
+
+if __name__ == '__main__':
+    main()
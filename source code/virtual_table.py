@@ -0,0 +1,208 @@
+import customtkinter as ctk
+import tkinter
+
+type ctkFrame = ctk.CTkFrame
+type event = any
+
+
+class VirtualTable(ctk.CTkFrame):
+    """
+    A table that only creates widgets for the rows it shows. It has a fixed pool of `visible_rows` rows of cells, scrolling doesn't create or destroy widgets, it only changes the texts of the pool. So building and scrolling the table costs the same for 20 rows or 100,000 rows.
+
+    The look is the same as the old grid of labels: a header row, the first column highlighted and a border around every cell.
+
+    Parameters:
+        - master (ctkFrame): the parent widget.
+        - columns (tuple[str]): header of every column.
+        - rows (list[tuple]): the rows of the table, every tuple has one value per column.
+        - visible_rows (int): number of rows shown at a time, default 20.
+        - word_wrap_length (int): wraplength of the cells, default 400.
+
+    Usage:
+    ```
+    table = VirtualTable(
+        master=frame,
+        columns=('Book ID', 'Name'),
+        rows=[(1, 'Python'), (2, 'C')]
+    )
+    table.pack()
+    ...
+    table.set_rows(new_rows)
+    ```
+
+    Note:
+        - The mouse wheel scrolls the table while the pointer is over it, and the page around it otherwise.
+    """
+    header_color = ('#7983ad', '#40486d')
+    cell_color = ('#DBDBDB', '#2B2B2B')
+
+    def __init__(
+        self,
+        master: ctkFrame,
+        columns: tuple[str],
+        rows: list[tuple],
+        visible_rows: int = 20,
+        word_wrap_length: int = 400,
+        **kwargs
+    ) -> None:
+        super().__init__(master, fg_color=('#f2f2f4', '#4a4a4a'), **kwargs)
+
+        self.columns = columns
+        self.rows = rows
+        self.visible_rows = visible_rows
+        self.word_wrap_length = word_wrap_length
+        self.first_row = 0
+
+        self.grid_frame = ctk.CTkFrame(
+            master=self,
+            fg_color=('#f2f2f4', '#4a4a4a')
+        )
+        self.grid_frame.grid(row=0, column=0, padx=5, pady=5, sticky='nsew')
+
+        for column in range(len(columns)):
+            self.grid_frame.grid_columnconfigure(column, weight=1, minsize=100)
+
+        # header
+        for column, text in enumerate(columns):
+            self.__create_cell(0, column, self.header_color).configure(text=text)
+
+        # pool of cells, one list of labels per visible row
+        self.cells: list[list[ctk.CTkLabel]] = [
+            [
+                self.__create_cell(row + 1, column, self.header_color if column == 0 else self.cell_color)
+                for column in range(len(columns))
+            ]
+            for row in range(visible_rows)
+        ]
+
+        self.scrollbar = ctk.CTkScrollbar(
+            master=self,
+            command=self.__on_scrollbar
+        )
+
+        self.__bind_mouse_wheel(self)
+        self.set_rows(rows)
+
+    def set_rows(self, rows: list[tuple]) -> None:
+        """
+        Replaces the rows of the table and scrolls back to the top.
+
+        Parameters:
+            - rows (list[tuple]): the new rows.
+
+        Returns:
+            - None
+        """
+        self.rows = rows
+        self.first_row = 0
+
+        # rows of the pool that are never needed stay hidden
+        for row, cells in enumerate(self.cells):
+            for cell in cells:
+                if row < len(rows):
+                    cell.master.grid()
+
+                else:
+                    cell.master.grid_remove()
+
+        if len(rows) > self.visible_rows:
+            self.scrollbar.grid(row=0, column=1, pady=5, sticky='ns')
+
+        else:
+            self.scrollbar.grid_remove()
+
+        self.__render()
+
+    def scroll_to(self, first_row: int) -> None:
+        """
+        Shows the rows starting at `first_row`, clamped to the rows of the table.
+
+        Parameters:
+            - first_row (int): index of the first row to show.
+
+        Returns:
+            - None
+        """
+        last_first_row = max(len(self.rows) - self.visible_rows, 0)
+        first_row = min(max(first_row, 0), last_first_row)
+
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.__render()
+
+    def __create_cell(self, row: int, column: int, fg_color: tuple[str, str]) -> ctk.CTkLabel:
+        """
+        Creates a bordered cell of the grid and returns its label.
+        """
+        cell_frame = ctk.CTkFrame(
+            master=self.grid_frame,
+            border_width=2,
+            corner_radius=0,
+            border_color=('#000000', '#ffffff'),
+            fg_color=fg_color
+        )
+        cell_frame.grid(row=row, column=column, sticky='nsew')
+
+        label = ctk.CTkLabel(
+            master=cell_frame,
+            text='',
+            wraplength=self.word_wrap_length
+        )
+        label.pack(padx=5, pady=5)
+
+        return label
+
+    def __render(self) -> None:
+        """
+        Writes the visible rows into the pool of cells and moves the scrollbar.
+        """
+        visible = self.rows[self.first_row:self.first_row + self.visible_rows]
+
+        for cells, row in zip(self.cells, visible):
+            for cell, value in zip(cells, row):
+                cell.configure(text=value)
+
+        if self.rows:
+            self.scrollbar.set(
+                self.first_row / len(self.rows),
+                (self.first_row + len(visible)) / len(self.rows)
+            )
+
+    def __on_scrollbar(self, action: str, amount: str, unit: str | None = None) -> None:
+        """
+        Command of the scrollbar, called with ('moveto', fraction) or ('scroll', count, 'units' or 'pages').
+        """
+        if action == 'moveto':
+            self.scroll_to(round(float(amount) * len(self.rows)))
+
+        elif unit == 'pages':
+            self.scroll_to(self.first_row + int(amount) * self.visible_rows)
+
+        else:
+            self.scroll_to(self.first_row + int(amount))
+
+    def __on_mouse_wheel(self, event: event) -> str:
+        """
+        Scrolls the table by three rows. Returns 'break' so that the scrollable frame around the table doesn't scroll too.
+        """
+        if len(self.rows) <= self.visible_rows:
+            return None
+
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first_row - 3)
+
+        else:
+            self.scroll_to(self.first_row + 3)
+
+        return 'break'
+
+    def __bind_mouse_wheel(self, widget: any) -> None:
+        """
+        Binds the mouse wheel (Windows/macOS and X11) on the widget and all its children, including the tkinter canvas and label inside every customtkinter widget, which are the ones receiving the events.
+        """
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            # tkinter's bind, customtkinter's bind forwards to the inner widgets which are bound below anyway
+            tkinter.Misc.bind(widget, sequence, self.__on_mouse_wheel, '+')
+
+        for child in widget.winfo_children():
+            self.__bind_mouse_wheel(child)